@@ -1,55 +1,300 @@
+import asyncio
+import json
 import os
-from fastapi import FastAPI, File, UploadFile, HTTPException
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from core.auditor import processar_minuta
-from core.file_parser import processar_arquivo_bytes
+from core import PLANOS
+from core.auditor import aquecer, iterar_processamento, normalizar_quebras_de_linha, teve_tempo_excedido
+from core import metricas
+from core.cache import MemoRegras, cache_extracao, cache_resultados, chave_arquivo, chave_minuta, documentos, guardar_documento, guardar_extracao, memo_regras, obter_extracao
+from core.envios import TAMANHO_MAXIMO_ENVIO, extensao_de, receber_arquivo
+from core.incremental import reauditar
+from core.supervisao import encerrar_processos
+from core.paralelo import AQUECER, auditar_fora_do_loop, encerrar_pool, enviar_lote, extrair_arquivo_fora_do_loop, juntar_lote, mapeador_de_trechos, obter_pool_threads
 
-import uvicorn
+@asynccontextmanager
+async def ciclo_de_vida(app: FastAPI):
+    if AQUECER:
+        await asyncio.to_thread(aquecer)
+    yield
+    encerrar_pool()
+    encerrar_processos()
 
-app = FastAPI(title="Auditor de Minutas API")
+app = FastAPI(title="Auditor de Minutas API", lifespan=ciclo_de_vida)
 
 origens_permitidas = os.getenv("CORS_ALLOWED_ORIGINS", "*").split(",")
+max_itens_lote = int(os.getenv("LOTE_MAX_ITENS", "500"))
 
+TIPOS_STREAM = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+
+# O corpo dos envios de arquivo é lido por core.envios.receber_arquivo, não pelo formulário do
+# Starlette: o arquivo vai direto para o destino que a extração lê. Só o esquema fica no OpenAPI.
+CORPO_ENVIO = {"requestBody": {"required": True, "content": {"multipart/form-data": {"schema": {
+    "type": "object", "required": ["arquivo"], "properties": {"arquivo": {"type": "string", "format": "binary"}},
+}}}}}
+
+metricas.registro.coletores.append(metricas.coletor_de_caches(
+    {"resultados": cache_resultados, "extracao": cache_extracao, "regras": memo_regras, "documentos": documentos}
+))
+
+class MedirRequisicoes:
+    """Conta as requisições e mede a duração até o fim do corpo (inclusive em stream), por endpoint."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        inicio = time.perf_counter()
+        status = [500]
+
+        async def enviar(mensagem):
+            if mensagem["type"] == "http.response.start":
+                status[0] = mensagem["status"]
+            await send(mensagem)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            # O caminho da rota ("/auditar/arquivo"), não o da URL, para não criar uma série por URL.
+            # Os arquivos estáticos (montados em "/") ficam numa série só.
+            endpoint = getattr(scope.get("route"), "path", None) or ("estático" if "endpoint" in scope else "não encontrado")
+            metricas.requisicoes.incrementar(endpoint, scope["method"], str(status[0]))
+            metricas.duracao_requisicoes.observar(time.perf_counter() - inicio, endpoint, scope["method"])
+
+class LimitarEnvios:
+    """Recusa com 413 envios de arquivo (multipart) maiores que TAMANHO_MAXIMO_ENVIO.
+
+    Confere o Content-Length antes de ler o corpo e, sem ele (ou se ele mentir), a soma
+    dos pedaços à medida que chegam, interrompendo a leitura ao passar do limite.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        cabecalhos = dict(scope["headers"])
+        if not cabecalhos.get(b"content-type", b"").startswith(b"multipart/"):
+            return await self.app(scope, receive, send)
+
+        detalhe = f"Arquivo maior que o máximo permitido ({TAMANHO_MAXIMO_ENVIO} bytes)."
+        declarado = cabecalhos.get(b"content-length", b"")
+        if declarado.isdigit() and int(declarado) > TAMANHO_MAXIMO_ENVIO:
+            return await JSONResponse({"detail": detalhe}, status_code=413)(scope, receive, send)
+
+        recebidos = 0
+
+        async def receber():
+            nonlocal recebidos
+            mensagem = await receive()
+            if mensagem["type"] == "http.request":
+                recebidos += len(mensagem.get("body", b""))
+                if recebidos > TAMANHO_MAXIMO_ENVIO:
+                    raise HTTPException(status_code=413, detail=detalhe)
+            return mensagem
+
+        await self.app(scope, receber, send)
+
+app.add_middleware(LimitarEnvios)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origens_permitidas,
     allow_methods=["*"],
     allow_headers=["*"]
 )
+app.add_middleware(MedirRequisicoes)
 
 class MinutaInput(BaseModel):
     texto: str
 
-@app.post("/auditar")
-async def auditar_minuta(dados: MinutaInput):
-    resultado = processar_minuta(dados.texto)
-    return resultado
+class LoteInput(BaseModel):
+    textos: list[str]
+
+class EdicaoInput(BaseModel):
+    inicio: int
+    remover: int = 0
+    inserir: str = ""
+
+class IncrementalInput(BaseModel):
+    documento_id: str
+    edicoes: list[EdicaoInput]
+
+async def auditar_texto(texto: str) -> dict:
+    texto_normalizado = normalizar_quebras_de_linha(texto)
+    metricas.tamanho_documentos.observar(len(texto_normalizado))
+    chave = chave_minuta(texto_normalizado)
+    resultado = cache_resultados.obter(chave)
+    if resultado is None:
+        # O resultado de cada trecho fica no memo, para a reauditoria incremental (core.incremental).
+        resultado = await auditar_fora_do_loop(texto, MemoRegras(memo_regras))
+        # Regras interrompidas por tempo podem terminar numa próxima tentativa.
+        if not teve_tempo_excedido(resultado):
+            cache_resultados.guardar(chave, resultado)
+    # Cópia rasa: quem chama pode acrescentar chaves sem alterar o que está no cache.
+    return {**sem_eventos(resultado), "documento_id": guardar_documento(texto_normalizado)}
+
+def sem_eventos(resultado: dict) -> dict:
+    """O resultado do cache sem os eventos de regra que o stream guarda junto (eventos_auditoria)."""
+    return {k: v for k, v in resultado.items() if k != "eventos"}
 
-@app.post("/auditar/arquivo")
-async def auditar_minuta_arquivo(arquivo: UploadFile = File(...)):
-    if not arquivo.filename:
+def eventos_auditoria(texto: str, extras: dict = None):
+    """Eventos de iterar_processamento, usando e alimentando o cache de resultados.
+
+    Os eventos de regra ficam no cache junto com o resultado (chave "eventos"): num acerto, são
+    repetidos antes do `fim`, como numa auditoria nova. Um resultado guardado por /auditar não
+    os tem; a auditoria roda de novo, com as regras reaproveitadas do memo, e o cache é completado.
+    """
+    texto_normalizado = normalizar_quebras_de_linha(texto)
+    metricas.tamanho_documentos.observar(len(texto_normalizado))
+    extras = {**(extras or {}), "documento_id": guardar_documento(texto_normalizado)}
+    chave = chave_minuta(texto_normalizado)
+    resultado = cache_resultados.obter(chave)
+    if resultado is not None and "eventos" in resultado:
+        yield from resultado["eventos"]
+        yield {"evento": "fim", **sem_eventos(resultado), **extras}
+        return
+
+    eventos = []
+    for evento in iterar_processamento(texto, MemoRegras(memo_regras), mapear=mapeador_de_trechos(len(texto))):
+        if evento["evento"] == "fim":
+            if not teve_tempo_excedido(evento):
+                cache_resultados.guardar(chave, {**{k: v for k, v in evento.items() if k != "evento"}, "eventos": eventos})
+            evento = {**evento, **extras}
+        else:
+            eventos.append(evento)
+        yield evento
+
+def formatar_evento(evento: dict, formato: str) -> str:
+    dados = json.dumps(evento, ensure_ascii=False)
+    if formato == "sse":
+        return f"event: {evento['evento']}\ndata: {dados}\n\n"
+    return dados + "\n"
+
+def resposta_em_stream(texto: str, formato: str, extras: dict = None) -> StreamingResponse:
+    if formato not in TIPOS_STREAM:
+        raise HTTPException(status_code=400, detail=f"Formato de stream inválido: use {' ou '.join(TIPOS_STREAM)}.")
+    # Gerador síncrono: o Starlette o consome numa thread, sem travar o event loop.
+    linhas = (formatar_evento(evento, formato) for evento in eventos_auditoria(texto, extras))
+    return StreamingResponse(linhas, media_type=TIPOS_STREAM[formato], headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+async def extrair_texto_enviado(request: Request) -> str:
+    try:
+        nome_arquivo, recebido = await receber_arquivo(request.stream(), request.headers.get("content-type", ""))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not nome_arquivo:
+        if recebido is not None:
+            recebido.descartar()
         raise HTTPException(status_code=400, detail="Nenhum arquivo enviado")
-    
-    extensao = arquivo.filename.split('.')[-1].lower()
-    conteudo_bytes = await arquivo.read()
 
     try:
-        texto_extraido = processar_arquivo_bytes(conteudo_bytes, extensao)
-    except HTTPException as he:
-        raise he
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Erro ao processar arquivo: {str(e)}")
+        extensao = extensao_de(nome_arquivo)
+        if extensao not in ("docx", "pdf"):
+            raise HTTPException(status_code=400, detail="Formato não suportado. Envie .docx ou .pdf")
+        metricas.tamanho_arquivos.observar(recebido.tamanho, extensao)
+
+        chave = chave_arquivo(recebido.sha256, extensao)
+        texto_extraido = obter_extracao(chave)
+        if texto_extraido is None:
+            try:
+                with metricas.duracao_extracao.medir(extensao):
+                    texto_extraido = await extrair_arquivo_fora_do_loop(recebido.fonte, extensao, recebido.tamanho)
+            except HTTPException as he:
+                raise he
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Erro ao processar arquivo: {str(e)}")
+            guardar_extracao(chave, texto_extraido)
+    finally:
+        recebido.descartar()
 
     if not texto_extraido.strip():
         raise HTTPException(status_code=400, detail="Não foi possível extrair texto do arquivo.")
+    return texto_extraido
+
+@app.post("/auditar")
+async def auditar_minuta(dados: MinutaInput):
+    resultado = await auditar_texto(dados.texto)
+    return resultado
+
+@app.post("/auditar/stream")
+async def auditar_minuta_stream(dados: MinutaInput, formato: str = "ndjson"):
+    return resposta_em_stream(dados.texto, formato)
 
-    resultado = processar_minuta(texto_extraido)
+@app.post("/auditar/incremental")
+async def auditar_minuta_incremental(dados: IncrementalInput):
+    """Reaudita o documento com as edições (core.incremental.reauditar): só as regras dos trechos
+    tocados rodam de novo, mas normalização, busca no memo, spans e HTML seguem o documento inteiro."""
+    texto_base = documentos.obter(dados.documento_id)
+    if texto_base is None:
+        raise HTTPException(status_code=404, detail="Documento base não encontrado (audite o texto completo novamente).")
+
+    edicoes = [(e.inicio, e.remover, e.inserir) for e in dados.edicoes]
+    # Roda numa thread deste processo: o cache de resultados por regra fica aqui; os trechos
+    # alterados de uma minuta grande vão ao pool.
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(obter_pool_threads(), reauditar, texto_base, edicoes, mapeador_de_trechos(len(texto_base)))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/cache")
+async def estatisticas_cache():
+    return {"resultados": cache_resultados.estatisticas(), "extracao": cache_extracao.estatisticas()}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metricas_prometheus():
+    return PlainTextResponse(metricas.registro.exposicao(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/planos")
+async def planos_de_auditoria():
+    return {tipo: plano.descrever() for tipo, plano in PLANOS.items()}
+
+@app.post("/auditar/lote")
+async def auditar_minuta_lote(dados: LoteInput):
+    if len(dados.textos) > max_itens_lote:
+        raise HTTPException(status_code=413, detail=f"Lote com {len(dados.textos)} minutas; o máximo é {max_itens_lote}.")
+
+    normalizados = [normalizar_quebras_de_linha(texto) for texto in dados.textos]
+    for texto in normalizados:
+        metricas.tamanho_documentos.observar(len(texto))
+    chaves = [chave_minuta(texto) for texto in normalizados]
+    resultados = [cache_resultados.obter(chave) for chave in chaves]
+    pendentes = [i for i, resultado in enumerate(resultados) if resultado is None]
+    resultados = [resultado and {"status": "OK", "resultado": sem_eventos(resultado)} for resultado in resultados]
+
+    pool, fatias, futures = enviar_lote([dados.textos[i] for i in pendentes])
+    resultados_fatias = await asyncio.gather(*(asyncio.wrap_future(f) for f in futures), return_exceptions=True)
+    for i, item in zip(pendentes, juntar_lote(pool, fatias, resultados_fatias)):
+        if item["status"] == "OK" and not teve_tempo_excedido(item["resultado"]):
+            cache_resultados.guardar(chaves[i], item["resultado"])
+        resultados[i] = item
+    return {"resultados": resultados}
+
+@app.post("/auditar/arquivo", openapi_extra=CORPO_ENVIO)
+async def auditar_minuta_arquivo(request: Request):
+    texto_extraido = await extrair_texto_enviado(request)
+
+    resultado = await auditar_texto(texto_extraido)
     resultado["texto_extraido"] = texto_extraido 
     return resultado
 
+@app.post("/auditar/arquivo/stream", openapi_extra=CORPO_ENVIO)
+async def auditar_minuta_arquivo_stream(request: Request, formato: str = "ndjson"):
+    texto_extraido = await extrair_texto_enviado(request)
+    return resposta_em_stream(texto_extraido, formato, {"texto_extraido": texto_extraido})
+
 app.mount("/", StaticFiles(directory="static", html=True), name="static")
 
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run(app, host="127.0.0.1", port=8000)
\ No newline at end of file
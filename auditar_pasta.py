@@ -0,0 +1,52 @@
+"""Audita os .docx e .pdf de uma pasta (e subpastas) e grava os resultados em JSON Lines e um resumo.
+
+Uso:
+    python auditar_pasta.py PASTA [-o resultados.jsonl] [--resumo resumo.xlsx] [--processos N]
+
+Repetido com a mesma saída, continua de onde parou: os arquivos cujo conteúdo já consta do
+manifesto (resultados.jsonl.manifesto) não são auditados de novo; um caminho ainda sem linha
+recebe a do resultado já gravado. Veja core.pasta.
+"""
+import argparse
+import os
+import sys
+
+from core.paralelo import PROCESSOS_AUDITORIA
+from core.pasta import auditar_pasta, gravar_resumo, ler_resultados
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Audita os .docx e .pdf de uma pasta.")
+    parser.add_argument("pasta")
+    parser.add_argument("-o", "--saida", default="resultados.jsonl", help="arquivo JSON Lines (padrão: resultados.jsonl)")
+    parser.add_argument("--resumo", help="resumo .xlsx ou prefixo dos CSV (padrão: o nome da saída, em CSV)")
+    parser.add_argument("--processos", type=int, default=PROCESSOS_AUDITORIA, help="processos do pool (padrão: AUDITOR_PROCESSOS ou um por núcleo)")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.pasta):
+        parser.error(f"pasta não encontrada: {args.pasta}")
+
+    def progresso(registro):
+        if registro["status"] == "OK":
+            print(f"{registro['arquivo']}: {len(registro['erros'])} achados", file=sys.stderr)
+        else:
+            print(f"{registro['arquivo']}: {registro['detalhe']}", file=sys.stderr)
+
+    try:
+        contagem = auditar_pasta(args.pasta, args.saida, args.processos, progresso)
+    except KeyboardInterrupt:
+        print("interrompido: rode de novo com a mesma saída para continuar", file=sys.stderr)
+        return 130
+    print(f"{contagem['auditados']} auditados, {contagem['pulados']} já no manifesto, {contagem['erros']} com erro", file=sys.stderr)
+
+    if os.path.exists(args.saida):
+        try:
+            gravados = gravar_resumo(ler_resultados(args.saida), args.resumo or os.path.splitext(args.saida)[0])
+        except ImportError as e:
+            print(f"resumo não gravado ({e}): o .xlsx requer openpyxl; sem a extensão, o resumo sai em CSV", file=sys.stderr)
+            return 2
+        for caminho in gravados:
+            print(f"resumo: {caminho}", file=sys.stderr)
+    return 1 if contagem["erros"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""Mede a auditoria de um anexo grande dividido em trechos nas linhas de artigo (core.pedacos) conforme o número de processos.
+
+Audita uma minuta sintética com um só anexo de centenas de artigos num só processo e com os
+trechos, em lotes, nos processos do pool (o `mapear` de core.auditor.iterar_processamento), e
+confere, por diferença, que os eventos de iterar_processamento (achados e detalhes OK de cada
+regra) são idênticos aos da auditoria serial:
+- em minutas com erros injetados em todas as regras, com várias sementes, trechos de um ou
+  mais artigos e lotes de tamanhos diferentes (trechos pequenos põem os erros de sequência na
+  costura entre trechos);
+- com os lotes nos processos do pool.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.anexo_grande [capitulos] [sementes]
+"""
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.documentos import gerar_minuta_orgao
+from core import pedacos
+from core.auditor import auditar_trechos, iterar_processamento, preparar_minuta
+
+ARTIGOS_POR_TRECHO = (1, 3, 8)
+TAMANHOS_PEDACO = (1000, 20000)
+
+def minuta(capitulos, semente=0):
+    texto, _ = gerar_minuta_orgao("CEG", artigos=20, capitulos=capitulos, secoes=3, artigos_por_secao=5, erros=3, semente=semente)
+    return texto
+
+def eventos(texto, mapear=None):
+    return json.dumps(list(iterar_processamento(texto, mapear=mapear)), sort_keys=True)
+
+def main():
+    capitulos = int(sys.argv[1]) if len(sys.argv) > 1 else 80
+    sementes = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    nucleos = os.cpu_count() or 1
+    falhas = []
+
+    casos = 0
+    configurado = pedacos.ARTIGOS_POR_TRECHO, pedacos.TAMANHO_PEDACO
+    for semente in range(sementes):
+        texto = minuta(12, semente)
+        referencia = eventos(texto)
+        for artigos in ARTIGOS_POR_TRECHO:
+            for tamanho in TAMANHOS_PEDACO:
+                pedacos.ARTIGOS_POR_TRECHO, pedacos.TAMANHO_PEDACO = artigos, tamanho
+                casos += 1
+                if eventos(texto, map) != referencia:
+                    falhas.append(f"semente {semente}, trechos de {artigos} artigo(s), lotes de {tamanho}: eventos diferem dos da auditoria serial")
+    pedacos.ARTIGOS_POR_TRECHO, pedacos.TAMANHO_PEDACO = configurado
+    print(f"diferencial: {casos} auditorias em trechos comparadas com a serial, {len(falhas)} diferenças")
+
+    texto = minuta(capitulos)
+    preparada = preparar_minuta(texto)
+    trechos = sum(len(pedacos.dividir_em_trechos(segmento)) for segmento in (preparada.texto_res, *preparada.textos_anexos))
+    print(f"\nminuta com {texto.count('Art.')} artigos, {len(texto)} caracteres, {trechos} trechos, {nucleos} núcleo(s)")
+    inicio = time.perf_counter()
+    referencia = eventos(texto)
+    serial = time.perf_counter() - inicio
+
+    print(f"{'processos':>9} {'tempo (s)':>10} {'ganho':>6}")
+    print(f"{'serial':>9} {serial:>10.2f} {1:>5.1f}x")
+    for processos in sorted({1, 2, 4, 8, 16, nucleos} & set(range(1, nucleos + 1))):
+        with ProcessPoolExecutor(max_workers=processos, mp_context=multiprocessing.get_context("spawn")) as pool:
+            # Aquece os processos (importação e regex das regras) antes de medir.
+            list(pool.map(auditar_trechos, [["ANEXO\nArt. 1º  Texto."]] * processos, ["DESCONHECIDO"] * processos, ["anexo"] * processos))
+            inicio = time.perf_counter()
+            resultado = eventos(texto, pool.map)
+            tempo = time.perf_counter() - inicio
+        print(f"{processos:>9} {tempo:>10.2f} {serial / tempo:>5.1f}x")
+        if resultado != referencia:
+            falhas.append(f"{processos} processos: eventos diferem dos da auditoria serial")
+
+    for falha in falhas:
+        print(f"FALHA: {falha}")
+    sys.exit(1 if falhas else 0)
+
+if __name__ == "__main__":
+    main()
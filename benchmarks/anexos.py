@@ -0,0 +1,70 @@
+"""Mede a auditoria de minutas com vários anexos (ANEXO I, II...) conforme o número de processos.
+
+Audita uma minuta sintética com vários anexos de numeração própria num só processo e com os
+trechos de cada anexo, em lotes, nos processos do pool (o `mapear` de
+core.auditor.iterar_processamento), e confere que:
+- o resultado em paralelo é idêntico ao serial;
+- os anexos são auditados separadamente: sem erros injetados, nenhuma regra de sequência
+  acusa salto na passagem de um anexo para o outro;
+- a regra "Estrutura do Anexo" não fica quadrática em sequências longas de linhas em branco.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.anexos [anexos] [capitulos_por_anexo]
+"""
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.documentos import gerar_minuta_orgao
+from core.auditor import auditar_trechos, contar_anexos, processar_minuta
+from core.regras.anexo import auditar_anexo
+
+LIMITE_LINHAS_EM_BRANCO_S = 0.5
+
+def main():
+    anexos = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    capitulos = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    texto, _ = gerar_minuta_orgao("CEG", artigos=60, capitulos=capitulos, anexos=anexos)
+    nucleos = os.cpu_count() or 1
+    falhas = []
+    print(f"minuta com {contar_anexos(texto)} anexos, {len(texto)} caracteres, {nucleos} núcleo(s)")
+
+    inicio = time.perf_counter()
+    referencia = processar_minuta(texto)
+    serial = time.perf_counter() - inicio
+
+    print(f"{'processos':>9} {'tempo (s)':>10} {'ganho':>6}")
+    print(f"{'serial':>9} {serial:>10.2f} {1:>5.1f}x")
+    for processos in sorted({1, 2, 4, 8, 16, nucleos} & set(range(1, nucleos + 1))):
+        with ProcessPoolExecutor(max_workers=processos, mp_context=multiprocessing.get_context("spawn")) as pool:
+            # Aquece os processos (importação e regex das regras) antes de medir.
+            list(pool.map(auditar_trechos, [["ANEXO\nArt. 1º  Texto."]] * processos, ["DESCONHECIDO"] * processos, ["anexo"] * processos))
+            inicio = time.perf_counter()
+            resultado = processar_minuta(texto, mapear=pool.map)
+            tempo = time.perf_counter() - inicio
+        print(f"{processos:>9} {tempo:>10.2f} {serial / tempo:>5.1f}x")
+        if json.dumps(resultado, sort_keys=True) != json.dumps(referencia, sort_keys=True):
+            falhas.append(f"{processos} processos: resultado difere do serial")
+
+    saltos = [erro for erro in referencia["erros"] if erro["regra"].startswith("Anexo: Sequência")]
+    print(f"\nachados de sequência nos anexos (esperado: 0): {len(saltos)}")
+    if saltos:
+        falhas.append(f"{len(saltos)} achados de sequência entre anexos, por exemplo: {saltos[0]['mensagem']}")
+
+    linhas_em_branco = "RESOLUÇÃO\n" + "\n" * 50_000 + "fim"
+    inicio = time.perf_counter()
+    auditar_anexo(linhas_em_branco)
+    tempo = time.perf_counter() - inicio
+    print(f"Estrutura do Anexo com 50 mil linhas em branco: {tempo * 1000:.1f} ms")
+    if tempo > LIMITE_LINHAS_EM_BRANCO_S:
+        falhas.append(f"Estrutura do Anexo levou {tempo:.2f} s com 50 mil linhas em branco")
+
+    for falha in falhas:
+        print(f"FALHA: {falha}")
+    sys.exit(1 if falhas else 0)
+
+if __name__ == "__main__":
+    main()
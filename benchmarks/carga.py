@@ -0,0 +1,87 @@
+"""Teste de carga: latência de requisições pequenas enquanto PDFs grandes são processados.
+
+Dispara requisições pequenas em /auditar a intervalos fixos, primeiro sem carga e depois
+com PDFs grandes chegando em /auditar/arquivo. Repete com todo o trabalho no event loop
+(como antes do executor) e com o executor configurado (AUDITOR_EXECUTOR, AUDITOR_CONCORRENCIA).
+Com o executor, o p99 das pequenas deve ficar próximo do medido sem carga.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.carga
+"""
+import asyncio
+import statistics
+import time
+
+import httpx
+
+import api
+from benchmarks.documentos import gerar_minuta, gerar_minuta_pdf
+from core import paralelo
+
+INTERVALO = 0.02
+PDFS_GRANDES = 3
+ARTIGOS_POR_PDF = 100
+TEXTO_PEQUENO = gerar_minuta(artigos=3)
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(p / 100 * len(ordenados)))]
+
+async def rodada(cliente, pdf, com_carga):
+    latencias = []
+
+    async def pequena(agendada):
+        # Mede a partir do horário agendado: se o event loop travar, o atraso para enviar também conta.
+        resposta = await cliente.post("/auditar", json={"texto": TEXTO_PEQUENO})
+        resposta.raise_for_status()
+        latencias.append(time.perf_counter() - agendada)
+
+    fim_carga = []
+
+    async def grande():
+        resposta = await cliente.post("/auditar/arquivo", files={"arquivo": ("minuta.pdf", pdf, "application/pdf")})
+        resposta.raise_for_status()
+        fim_carga.append(time.perf_counter())
+
+    grandes = [asyncio.create_task(grande()) for _ in range(PDFS_GRANDES if com_carga else 0)]
+    pequenas = []
+    inicio = time.perf_counter()
+    while True:
+        agendada = inicio + len(pequenas) * INTERVALO
+        # Segue agendando até 2 s e até o último PDF terminar, inclusive as que venceram com o loop travado.
+        if agendada >= inicio + 2.0 and all(t.done() for t in grandes) and agendada >= max(fim_carga, default=0):
+            break
+        await asyncio.sleep(max(0.0, agendada - time.perf_counter()))
+        pequenas.append(asyncio.create_task(pequena(agendada)))
+    await asyncio.gather(*grandes, *pequenas)
+    return latencias
+
+async def cenario(pdf):
+    transporte = httpx.ASGITransport(app=api.app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://auditor", timeout=None) as cliente:
+        # Sobe os processos do pool antes de medir.
+        await cliente.post("/auditar/arquivo", files={"arquivo": ("minuta.pdf", pdf, "application/pdf")})
+        return {
+            "sem carga": await rodada(cliente, pdf, com_carga=False),
+            "com PDFs": await rodada(cliente, pdf, com_carga=True),
+        }
+
+def main():
+    pdf = gerar_minuta_pdf(ARTIGOS_POR_PDF)
+    limite_configurado = paralelo.LIMITE_INLINE
+
+    print(f"{PDFS_GRANDES} PDFs de {len(pdf) // 1024} KB; requisições pequenas a cada {INTERVALO * 1000:.0f} ms")
+    print(f"executor: {paralelo.TIPO_EXECUTOR}, concorrência máxima: {paralelo.CONCORRENCIA_MAXIMA}")
+    print(f"{'modo':28} {'situação':10} {'reqs':>5} {'p50 (ms)':>9} {'p99 (ms)':>9} {'máx (ms)':>9}")
+
+    for modo, limite in (("tudo no event loop", float("inf")), ("executor", limite_configurado)):
+        paralelo.LIMITE_INLINE = limite
+        for situacao, latencias in asyncio.run(cenario(pdf)).items():
+            print(
+                f"{modo:28} {situacao:10} {len(latencias):>5} {statistics.median(latencias) * 1000:>9.1f} "
+                f"{percentil(latencias, 99) * 1000:>9.1f} {max(latencias) * 1000:>9.1f}"
+            )
+    paralelo.encerrar_pool()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""Documentos sintéticos usados pelos benchmarks: minutas em texto e PDFs sem dependências externas."""
+import random
+
+CABECALHO = (
+    "MINISTÉRIO DA INTEGRAÇÃO E DO DESENVOLVIMENTO REGIONAL\n"
+    "COMITÊ ESTRATÉGICO DE GOVERNANÇA\n\n"
+    "RESOLUÇÃO CEG/MIDR Nº {n}, DE 10 DE ABRIL DE 2024\n\n"
+    "Aprova o regimento interno do Comitê.\n\n"
+    "O COORDENADOR DO COMITÊ ESTRATÉGICO DE GOVERNANÇA DO MINISTÉRIO DA INTEGRAÇÃO E DO "
+    "DESENVOLVIMENTO REGIONAL — CEG-MIDR, no uso das atribuições, resolve:\n\n"
+)
+
+ARTIGO = (
+    "Art. {n}º  Fica instituído o Programa Regional — PRODER, conforme a Lei nº 1.234, de 05 de março de 2020:\n"
+    "I - apoiar os municípios da Região Integrada de Desenvolvimento (RIDE);\n"
+    "II - promover a integração com o Ministério - MIDR; e\n"
+    "III - fomentar 1° a cadeia produtiva local.\n"
+    "§ 1º  O disposto neste artigo aplica-se ao exercício de 2024.\n"
+)
+
+FECHO = "Esta Resolução entra em vigor na data de sua publicação.\n\nFULANO DE TAL\nCoordenador\n"
+
+def gerar_minuta(n=1, artigos=40):
+    corpo = "".join(ARTIGO.format(n=i) for i in range(1, artigos + 1))
+    return CABECALHO.format(n=n) + corpo + FECHO
+
+def _escapar_pdf(linha):
+    return linha.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def gerar_pdf(linhas, linhas_por_pagina=50, enchimento=0):
+    """PDF mínimo (Helvetica, WinAnsi) com as linhas distribuídas em páginas; basta para o pdfplumber.
+
+    `enchimento` acrescenta um objeto não referenciado com essa quantidade de bytes, para
+    simular arquivos grandes (imagens, fontes embutidas) sem mudar o texto extraído.
+    """
+    paginas = [linhas[i:i + linhas_por_pagina] for i in range(0, len(linhas), linhas_por_pagina)] or [[]]
+
+    objetos = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # árvore de páginas, preenchida depois de conhecer os objetos das páginas
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    ids_paginas = []
+    for pagina in paginas:
+        comandos = ["BT /F1 10 Tf 12 TL 50 800 Td"]
+        comandos += [f"({_escapar_pdf(linha)}) Tj T*" for linha in pagina]
+        comandos.append("ET")
+        fluxo = "\n".join(comandos).encode("cp1252", errors="replace")
+        objetos.append(b"<< /Length %d >>\nstream\n" % len(fluxo) + fluxo + b"\nendstream")
+        objetos.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objetos)
+        )
+        ids_paginas.append(len(objetos))
+    kids = b" ".join(b"%d 0 R" % i for i in ids_paginas)
+    objetos[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(ids_paginas)
+    if enchimento:
+        objetos.append(b"<< /Length %d >>\nstream\n" % enchimento + b"\0" * enchimento + b"\nendstream")
+
+    saida = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for numero, objeto in enumerate(objetos, start=1):
+        offsets.append(len(saida))
+        saida += b"%d 0 obj\n" % numero + objeto + b"\nendobj\n"
+    inicio_xref = len(saida)
+    saida += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objetos) + 1)
+    saida += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    saida += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objetos) + 1, inicio_xref)
+    return bytes(saida)
+
+def gerar_minuta_pdf(artigos=40):
+    return gerar_pdf(gerar_minuta(artigos=artigos).split("\n"))
+
+# --- Minutas realistas por órgão, com erros injetados em quantidade controlada ---
+
+ORGAOS = {
+    "CEG": {
+        "cabecalho": ["MINISTÉRIO DA INTEGRAÇÃO E DO DESENVOLVIMENTO REGIONAL", "COMITÊ ESTRATÉGICO DE GOVERNANÇA"],
+        "epigrafe": "RESOLUÇÃO CEG/MIDR Nº {n}, DE {dia} DE {mes} DE {ano}",
+        "autoridade": "O COORDENADOR DO COMITÊ ESTRATÉGICO DE GOVERNANÇA DO MINISTÉRIO DA INTEGRAÇÃO E DO DESENVOLVIMENTO REGIONAL — CEG-MIDR",
+        "cargo": "Coordenador",
+    },
+    "CONDEL": {
+        "cabecalho": [
+            "MINISTÉRIO DA INTEGRAÇÃO E DO DESENVOLVIMENTO REGIONAL",
+            "SUPERINTENDÊNCIA DO DESENVOLVIMENTO DO CENTRO-OESTE",
+            "CONSELHO DELIBERATIVO DO DESENVOLVIMENTO DO CENTRO-OESTE",
+        ],
+        "epigrafe": "RESOLUÇÃO CONDEL/SUDECO Nº {n}, DE {dia} DE {mes} DE {ano}",
+        "autoridade": "O PRESIDENTE DO CONSELHO DELIBERATIVO DO DESENVOLVIMENTO DO CENTRO-OESTE — CONDEL/SUDECO",
+        "cargo": "Presidente do Conselho",
+    },
+    "COARIDE": {
+        "cabecalho": [
+            "MINISTÉRIO DA INTEGRAÇÃO E DO DESENVOLVIMENTO REGIONAL",
+            "CONSELHO ADMINISTRATIVO DA REGIÃO INTEGRADA DE DESENVOLVIMENTO DO DISTRITO FEDERAL E ENTORNO",
+        ],
+        "epigrafe": "RESOLUÇÃO COARIDE Nº {n}, DE {dia} DE {mes} DE {ano}",
+        "autoridade": "O PRESIDENTE DO CONSELHO ADMINISTRATIVO DA REGIÃO INTEGRADA DE DESENVOLVIMENTO DO DISTRITO FEDERAL E ENTORNO — COARIDE",
+        "cargo": "Presidente do Conselho",
+    },
+    "CNRH": {
+        "cabecalho": ["MINISTÉRIO DA INTEGRAÇÃO E DO DESENVOLVIMENTO REGIONAL", "CONSELHO NACIONAL DE RECURSOS HÍDRICOS"],
+        "epigrafe": "RESOLUÇÃO CNRH Nº {n}, DE {dia} DE {mes} DE {ano}",
+        "autoridade": "O PRESIDENTE DO CONSELHO NACIONAL DE RECURSOS HÍDRICOS — CNRH",
+        "cargo": "Presidente do Conselho",
+    },
+}
+
+MESES = ("janeiro", "fevereiro", "março", "abril", "maio", "junho", "julho", "agosto", "setembro", "outubro", "novembro", "dezembro")
+SIGLAS = (
+    ("Programa de Desenvolvimento Regional", "PRODER"),
+    ("Região Integrada de Desenvolvimento", "RIDE"),
+    ("Fundo Constitucional de Financiamento", "FCO"),
+    ("Plano Regional de Desenvolvimento", "PRDCO"),
+)
+OBJETOS = ("os projetos de infraestrutura", "as ações de capacitação", "os convênios vigentes", "as metas do exercício", "os relatórios de gestão")
+VERBOS = ("apoiar", "promover", "acompanhar", "avaliar", "fomentar", "divulgar")
+
+# Regras cujos erros o gerador sabe injetar. As que existem na resolução e no anexo
+# ("Siglas", "Incisos (Sequência)"...) recebem os erros na resolução.
+INJECOES_RESOLUCAO = (
+    "Símbolos Ordinais (º)", "Artigos", "Parágrafos", "Datas", "Siglas",
+    "Incisos (Pontuação)", "Incisos (Sequência)", "Alíneas",
+)
+INJECOES_ANEXO = (
+    "Anexo: Sequência de Capítulos", "Anexo: Sequência de Seções", "Anexo: Sequência de Artigos",
+    "Anexo: Sequência de Parágrafos", "Anexo: Pontuação Hierárquica",
+    "Artigos (Formato)", "Parágrafos (Espaçamento)", "Alíneas (Pontuação)",
+)
+
+def contexto_da_injecao(regra):
+    return "Anexo" if regra in INJECOES_ANEXO else "Resolução"
+
+def _romano(numero):
+    valores = ((1000, "M"), (900, "CM"), (500, "D"), (400, "CD"), (100, "C"), (90, "XC"), (50, "L"), (40, "XL"), (10, "X"), (9, "IX"), (5, "V"), (4, "IV"), (1, "I"))
+    saida = ""
+    for valor, simbolo in valores:
+        while numero >= valor:
+            saida += simbolo
+            numero -= valor
+    return saida
+
+def _marcador(prefixo, numero, erro_espaco=False):
+    """'Art. 1º  ', 'Art. 10.  ', '§ 2º  '...; com erro_espaco, um espaço só."""
+    return f"{prefixo} {numero}{'º' if numero <= 9 else '.'}{' ' if erro_espaco else '  '}"
+
+def _artigos(rng, quantidade, incisos, alineas, paragrafos, erros, prefixo_vaga):
+    """Linhas de `quantidade` artigos. `erros` mapeia cada tipo de erro às posições sorteadas,
+    identificadas por (prefixo_vaga, artigo[, inciso, alínea ou parágrafo])."""
+    linhas = []
+    deslocamento_artigos = 0
+    for numero in range(1, quantidade + 1):
+        vaga = (prefixo_vaga, numero)
+        if vaga in erros["sequencia_artigos"]:
+            deslocamento_artigos += 1
+        numero_exibido = numero + deslocamento_artigos
+        nome, sigla = rng.choice(SIGLAS)
+        dia = rng.randint(1, 28)
+        data = f"0{rng.randint(1, 9)}" if vaga in erros["data"] else str(dia)
+        definicao = f"({sigla})" if vaga in erros["sigla"] else f"— {sigla}"
+        ordinal = "1°" if vaga in erros["ordinal"] else "1º"
+        final_caput = ("." if vaga in erros["hierarquia"] else ":") if incisos else "."
+        linhas.append(
+            _marcador("Art.", numero_exibido, vaga in erros["artigo"])
+            + f"Fica instituído o {nome} {definicao}, com início no {ordinal} dia útil, "
+            f"conforme a Lei nº {rng.randint(1000, 9999)}, de {data} de {rng.choice(MESES)} de {rng.randint(2000, 2024)}{final_caput}"
+        )
+
+        deslocamento_incisos = 0
+        for i in range(1, incisos + 1):
+            if (prefixo_vaga, numero, i) in erros["sequencia_incisos"]:
+                deslocamento_incisos += 1
+            texto = f"{_romano(i + deslocamento_incisos)} - {rng.choice(VERBOS)} {rng.choice(OBJETOS)}"
+            if i == 1 and alineas:
+                linhas.append(texto + ":")
+                for a in range(alineas):
+                    if a == alineas - 1:
+                        fim = "; e" if incisos > 1 else "."
+                    else:
+                        fim = "," if (prefixo_vaga, numero, a) in erros["alinea"] else ";"
+                    linhas.append(f"{chr(ord('a') + a)}) {rng.choice(VERBOS)} {rng.choice(OBJETOS)}{fim}")
+            elif i == incisos:
+                linhas.append(texto + ".")
+            elif i == incisos - 1:
+                linhas.append(texto + ("," if (prefixo_vaga, numero, i) in erros["pontuacao_inciso"] else "; e"))
+            else:
+                linhas.append(texto + ("," if (prefixo_vaga, numero, i) in erros["pontuacao_inciso"] else ";"))
+
+        deslocamento_paragrafos = 0
+        for p in range(1, paragrafos + 1):
+            if (prefixo_vaga, numero, p) in erros["sequencia_paragrafos"]:
+                deslocamento_paragrafos += 1
+            linhas.append(
+                _marcador("§", p + deslocamento_paragrafos, (prefixo_vaga, numero, p) in erros["paragrafo"])
+                + f"O disposto neste artigo aplica-se a {rng.choice(OBJETOS)}."
+            )
+    return linhas
+
+def gerar_minuta_orgao(orgao="CEG", artigos=40, incisos=3, alineas=2, paragrafos=2, capitulos=0,
+                       secoes=2, artigos_por_secao=3, erros=0, semente=0, anexos=1):
+    """Minuta sintética e realista do órgão (CEG, CONDEL, COARIDE ou CNRH), gerada a partir da semente.
+
+    A resolução tem `artigos` artigos, cada um com `incisos` incisos (o primeiro com `alineas`
+    alíneas) e `paragrafos` parágrafos. Com `capitulos` > 0, segue um ANEXO com essa quantidade
+    de capítulos, cada um com `secoes` seções de `artigos_por_secao` artigos. Com `anexos` > 1,
+    seguem ANEXO I, ANEXO II... iguais em estrutura, com a numeração reiniciada em cada um; os
+    erros do anexo vão todos para o ANEXO I.
+
+    Sem erros, a minuta não tem achados nas regras de INJECOES_RESOLUCAO e INJECOES_ANEXO.
+    `erros` é a quantidade de erros por regra (um int para todas ou um dict regra -> quantidade);
+    cada erro injetado gera exatamente um achado da regra. Devolve (texto, injetados), com a
+    quantidade efetivamente injetada por regra (limitada pelas posições disponíveis).
+    """
+    rng = random.Random(semente)
+    dados = ORGAOS[orgao]
+    regras = INJECOES_RESOLUCAO + (INJECOES_ANEXO if capitulos else ())
+    pedidos = {regra: erros for regra in regras} if isinstance(erros, int) else {r: n for r, n in erros.items() if r in regras}
+
+    alineas_intermediarias = max(0, alineas - 1) if incisos else 0
+    incisos_intermediarios = [i for i in range(1, incisos) if not (i == 1 and alineas)]
+    artigos_anexo = capitulos * secoes * artigos_por_secao
+
+    def vagas(prefixo, tipo):
+        quantidade = artigos if prefixo == "res" else artigos_anexo
+        numeros = range(1, quantidade + 1)
+        return {
+            "artigo": [(prefixo, n) for n in numeros],
+            "paragrafo": [(prefixo, n, p) for n in numeros for p in range(1, paragrafos + 1)],
+            "alinea": [(prefixo, n, a) for n in numeros for a in range(alineas_intermediarias)],
+            "pontuacao_inciso": [(prefixo, n, i) for n in numeros for i in incisos_intermediarios],
+            "sequencia_incisos": [(prefixo, n, i) for n in numeros for i in range(2, incisos + 1)],
+            "sequencia_artigos": [(prefixo, n) for n in numeros if n > 1],
+            "sequencia_paragrafos": [(prefixo, n, p) for n in numeros for p in range(2, paragrafos + 1)],
+            "hierarquia": [(prefixo, n) for n in numeros] if incisos else [],
+        }[tipo]
+
+    # Regra -> (tipo de erro, posições possíveis).
+    posicoes = {
+        "Símbolos Ordinais (º)": ("ordinal", vagas("res", "artigo")),
+        "Artigos": ("artigo", vagas("res", "artigo")),
+        "Parágrafos": ("paragrafo", vagas("res", "paragrafo")),
+        "Datas": ("data", vagas("res", "artigo")),
+        "Siglas": ("sigla", vagas("res", "artigo")),
+        "Incisos (Pontuação)": ("pontuacao_inciso", vagas("res", "pontuacao_inciso")),
+        "Incisos (Sequência)": ("sequencia_incisos", vagas("res", "sequencia_incisos")),
+        "Alíneas": ("alinea", vagas("res", "alinea")),
+        "Anexo: Sequência de Capítulos": ("capitulo", list(range(2, capitulos + 1))),
+        "Anexo: Sequência de Seções": ("secao", [(c, s) for c in range(1, capitulos + 1) for s in range(2, secoes + 1)]),
+        "Anexo: Sequência de Artigos": ("sequencia_artigos", vagas("anx", "sequencia_artigos")),
+        "Anexo: Sequência de Parágrafos": ("sequencia_paragrafos", vagas("anx", "sequencia_paragrafos")),
+        "Anexo: Pontuação Hierárquica": ("hierarquia", vagas("anx", "hierarquia")),
+        "Artigos (Formato)": ("artigo", vagas("anx", "artigo")),
+        "Parágrafos (Espaçamento)": ("paragrafo", vagas("anx", "paragrafo")),
+        "Alíneas (Pontuação)": ("alinea", vagas("anx", "alinea")),
+    }
+    sorteio = {tipo: set() for tipo, _ in posicoes.values()}
+    sorteio["ordinal"] = set()
+    injetados = {}
+    for regra in regras:
+        tipo, possiveis = posicoes[regra]
+        escolhidas = rng.sample(possiveis, min(pedidos.get(regra, 0), len(possiveis)))
+        sorteio[tipo].update(escolhidas)
+        injetados[regra] = len(escolhidas)
+
+    ano = rng.randint(2020, 2025)
+    linhas = list(dados["cabecalho"]) + [
+        "",
+        dados["epigrafe"].format(n=rng.randint(1, 200), dia=rng.randint(1, 28), mes=rng.choice(MESES).upper(), ano=ano),
+        "",
+        "Aprova o regimento interno e dá outras providências.",
+        "",
+        f"{dados['autoridade']}, no uso das atribuições que lhe confere o regimento, o Colegiado resolve:",
+        "",
+    ]
+    linhas += _artigos(rng, artigos, incisos, alineas, paragrafos, sorteio, "res")
+    linhas += [_marcador("Art.", artigos + 1) + "Esta Resolução entra em vigor na data de sua publicação.", "", "FULANO DE TAL", dados["cargo"]]
+
+    sem_erros = {tipo: set() for tipo in sorteio}
+    for numero_anexo in range(1, anexos + 1 if capitulos else 1):
+        erros_anexo = sorteio if numero_anexo == 1 else sem_erros
+        titulo = "ANEXO" if anexos == 1 else f"ANEXO {_romano(numero_anexo)}"
+        linhas += ["", titulo, "", "REGIMENTO INTERNO"]
+        corpo = _artigos(rng, artigos_anexo, incisos, alineas, paragrafos, erros_anexo, "anx")
+        # Cada artigo ocupa a mesma quantidade de linhas: distribui os blocos pelas seções.
+        por_artigo = len(corpo) // artigos_anexo
+        deslocamento_capitulos = 0
+        for c in range(1, capitulos + 1):
+            deslocamento_capitulos += c in erros_anexo["capitulo"]
+            linhas += ["", f"CAPÍTULO {_romano(c + deslocamento_capitulos)}", f"DAS DISPOSIÇÕES DO TÍTULO {c}"]
+            deslocamento_secoes = 0
+            for s in range(1, secoes + 1):
+                deslocamento_secoes += (c, s) in erros_anexo["secao"]
+                linhas += [f"Seção {_romano(s + deslocamento_secoes)}", f"Das atribuições do grupo {s}"]
+                primeiro = ((c - 1) * secoes + s - 1) * artigos_por_secao
+                linhas += corpo[primeiro * por_artigo:(primeiro + artigos_por_secao) * por_artigo]
+
+    return "\n".join(linhas) + "\n", injetados
@@ -0,0 +1,71 @@
+"""Mede o crescimento do tempo das regras de incisos, alíneas e ordinais em entradas hostis.
+
+Cada forma é auditada com 256 KB, 512 KB e 1 MB. Em tempo linear, o custo por
+caractere fica estável. O script termina com código 1 se, em alguma forma, o
+custo por caractere no maior tamanho passar do dobro do custo no menor.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.escala_linear
+"""
+import sys
+import time
+
+from core.dispositivos import analisar_dispositivos
+from core.regras import estrutura
+
+TAMANHOS = (256 * 1024, 512 * 1024, 1024 * 1024)
+LIMITE_CRESCIMENTO = 2.0
+
+def _repetir(bloco, tamanho):
+    return (bloco * (tamanho // len(bloco) + 1))[:tamanho]
+
+FORMAS = {
+    "linhas em branco": lambda n: "\n" * n,
+    "espaços": lambda n: " " * n,
+    "numerais sem travessão": lambda n: "I" * n,
+    "incisos após ';' sem travessão": lambda n: _repetir(";" + "I" * 50, n),
+    "URL longa com grau no fim": lambda n: _repetir("http://www.gov.br/a?b=c&d=", n - 1) + "°",
+    "símbolos de grau seguidos": lambda n: "°" * n,
+    "ordinais curtos": lambda n: _repetir("1° ", n),
+    "tabela extraída de PDF": lambda n: _repetir("12,3°C|45,6%|", n),
+    "incisos de uma linha": lambda n: _repetir("I - a\n", n),
+    "alíneas de uma linha": lambda n: _repetir("a) x\n", n),
+    "espaços antes de hífen": lambda n: _repetir(" " * 1000 + "-", n),
+}
+
+REGRAS = (
+    estrutura.auditar_pontuacao_incisos,
+    estrutura.auditar_sequencia_incisos,
+    estrutura.auditar_formatacao_alineas,
+    estrutura.auditar_simbolo_ordinal,
+)
+
+def medir(texto):
+    analisar_dispositivos.cache_clear()
+    estrutura.varrer_lexico.cache_clear()
+    inicio = time.perf_counter()
+    for regra in REGRAS:
+        regra(texto)
+    return time.perf_counter() - inicio
+
+def main():
+    cabecalho = " ".join(f"{t // 1024:>7} KB" for t in TAMANHOS)
+    print(f"{'forma':32} {cabecalho} {'crescimento':>12}")
+
+    superlineares = []
+    for nome, gerar in FORMAS.items():
+        tempos = [medir(gerar(tamanho)) for tamanho in TAMANHOS]
+        por_caractere = [tempo / tamanho for tempo, tamanho in zip(tempos, TAMANHOS)]
+        crescimento = por_caractere[-1] / por_caractere[0]
+        if crescimento > LIMITE_CRESCIMENTO:
+            superlineares.append(nome)
+
+        colunas = " ".join(f"{tempo * 1000:>7.0f} ms" for tempo in tempos)
+        print(f"{nome:32} {colunas} {crescimento:>11.2f}x")
+
+    if superlineares:
+        print("Crescimento superlinear em: " + ", ".join(superlineares))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Mede o tempo de extração de um PDF grande conforme o número de processos.
+
+Compara a extração página a página num só processo com a divisão em intervalos de
+páginas extraídos em paralelo (core.file_parser.iterar_paginas_pdf) e confere que o
+texto juntado é idêntico.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.extracao_pdf [artigos]
+"""
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.documentos import gerar_minuta_pdf
+from core.file_parser import contar_paginas_pdf, extrair_paginas_pdf, extrair_texto_pdf, iterar_paginas_pdf, juntar_paginas
+
+def main():
+    artigos = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    pdf = gerar_minuta_pdf(artigos)
+    nucleos = os.cpu_count() or 1
+    print(f"PDF com {contar_paginas_pdf(pdf)} páginas ({len(pdf) // 1024} KB), {nucleos} núcleo(s)")
+
+    inicio = time.perf_counter()
+    referencia = extrair_texto_pdf(pdf)
+    serial = time.perf_counter() - inicio
+
+    print(f"{'processos':>9} {'tempo (s)':>10} {'ganho':>6}")
+    print(f"{'serial':>9} {serial:>10.2f} {1:>5.1f}x")
+    for processos in sorted({1, 2, 4, 8, 16, nucleos} & set(range(1, nucleos + 1))):
+        with ProcessPoolExecutor(max_workers=processos, mp_context=multiprocessing.get_context("spawn")) as pool:
+            # Aquece os processos (importação do pdfplumber) antes de medir.
+            list(pool.map(extrair_paginas_pdf, [pdf] * processos, [0] * processos, [0] * processos))
+            inicio = time.perf_counter()
+            texto = juntar_paginas(iterar_paginas_pdf(pdf, pool, partes=processos * 2))
+            tempo = time.perf_counter() - inicio
+        assert texto == referencia, "extração paralela divergiu da serial"
+        print(f"{processos:>9} {tempo:>10.2f} {serial / tempo:>5.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Mede gerar_html_anotado com 5 a 50 mil achados, muitos com spans sobrepostos ou aninhados.
+
+Compara a renderização (core.auditor.renderizar_destaques) com a anterior, que ordenava os
+spans e descartava os que começavam antes do fim do último destaque, escapando cada trecho e
+título separadamente, e confere que:
+- todo achado com span aparece em algum <mark> (em data-erros);
+- sem as tags, o HTML volta a ser exatamente o texto original;
+- o tempo por achado não cresce com a quantidade (no máximo 2x de 5 mil para 50 mil).
+
+Uso (na raiz do projeto):
+    python -m benchmarks.html_anotado [semente]
+"""
+import html
+import random
+import re
+import statistics
+import sys
+import time
+
+from benchmarks.documentos import gerar_minuta
+from core.auditor import gerar_html_anotado, renderizar_destaques
+
+QUANTIDADES = (5_000, 20_000, 50_000)
+REPETICOES = 3
+LIMITE_CRESCIMENTO = 2.0
+
+def achados(texto, quantidade, aleatorio):
+    """Lista no formato de iterar_processamento: um terço dos spans cai dentro ou sobre outro."""
+    detalhes = []
+    for i in range(quantidade):
+        if detalhes and i % 3 == 0:
+            base_inicio, base_fim = detalhes[aleatorio.randrange(len(detalhes))]["span"]
+            inicio = aleatorio.randint(base_inicio, base_fim)
+        else:
+            inicio = aleatorio.randrange(len(texto) - 40)
+        detalhes.append({"mensagem": f"Achado {i} <{inicio}> & \"aspas\"", "span": [inicio, inicio + aleatorio.randint(0, 40)]})
+    return [("Regra sintética", detalhes, "Resolução", "FALHA")]
+
+def renderizar_anterior(texto, destaques):
+    html_parts = []; cursor = 0
+    for erro in sorted(destaques, key=lambda x: x["start"]):
+        if erro["start"] < cursor:
+            continue
+        html_parts.append(html.escape(texto[cursor:erro["start"]]))
+        trecho = html.escape(texto[erro["start"]:erro["end"]])
+        html_parts.append(f'<mark id="{erro["id"]}" class="erro-highlight" title="{html.escape(erro["title"])}">{trecho}</mark>')
+        cursor = erro["end"]
+    html_parts.append(html.escape(texto[cursor:]))
+    return "".join(html_parts)
+
+def mediana(funcao, *args):
+    tempos = []
+    for _ in range(REPETICOES):
+        inicio = time.perf_counter()
+        resultado = funcao(*args)
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos), resultado
+
+def main():
+    aleatorio = random.Random(int(sys.argv[1]) if len(sys.argv) > 1 else 0)
+    texto = gerar_minuta(artigos=2000)
+    falhas = []
+    por_achado = {}
+
+    print(f"texto com {len(texto)} caracteres")
+    print(f"{'achados':>8} {'anterior (ms)':>14} {'destacados':>10} {'atual (ms)':>11} {'destacados':>10} {'marks':>6} {'gerar_html_anotado (ms)':>24}")
+    for quantidade in QUANTIDADES:
+        lista = achados(texto, quantidade, aleatorio)
+        tempo_total, (html_final, erros) = mediana(gerar_html_anotado, texto, lista)
+        destaques = [
+            {"start": d["span"][0], "end": d["span"][1], "id": f"erro_{i}", "ordem": i, "title": f"Regra sintética: {d['mensagem']}"}
+            for i, d in enumerate(lista[0][1], start=1)
+        ]
+        tempo_anterior, html_anterior = mediana(renderizar_anterior, texto, destaques)
+        tempo, _ = mediana(renderizar_destaques, texto, destaques)
+
+        marcados = {erro_id for ids in re.findall(r'data-erros="([^"]*)"', html_final) for erro_id in ids.split()}
+        marcados_anterior = set(re.findall(r'<mark id="([^"]*)"', html_anterior))
+        marks = html_final.count("<mark ")
+        por_achado[quantidade] = tempo / quantidade
+        print(
+            f"{quantidade:>8} {tempo_anterior * 1000:>14.1f} {len(marcados_anterior):>10} "
+            f"{tempo * 1000:>11.1f} {len(marcados):>10} {marks:>6} {tempo_total * 1000:>24.1f}"
+        )
+
+        if marcados != {erro["id"] for erro in erros if erro["id"]}:
+            falhas.append(f"{quantidade} achados: {quantidade - len(marcados)} sem destaque")
+        if html.unescape(re.sub(r"<mark [^>]*>|</mark>", "", html_final)) != texto:
+            falhas.append(f"{quantidade} achados: o HTML sem as tags não é o texto original")
+
+    crescimento = por_achado[QUANTIDADES[-1]] / por_achado[QUANTIDADES[0]]
+    print(f"\ntempo por achado, {QUANTIDADES[-1]} vs {QUANTIDADES[0]}: {crescimento:.2f}x")
+    if crescimento > LIMITE_CRESCIMENTO:
+        falhas.append(f"tempo por achado cresceu {crescimento:.2f}x")
+
+    for falha in falhas:
+        print(f"FALHA: {falha}")
+    sys.exit(1 if falhas else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Mede a partida a frio do servidor: importação de `api` e a primeira requisição a /auditar.
+
+Cada cenário roda num interpretador novo, como numa função serverless recém-criada:
+com os extratores (python-docx, pdfplumber) importados sob demanda, com eles importados
+junto com `api` (como antes) e com o aquecimento de AUDITOR_AQUECER. Em seguida, lista as
+importações mais caras segundo `python -X importtime`.
+
+O script termina com código 1 se `import api` ou a primeira /auditar carregarem um extrator,
+ou se a importação de `api` passar do orçamento (em ms, padrão 1500).
+
+Uso (na raiz do projeto):
+    python -m benchmarks.importacao [orçamento_ms]
+"""
+import json
+import statistics
+import subprocess
+import sys
+
+from benchmarks.documentos import gerar_minuta
+
+REPETICOES = 5
+EXTRATORES = ("docx", "pdfplumber")
+
+# Chama o app ASGI direto, sem cliente HTTP, para não somar a importação do cliente.
+PARTIDA = """
+import asyncio, json, sys, time
+texto = sys.stdin.read()
+inicio = time.perf_counter()
+{antes}
+import api
+importado = time.perf_counter()
+{aquecimento}
+aquecido = time.perf_counter()
+extratores_na_importacao = [m for m in {extratores!r} if m in sys.modules]
+
+async def primeira_requisicao():
+    corpo = json.dumps({{"texto": texto}}).encode()
+    escopo = {{
+        "type": "http", "asgi": {{"version": "3.0"}}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": "/auditar", "raw_path": b"/auditar", "query_string": b"",
+        "root_path": "", "client": ("127.0.0.1", 1), "server": ("auditor", 80),
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(corpo)).encode())],
+    }}
+    mensagens = [{{"type": "http.request", "body": corpo, "more_body": False}}]
+    respostas = []
+
+    async def receber():
+        return mensagens.pop(0) if mensagens else {{"type": "http.disconnect"}}
+
+    async def enviar(mensagem):
+        if mensagem["type"] == "http.response.start":
+            respostas.append(mensagem["status"])
+
+    await api.app(escopo, receber, enviar)
+    return respostas[0]
+
+status = asyncio.run(primeira_requisicao())
+fim = time.perf_counter()
+print(json.dumps({{
+    "status": status,
+    "importacao": importado - inicio,
+    "aquecimento": aquecido - importado,
+    "primeira": fim - aquecido,
+    "extratores_na_importacao": extratores_na_importacao,
+    "extratores_na_requisicao": [m for m in {extratores!r} if m in sys.modules],
+}}))
+"""
+
+CENARIOS = {
+    "extratores sob demanda": {"antes": "", "aquecimento": ""},
+    "extratores na importação": {"antes": "import docx, pdfplumber", "aquecimento": ""},
+    "com aquecimento": {"antes": "", "aquecimento": "from core.auditor import aquecer; aquecer()"},
+}
+
+def partida(texto, antes, aquecimento):
+    codigo = PARTIDA.format(antes=antes, aquecimento=aquecimento, extratores=EXTRATORES)
+    saida = subprocess.run([sys.executable, "-c", codigo], input=texto, capture_output=True, text=True, encoding="utf-8", check=True)
+    medida = json.loads(saida.stdout)
+    assert medida["status"] == 200, medida
+    return medida
+
+def importacoes_mais_caras(quantidade=12):
+    """(módulo, tempo acumulado em ms) dos pacotes de primeiro nível importados por `import api`."""
+    saida = subprocess.run([sys.executable, "-X", "importtime", "-c", "import api"], capture_output=True, text=True, check=True)
+    tempos = {}
+    for linha in saida.stderr.splitlines():
+        partes = linha.removeprefix("import time:").split("|")
+        if len(partes) != 3 or not partes[1].strip().isdigit():
+            continue
+        modulo = partes[2].strip()
+        if "." not in modulo:
+            tempos[modulo] = max(tempos.get(modulo, 0), int(partes[1]) / 1000)
+    return sorted(tempos.items(), key=lambda item: -item[1])[:quantidade]
+
+def main():
+    orcamento_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 1500
+    texto = gerar_minuta(artigos=3)
+    falhas = []
+
+    print(f"{REPETICOES} partidas por cenário (medianas)")
+    print(f"{'cenário':26} {'import api (ms)':>16} {'aquecimento (ms)':>17} {'1ª /auditar (ms)':>17} {'total (ms)':>11}")
+    for nome, cenario in CENARIOS.items():
+        medidas = [partida(texto, **cenario) for _ in range(REPETICOES)]
+        mediana = {campo: statistics.median(m[campo] for m in medidas) * 1000 for campo in ("importacao", "aquecimento", "primeira")}
+        print(
+            f"{nome:26} {mediana['importacao']:>16.1f} {mediana['aquecimento']:>17.1f} "
+            f"{mediana['primeira']:>17.1f} {sum(mediana.values()):>11.1f}"
+        )
+        if nome == "extratores sob demanda":
+            carregados = set().union(*(m["extratores_na_requisicao"] for m in medidas))
+            if carregados:
+                falhas.append(f"import api / primeira /auditar carregaram {', '.join(sorted(carregados))}")
+            if mediana["importacao"] > orcamento_ms:
+                falhas.append(f"import api levou {mediana['importacao']:.0f} ms (orçamento: {orcamento_ms:.0f} ms)")
+
+    print("\nimportações mais caras de `import api` (-X importtime, acumulado):")
+    for modulo, ms in importacoes_mais_caras():
+        print(f"  {modulo:30} {ms:>8.1f} ms")
+
+    for falha in falhas:
+        print(f"FALHA: {falha}")
+    sys.exit(1 if falhas else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Mede a reauditoria incremental (core.incremental) de uma edição de um caractere conforme o tamanho da minuta.
+
+Para cada tamanho, audita a minuta inteira com o memo das regras vazio (como a primeira
+/auditar, que o preenche) e depois a minuta com um caractere trocado no meio do anexo (como
+/auditar/incremental), e confere que:
+- a reauditoria tem o mesmo resultado que processar_minuta sem o memo;
+- a primeira edição já reaproveita resultados da auditoria completa;
+- as regras executadas na edição (as dos trechos tocados e as que rodam sobre o segmento
+  inteiro) não crescem com o tamanho da minuta;
+- a reauditoria do maior tamanho leva menos que LIMITE_FRACAO da auditoria completa: só os
+  trechos tocados e as regras sobre o segmento inteiro rodam de novo.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.incremental [capitulos,capitulos,...]
+"""
+import json
+import sys
+import time
+
+from benchmarks.documentos import gerar_minuta_orgao
+from core.auditor import processar_minuta
+from core.cache import MemoRegras, memo_regras
+from core.incremental import aplicar_edicoes
+
+CAPITULOS = (10, 40, 160)
+LIMITE_FRACAO = 0.5
+
+def editar_no_meio(texto: str) -> list:
+    """Uma edição (inicio, remover, inserir) que troca "de" por "da" no meio do anexo."""
+    inicio = texto.index(" de ", texto.index("\nANEXO") + (len(texto) - texto.index("\nANEXO")) // 2)
+    return [(inicio + 2, 1, "a")]
+
+def medir(funcao, *args):
+    inicio = time.perf_counter()
+    resultado = funcao(*args)
+    return resultado, time.perf_counter() - inicio
+
+def main():
+    capitulos = [int(c) for c in sys.argv[1].split(",")] if len(sys.argv) > 1 else CAPITULOS
+    falhas = []
+    executadas = []
+    print(f"{'artigos':>8} {'caracteres':>11} {'completa (s)':>13} {'edição (s)':>11} {'fração':>7} {'reaproveitadas':>15}")
+    for quantidade in capitulos:
+        texto, _ = gerar_minuta_orgao("CEG", artigos=20, capitulos=quantidade, secoes=3, artigos_por_secao=5, erros=3)
+        memo_regras.limpar()
+        _, completa = medir(processar_minuta, texto, MemoRegras(memo_regras))
+
+        texto_novo = aplicar_edicoes(texto, editar_no_meio(texto))
+        memo = MemoRegras(memo_regras)
+        resultado, edicao = medir(processar_minuta, texto_novo, memo)
+        fracao = edicao / completa
+        total = memo.reaproveitadas + memo.executadas
+        executadas.append(memo.executadas)
+        print(f"{texto.count('Art.'):>8} {len(texto):>11} {completa:>13.3f} {edicao:>11.3f} {fracao:>7.2f} {memo.reaproveitadas:>7}/{total:<7}")
+
+        if json.dumps(resultado, sort_keys=True) != json.dumps(processar_minuta(texto_novo), sort_keys=True):
+            falhas.append(f"{quantidade} capítulos: reauditoria difere da auditoria sem o memo")
+        if not memo.reaproveitadas:
+            falhas.append(f"{quantidade} capítulos: a primeira edição não reaproveitou nada")
+    if executadas[-1] > executadas[0]:
+        falhas.append(f"regras executadas na edição cresceram com a minuta: {executadas}")
+    if fracao >= LIMITE_FRACAO:
+        falhas.append(f"{quantidade} capítulos: a edição levou {fracao:.0%} da auditoria completa")
+
+    for falha in falhas:
+        print(f"FALHA: {falha}")
+    sys.exit(1 if falhas else 0)
+
+if __name__ == "__main__":
+    main()
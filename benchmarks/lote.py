@@ -0,0 +1,42 @@
+"""Mede a vazão da auditoria em lote (minutas por segundo) conforme o número de processos.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.lote [quantidade_de_minutas]
+"""
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.documentos import gerar_minuta
+from core.paralelo import auditar_lote_local, dividir_lote
+
+def medir(textos, processos):
+    with ProcessPoolExecutor(max_workers=processos, mp_context=multiprocessing.get_context("spawn")) as pool:
+        # Aquece os processos (importação de core) antes de medir.
+        list(pool.map(auditar_lote_local, [[textos[0]]] * processos))
+        inicio = time.perf_counter()
+        futures = [pool.submit(auditar_lote_local, fatia) for fatia in dividir_lote(textos, processos)]
+        resultados = [item for future in futures for item in future.result()]
+        tempo = time.perf_counter() - inicio
+    assert len(resultados) == len(textos) and all(r["status"] == "OK" for r in resultados)
+    return tempo
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    textos = [gerar_minuta(n) for n in range(quantidade)]
+
+    nucleos = os.cpu_count() or 1
+    contagens = sorted({1, 2, 4, 8, 16, nucleos} & set(range(1, nucleos + 1)))
+
+    print(f"{quantidade} minutas, {nucleos} núcleo(s)")
+    print(f"{'processos':>9} {'tempo (s)':>10} {'minutas/s':>10} {'ganho':>6}")
+    base = None
+    for processos in contagens:
+        tempo = medir(textos, processos)
+        base = base or tempo
+        print(f"{processos:>9} {tempo:>10.2f} {quantidade / tempo:>10.1f} {base / tempo:>5.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Mede o pico de memória (RSS) do servidor ao receber e extrair PDFs grandes em /auditar/arquivo.
+
+Cada cenário roda num interpretador novo, com o executor de threads (a extração fica no
+mesmo processo) e o corpo enviado aos poucos, lido de um arquivo. Antes, o servidor recebe
+o mesmo PDF sem o enchimento (mesmo texto, poucos KB): o acréscimo ao pico de RSS depois
+dele é o custo de receber e extrair um arquivo grande. Compara os arquivos guardados em
+disco (padrão) com tudo na memória (AUDITOR_ENVIO_MEMORIA acima do tamanho do arquivo,
+como era antes) e confere que um envio acima de AUDITOR_ENVIO_MAXIMO recebe 413 sem que
+a memória cresça com ele.
+
+O script termina com código 1 se, em disco, o pico crescer mais que metade do tamanho do
+arquivo, ou se o envio acima do máximo não for recusado.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.memoria_envio [tamanhos_mb]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.documentos import gerar_minuta, gerar_pdf
+
+MB = 1024 * 1024
+
+ENVIO = """
+import asyncio, json, resource, sys
+import httpx
+import api
+
+def pico_mb():
+    # VmHWM é do processo atual; ru_maxrss herda o pico do processo que o criou (o script, que gera os PDFs).
+    try:
+        with open("/proc/self/status") as status:
+            return next(int(linha.split()[1]) for linha in status if linha.startswith("VmHWM:")) / 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+async def enviar(cliente, caminho):
+    with open(caminho, "rb") as arquivo:
+        resposta = await cliente.post("/auditar/arquivo", files={{"arquivo": ("minuta.pdf", arquivo, "application/pdf")}})
+    return resposta.status_code
+
+async def main():
+    transporte = httpx.ASGITransport(app=api.app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://auditor", timeout=None) as cliente:
+        await enviar(cliente, {referencia!r})
+        antes = pico_mb()
+        status = await enviar(cliente, {caminho!r})
+        print(json.dumps({{"status": status, "acrescimo_mb": pico_mb() - antes}}))
+
+asyncio.run(main())
+"""
+
+def medir(caminho, referencia, **ambiente):
+    env = {**os.environ, "AUDITOR_EXECUTOR": "thread", **{chave: str(valor) for chave, valor in ambiente.items()}}
+    saida = subprocess.run([sys.executable, "-c", ENVIO.format(caminho=caminho, referencia=referencia)], env=env, capture_output=True, text=True, check=True)
+    return json.loads(saida.stdout)
+
+def main():
+    tamanhos = [int(t) for t in sys.argv[1].split(",")] if len(sys.argv) > 1 else [10, 50, 100]
+    linhas = gerar_minuta(artigos=50).split("\n")
+    falhas = []
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as referencia:
+        referencia.write(gerar_pdf(linhas))
+
+    print(f"{'arquivo (MB)':>12} {'em disco (MB)':>14} {'na memória (MB)':>16} {'acima do máximo (MB)':>21}")
+    for tamanho_mb in tamanhos:
+        maximo = (tamanho_mb + 1) * MB
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as arquivo:
+            arquivo.write(gerar_pdf(linhas, enchimento=tamanho_mb * MB))
+        try:
+            em_disco = medir(arquivo.name, referencia.name, AUDITOR_ENVIO_MAXIMO=maximo)
+            na_memoria = medir(arquivo.name, referencia.name, AUDITOR_ENVIO_MEMORIA=maximo, AUDITOR_ENVIO_MAXIMO=maximo)
+            acima = medir(arquivo.name, referencia.name, AUDITOR_ENVIO_MAXIMO=tamanho_mb * MB // 2)
+        finally:
+            os.remove(arquivo.name)
+        print(
+            f"{tamanho_mb:>12} {em_disco['acrescimo_mb']:>14.1f} {na_memoria['acrescimo_mb']:>16.1f} "
+            f"{acima['acrescimo_mb']:>17.1f} ({acima['status']})"
+        )
+        if em_disco["status"] != 200 or na_memoria["status"] != 200:
+            falhas.append(f"{tamanho_mb} MB: status {em_disco['status']} (disco) / {na_memoria['status']} (memória)")
+        if em_disco["acrescimo_mb"] > tamanho_mb / 2:
+            falhas.append(f"{tamanho_mb} MB: pico cresceu {em_disco['acrescimo_mb']:.1f} MB com o arquivo em disco")
+        if acima["status"] != 413:
+            falhas.append(f"{tamanho_mb} MB: envio acima do máximo recebeu {acima['status']}")
+
+    os.remove(referencia.name)
+
+    for falha in falhas:
+        print(f"FALHA: {falha}")
+    sys.exit(1 if falhas else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Tempos por regra e de ponta a ponta de processar_minuta em minutas sintéticas de cada órgão.
+
+Gera minutas com `benchmarks.documentos.gerar_minuta_orgao` (semente fixa) em vários tamanhos,
+audita cada uma algumas vezes e guarda as medianas num JSON, para comparar entre commits.
+O tempo de cada regra é o intervalo entre os eventos de iterar_processamento: o da primeira
+regra inclui a preparação do texto e o de "HTML anotado", a geração do HTML. As análises
+compartilhadas (árvore de dispositivos, varredura léxica, índice de linhas) são descartadas
+antes de cada repetição, e o seu custo fica com a primeira regra que as usa.
+
+Também confere que cada erro injetado gerou exatamente um achado da regra correspondente.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.minutas_sinteticas [--tamanhos 10,100,400] [--orgaos CEG,CNRH]
+        [--erros 3] [--semente 0] [--repeticoes 3] [--saida resultados.json] [--comparar anterior.json]
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+
+from benchmarks.documentos import ORGAOS, contexto_da_injecao, gerar_minuta_orgao
+from core.auditor import iterar_processamento
+from core.dispositivos import analisar_dispositivos
+from core.linhas import indice_linhas
+from core.regras.estrutura import varrer_lexico
+
+# Variação tolerada na comparação antes de apontar uma regressão.
+LIMITE_REGRESSAO = 1.2
+
+def limpar_analises():
+    analisar_dispositivos.cache_clear()
+    varrer_lexico.cache_clear()
+    indice_linhas.cache_clear()
+
+def auditar_medindo(texto):
+    """(tempo total, {regra: tempo}, evento final) de uma auditoria completa."""
+    tempos = {}
+    limpar_analises()
+    inicio = anterior = time.perf_counter()
+    for evento in iterar_processamento(texto):
+        agora = time.perf_counter()
+        nome = "HTML anotado" if evento["evento"] == "fim" else f"{evento['contexto']} / {evento['regra']}"
+        tempos[nome] = tempos.get(nome, 0.0) + agora - anterior
+        anterior = agora
+    return anterior - inicio, tempos, evento
+
+def conferir(injetados, erros):
+    achados = Counter((erro["contexto"], erro["regra"]) for erro in erros)
+    return {
+        regra: {"injetados": quantidade, "achados": achados[(contexto_da_injecao(regra), regra)]}
+        for regra, quantidade in injetados.items()
+        if achados[(contexto_da_injecao(regra), regra)] != quantidade
+    }
+
+def medir(orgao, artigos, erros, semente, repeticoes):
+    # O anexo cresce junto com a resolução: um capítulo (2 seções de 3 artigos) a cada 6 artigos.
+    texto, injetados = gerar_minuta_orgao(orgao, artigos=artigos, capitulos=max(1, artigos // 6), erros=erros, semente=semente)
+    totais, por_regra = [], defaultdict(list)
+    for _ in range(repeticoes):
+        total, tempos, fim = auditar_medindo(texto)
+        totais.append(total)
+        for nome, tempo in tempos.items():
+            por_regra[nome].append(tempo)
+    return {
+        "orgao": orgao,
+        "artigos": artigos,
+        "caracteres": len(texto),
+        "achados": len(fim["erros"]),
+        "tipo_documento": fim["tipo_documento"],
+        "divergencias": conferir(injetados, fim["erros"]),
+        "total_s": statistics.median(totais),
+        "regras_s": {nome: statistics.median(tempos) for nome, tempos in por_regra.items()},
+    }
+
+def versao_do_codigo():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def comparar(atual, anterior):
+    """Linhas de texto com a razão atual/anterior dos totais e as regras que pioraram."""
+    anteriores = {(r["orgao"], r["artigos"]): r for r in anterior["resultados"]}
+    linhas = []
+    for resultado in atual["resultados"]:
+        antes = anteriores.get((resultado["orgao"], resultado["artigos"]))
+        if antes is None:
+            continue
+        razao = resultado["total_s"] / antes["total_s"]
+        marca = "  <- regressão" if razao > LIMITE_REGRESSAO else ""
+        linhas.append(f"{resultado['orgao']:8} {resultado['artigos']:>6} artigos: {razao:5.2f}x{marca}")
+        for nome, tempo in resultado["regras_s"].items():
+            tempo_antes = antes["regras_s"].get(nome)
+            # Regras abaixo de 1 ms oscilam demais para comparar.
+            if tempo_antes and max(tempo, tempo_antes) > 0.001 and tempo / tempo_antes > LIMITE_REGRESSAO:
+                linhas.append(f"    {nome}: {tempo_antes * 1000:.1f} -> {tempo * 1000:.1f} ms")
+    return linhas
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--tamanhos", default="10,100,400", help="artigos da resolução em cada tamanho")
+    parser.add_argument("--orgaos", default=",".join(ORGAOS))
+    parser.add_argument("--erros", type=int, default=3, help="erros injetados por regra")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--saida", default="minutas_sinteticas.json")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior")
+    args = parser.parse_args()
+
+    resultados = []
+    print(f"{'órgão':8} {'artigos':>7} {'caracteres':>10} {'achados':>7} {'total (ms)':>10}  regras mais lentas")
+    for orgao in args.orgaos.split(","):
+        for artigos in map(int, args.tamanhos.split(",")):
+            resultado = medir(orgao, artigos, args.erros, args.semente, args.repeticoes)
+            resultados.append(resultado)
+            lentas = sorted(resultado["regras_s"].items(), key=lambda item: -item[1])[:3]
+            print(
+                f"{orgao:8} {artigos:>7} {resultado['caracteres']:>10} {resultado['achados']:>7} "
+                f"{resultado['total_s'] * 1000:>10.1f}  " + ", ".join(f"{nome} {t * 1000:.1f}" for nome, t in lentas)
+            )
+
+    saida = {
+        "metadados": {
+            "commit": versao_do_codigo(),
+            "data": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "maquina": platform.machine(),
+            "semente": args.semente,
+            "erros_por_regra": args.erros,
+            "repeticoes": args.repeticoes,
+        },
+        "resultados": resultados,
+    }
+    with open(args.saida, "w", encoding="utf-8") as f:
+        json.dump(saida, f, ensure_ascii=False, indent=1)
+    print(f"\nresultados gravados em {args.saida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            anterior = json.load(f)
+        print(f"\ncomparação com {args.comparar} (commit {anterior['metadados'].get('commit')}):")
+        for linha in comparar(saida, anterior):
+            print(linha)
+
+    divergentes = [r for r in resultados if r["divergencias"]]
+    for resultado in divergentes:
+        print(f"DIVERGÊNCIA {resultado['orgao']} {resultado['artigos']} artigos: {resultado['divergencias']}")
+    sys.exit(1 if divergentes else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Mede a montagem da visão de análise (core.normalizacao) e confere o mapa de offsets.
+
+Compara normalizar_para_analise com as três substituições por regex que apagavam as marcas
+de minuta, em minutas sintéticas limpas e "sujas" (acentos decompostos, espaços não
+separáveis, aspas curvas e espaços de largura zero, como no texto colado de PDF ou do
+SEI), e confere que:
+- no texto limpo, a visão é exatamente o texto das três substituições;
+- a minuta suja gera os mesmos achados que a limpa, com os spans no texto sujo cobrindo
+  os trechos equivalentes.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.normalizacao [artigos]
+"""
+import random
+import re
+import statistics
+import sys
+import time
+import unicodedata
+
+from benchmarks.documentos import gerar_minuta, gerar_minuta_orgao
+from core.auditor import processar_minuta
+from core.normalizacao import normalizar_para_analise
+
+REPETICOES = 5
+
+def substituir_por_espacos(match):
+    return " " * len(match.group(0))
+
+def marcas_anterior(texto):
+    texto = re.sub(r'^[\s\*]*MINUTA DE DOCUMENTO[^\n]*', substituir_por_espacos, texto, flags=re.IGNORECASE | re.MULTILINE)
+    texto = re.sub(r'(MINUTA\s+(?:DE\s+)?)(RESOLUÇÃO|PORTARIA)', lambda m: " " * len(m.group(1)) + m.group(2), texto, flags=re.IGNORECASE)
+    return re.sub(r'Minuta\s+assinada\s+para\s+fins\s+de\s+visualização', substituir_por_espacos, texto, flags=re.IGNORECASE)
+
+def sujar(texto, aleatorio):
+    """Acentos decompostos, aspas curvas e, em parte dos espaços, NBSP ou espaço de largura zero."""
+    texto = unicodedata.normalize("NFD", texto).replace('"', "“")
+    partes = []
+    for caractere in texto:
+        if caractere == " ":
+            sorteio = aleatorio.random()
+            caractere = "\xa0" if sorteio < 0.1 else " \u200b" if sorteio < 0.15 else " "
+        partes.append(caractere)
+    return "".join(partes)
+
+def mediana_ms(funcao, *args):
+    tempos = []
+    for _ in range(REPETICOES):
+        inicio = time.perf_counter()
+        resultado = funcao(*args)
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1000, resultado
+
+def equivalente(trecho):
+    return unicodedata.normalize("NFC", trecho).replace("\u200b", "").replace("\xa0", " ").replace("“", '"')
+
+def main():
+    artigos = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    aleatorio = random.Random(0)
+    falhas = []
+
+    limpo = "MINUTA DE DOCUMENTO\n" + gerar_minuta(artigos=artigos)
+    sujo = sujar(limpo, aleatorio)
+    print(f"{'texto':>6} {'caracteres':>10} {'três regex (ms)':>16} {'visão de análise (ms)':>22} {'pontos no mapa':>15}")
+    for nome, texto in (("limpo", limpo), ("sujo", sujo)):
+        anterior_ms, anterior = mediana_ms(marcas_anterior, texto)
+        atual_ms, visao = mediana_ms(normalizar_para_analise, texto)
+        print(f"{nome:>6} {len(texto):>10} {anterior_ms:>16.1f} {atual_ms:>22.1f} {len(visao.pos_analise):>15}")
+        if nome == "limpo" and visao.texto != anterior:
+            falhas.append("no texto limpo, a visão difere das três substituições")
+
+    minuta, _ = gerar_minuta_orgao("CEG", artigos=100, capitulos=10, erros=3)
+    esperado = processar_minuta(minuta)
+    minuta_suja = sujar(minuta, aleatorio)
+    obtido = processar_minuta(minuta_suja)
+    mensagens = sorted(erro["mensagem"] for erro in esperado["erros"])
+    if sorted(erro["mensagem"] for erro in obtido["erros"]) != mensagens:
+        falhas.append("a minuta suja gerou achados diferentes da limpa")
+    trechos = lambda texto, resultado: sorted(equivalente(texto[e["span"][0]:e["span"][1]]) for e in resultado["erros"] if e.get("span"))
+    if trechos(minuta_suja, obtido) != trechos(minuta, esperado):
+        falhas.append("os spans da minuta suja não cobrem os trechos equivalentes")
+    print(f"\nminuta suja: {len(obtido['erros'])} achados (limpa: {len(mensagens)})")
+
+    for falha in falhas:
+        print(f"FALHA: {falha}")
+    sys.exit(1 if falhas else 0)
+
+if __name__ == "__main__":
+    main()
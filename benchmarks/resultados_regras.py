@@ -0,0 +1,60 @@
+"""Compara a conversão dos resultados das regras via Pydantic com a conversão rápida.
+
+A primeira tabela mede só a conversão de um resultado com N achados; a segunda, a
+auditoria completa (executar_auditoria) de uma minuta com milhares de achados, com e
+sem AUDITOR_VALIDAR_REGRAS (que refaz a conversão pelos modelos Pydantic). A árvore de
+dispositivos e a varredura léxica ficam em cache entre as repetições, então a diferença
+entre as duas linhas é o custo da conversão.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.resultados_regras
+"""
+import time
+
+from benchmarks.documentos import gerar_minuta
+from core import REGRAS_GERAL_RESOLUCAO, auditor
+from core.models import ResultadoRegra, normalizar_resultado
+
+def conversao_pydantic(resultado_cru):
+    modelo = ResultadoRegra.model_validate(resultado_cru)
+    return modelo.status, [item.model_dump(exclude_none=True) if hasattr(item, "model_dump") else item for item in modelo.detalhe]
+
+def gerar_resultado(achados):
+    return {
+        "status": "FALHA",
+        "detalhe": [
+            {"mensagem": "Símbolo incorreto.", "original": "1°", "sugestao": "1º" if i % 3 else None, "span": [i * 10, i * 10 + 2], "tipo": "fixable"}
+            for i in range(achados)
+        ],
+    }
+
+def medir(funcao, *args, repeticoes=5):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao(*args)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+def main():
+    print(f"{'achados':>8} {'pydantic (ms)':>14} {'rápida (ms)':>12} {'ganho':>6}")
+    for achados in (5_000, 20_000, 50_000):
+        resultado = gerar_resultado(achados)
+        assert conversao_pydantic(resultado) == normalizar_resultado(resultado), "conversão rápida divergiu"
+        t_pydantic = medir(conversao_pydantic, resultado)
+        t_rapida = medir(normalizar_resultado, resultado)
+        print(f"{achados:>8} {t_pydantic * 1000:>14.1f} {t_rapida * 1000:>12.1f} {t_pydantic / t_rapida:>5.1f}x")
+
+    texto = gerar_minuta(artigos=2500)
+    achados = sum(len(detalhes) for _, detalhes, _ in auditor.executar_auditoria(texto, REGRAS_GERAL_RESOLUCAO))
+    tempos = {}
+    for validar in (True, False):
+        auditor.VALIDAR_REGRAS = validar
+        tempos[validar] = medir(auditor.executar_auditoria, texto, REGRAS_GERAL_RESOLUCAO, repeticoes=3)
+    auditor.VALIDAR_REGRAS = False
+    print(f"\nexecutar_auditoria, {len(texto)} caracteres, {achados} achados:")
+    print(f"  com validação Pydantic: {tempos[True] * 1000:.0f} ms")
+    print(f"  conversão rápida:       {tempos[False] * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    main()
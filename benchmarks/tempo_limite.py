@@ -0,0 +1,79 @@
+"""Custo da execução supervisionada das regras e interrupção de uma regra descontrolada.
+
+Compara processar_minuta com as regras no próprio processo e num processo supervisionado
+(core.supervisao, ativado por AUDITOR_TEMPO_REGRA/AUDITOR_TEMPO_AUDITORIA), em minutas
+sintéticas de vários tamanhos, conferindo que o resultado é o mesmo. Depois audita a
+resolução com uma regra a mais, cuja regex tem retrocesso catastrófico, e confere que ela é
+interrompida no limite e relatada como ALERTA, com as demais regras inalteradas.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.tempo_limite [limite_regra_s]
+"""
+import json
+import re
+import statistics
+import sys
+import time
+
+from benchmarks.documentos import gerar_minuta_orgao
+from core import obter_plano, supervisao
+from core.auditor import iterar_auditoria, processar_minuta
+
+TAMANHOS = (10, 100, 400)
+REPETICOES = 5
+
+def regra_descontrolada(texto):
+    # (a+)+$ contra "aaa...b" testa todas as partições da sequência de "a" antes de falhar.
+    re.match(r"(a+)+$", "a" * 64 + "b")
+    return {"status": "OK", "detalhe": []}
+
+def supervisionar(limite_regra):
+    supervisao.TEMPO_REGRA = limite_regra
+    supervisao.ATIVA = limite_regra > 0
+
+def mediana_ms(funcao, *args):
+    tempos = []
+    for _ in range(REPETICOES):
+        inicio = time.perf_counter()
+        resultado = funcao(*args)
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1000, resultado
+
+def main():
+    limite = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    falhas = []
+
+    print(f"{'artigos':>7} {'caracteres':>10} {'no processo (ms)':>17} {'supervisionado (ms)':>20}")
+    for artigos in TAMANHOS:
+        texto, _ = gerar_minuta_orgao("CEG", artigos=artigos, capitulos=max(1, artigos // 6), erros=2)
+        supervisionar(0)
+        direto_ms, direto = mediana_ms(processar_minuta, texto)
+        supervisionar(limite)
+        processar_minuta(texto)  # partida do processo supervisionado, fora da medida
+        supervisionado_ms, supervisionado = mediana_ms(processar_minuta, texto)
+        print(f"{artigos:>7} {len(texto):>10} {direto_ms:>17.1f} {supervisionado_ms:>20.1f}")
+        if json.dumps(direto, sort_keys=True) != json.dumps(supervisionado, sort_keys=True):
+            falhas.append(f"{artigos} artigos: resultado supervisionado difere do direto")
+
+    texto, _ = gerar_minuta_orgao("CEG", artigos=100, erros=2)
+    regras = {**obter_plano(texto).resolucao, "Regra descontrolada": regra_descontrolada}
+    supervisionar(0)
+    esperado = {nome: (detalhes, status) for nome, detalhes, status in iterar_auditoria(texto, obter_plano(texto).resolucao)}
+    supervisionar(limite)
+    inicio = time.perf_counter()
+    obtido = {nome: (detalhes, status) for nome, detalhes, status in iterar_auditoria(texto, regras)}
+    decorrido = time.perf_counter() - inicio
+    detalhes, status = obtido.pop("Regra descontrolada")
+    print(f"\nregra descontrolada (limite {limite:g} s): {status} {detalhes[0]!r}; auditoria em {decorrido:.2f} s")
+    if status != "ALERTA" or not detalhes[0].startswith(supervisao.MENSAGEM_TEMPO_EXCEDIDO):
+        falhas.append("a regra descontrolada não foi interrompida")
+    if json.dumps(obtido, sort_keys=True) != json.dumps(esperado, sort_keys=True):
+        falhas.append("as demais regras mudaram com a interrupção")
+    supervisao.encerrar_processos()
+
+    for falha in falhas:
+        print(f"FALHA: {falha}")
+    sys.exit(1 if falhas else 0)
+
+if __name__ == "__main__":
+    main()
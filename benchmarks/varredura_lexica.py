@@ -0,0 +1,56 @@
+"""Compara a varredura léxica única de core.regras.estrutura com as passadas separadas.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.varredura_lexica
+"""
+import re
+import time
+
+from core.regras import estrutura
+
+# Padrões usados antes da varredura única: uma passada finditer por padrão.
+PADROES_SEPARADOS = {
+    "data": re.compile(r"\b0[1-9]\s+de\s+(janeiro|fevereiro|março|abril|maio|junho|julho|agosto|setembro|outubro|novembro|dezembro)", re.IGNORECASE),
+    "sigla_parenteses": re.compile(r"(\()([A-Z]{3,})(\))"),
+    "sigla_hifen": re.compile(r"(\s+-\s*)([A-Z]{3,})\b"),
+    "ordinal": re.compile(r"(\S*[°ᵒ]\S*)"),
+}
+
+BLOCO = (
+    "Art. {n}º  Fica instituído o Programa Regional — PRODER, conforme a Lei nº 1.234, de 05 de março de 2020:\n"
+    "I - apoiar os municípios da Região Integrada de Desenvolvimento (RIDE);\n"
+    "II - promover a integração com o Ministério - MIDR; e\n"
+    "III - fomentar 1° a cadeia produtiva local.\n"
+    "§ 1º  O disposto neste artigo aplica-se ao exercício de 2024.\n"
+)
+
+def gerar_texto(artigos):
+    return "".join(BLOCO.format(n=n) for n in range(1, artigos + 1))
+
+def spans_separados(texto):
+    return {nome: [m.span() for m in padrao.finditer(texto)] for nome, padrao in PADROES_SEPARADOS.items()}
+
+def spans_varredura(texto):
+    estrutura.varrer_lexico.cache_clear()
+    return {nome: [span for span, _, _ in itens] for nome, itens in estrutura.varrer_lexico(texto).items()}
+
+def medir(funcao, texto, repeticoes):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao(texto)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+def main():
+    print(f"{'artigos':>8} {'caracteres':>11} {'separadas (ms)':>15} {'única (ms)':>11} {'ganho':>6}")
+    for artigos in (100, 1_000, 10_000):
+        texto = gerar_texto(artigos)
+        assert spans_separados(texto) == spans_varredura(texto), "varredura única divergiu das passadas separadas"
+
+        t_separadas = medir(spans_separados, texto, 5)
+        t_unica = medir(spans_varredura, texto, 5)
+        print(f"{artigos:>8} {len(texto):>11} {t_separadas * 1000:>15.1f} {t_unica * 1000:>11.1f} {t_separadas / t_unica:>5.1f}x")
+
+if __name__ == "__main__":
+    main()
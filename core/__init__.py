@@ -1,5 +1,7 @@
 from .regras import estrutura, resolucao, anexo
 from .regras.orgaos import condel, ceg, coaride, cnrh
+from .planos import CUSTO_BUSCA, CUSTO_CABECALHO, ESCOPO_ANEXO, ESCOPO_DOCUMENTO, ESCOPO_RESOLUCAO, compilar_plano
+from types import MappingProxyType
 
 REGRAS_GERAL_RESOLUCAO = {
     "Cabeçalho (Genérico)": resolucao.auditar_cabecalho,
@@ -26,51 +28,83 @@ def identificar_tipo_de_orgão(texto: str) -> str:
     elif "CNRH" in inicio: return "CNRH"
     return "DESCONHECIDO"
 
-def obter_regras_anexo() -> dict:
-    
-    return {
-        "Anexo (Identificação)": anexo.auditar_anexo, 
-        "Anexo: Sequência de Capítulos": anexo.auditar_sequencia_capitulos_anexo,
-        "Anexo: Sequência de Seções": anexo.auditar_sequencia_secoes_anexo,
-        "Anexo: Sequência de Artigos": anexo.auditar_sequencia_artigos_anexo,
-        "Anexo: Sequência de Parágrafos": anexo.auditar_sequencia_paragrafos_anexo,
-        "Anexo: Pontuação Hierárquica": anexo.auditar_pontuacao_hierarquica_anexo,
-        "Símbolos Ordinais (º)": estrutura.auditar_simbolo_ordinal,
-        "Artigos (Formato)": estrutura.auditar_formatacao_artigos,
-        "Parágrafos (Espaçamento)": estrutura.auditar_formatacao_paragrafo,
-        "Siglas": estrutura.auditar_uso_siglas,
-        "Incisos (Sequência)": estrutura.auditar_sequencia_incisos,
-        "Incisos (Pontuação)": estrutura.auditar_pontuacao_incisos,
-        "Alíneas (Pontuação)": estrutura.auditar_formatacao_alineas
-    }
+REGRAS_DOCUMENTO = {
+    "Estrutura do Anexo": anexo.auditar_anexo,
+}
+
+REGRAS_ANEXO = {
+    "Anexo: Sequência de Capítulos": anexo.auditar_sequencia_capitulos_anexo,
+    "Anexo: Sequência de Seções": anexo.auditar_sequencia_secoes_anexo,
+    "Anexo: Sequência de Artigos": anexo.auditar_sequencia_artigos_anexo,
+    "Anexo: Sequência de Parágrafos": anexo.auditar_sequencia_paragrafos_anexo,
+    "Anexo: Pontuação Hierárquica": anexo.auditar_pontuacao_hierarquica_anexo,
+    "Símbolos Ordinais (º)": estrutura.auditar_simbolo_ordinal,
+    "Artigos (Formato)": estrutura.auditar_formatacao_artigos,
+    "Parágrafos (Espaçamento)": estrutura.auditar_formatacao_paragrafo,
+    "Siglas": estrutura.auditar_uso_siglas,
+    "Incisos (Sequência)": estrutura.auditar_sequencia_incisos,
+    "Incisos (Pontuação)": estrutura.auditar_pontuacao_incisos,
+    "Alíneas (Pontuação)": estrutura.auditar_formatacao_alineas
+}
     
-def obter_regras(texto_completo: str) -> tuple[dict, str]:
-    tipo = identificar_tipo_de_orgão(texto_completo)
+REGRAS_POR_ORGAO = {
+    "CEG": {
+        "Cabeçalho (MINISTÉRIO/COMITÊ)": ceg.auditar_cabecalho_ceg,
+        "Epígrafe (CEG/MIDR)": ceg.auditar_epigrafe_ceg,
+        "Preâmbulo (CEG)": ceg.auditar_preambulo_ceg
+    },
+    "CONDEL": {
+        "Cabeçalho (MINISTÉRIO/CONSELHO)": condel.auditar_cabecalho_condel,
+        "Epígrafe (CONDEL)": condel.auditar_epigrafe_condel,
+        "Preâmbulo (CONDEL)": condel.auditar_preambulo_condel
+    },
+    "COARIDE": {
+        "Epígrafe (COARIDE)": coaride.auditar_epigrafe_coaride,
+        "Preâmbulo (COARIDE)": coaride.auditar_preambulo_coaride
+    },
+    "CNRH": {
+        "Cabeçalho (MINISTÉRIO/CONSELHO)": cnrh.auditar_cabecalho_cnrh,
+        "Epígrafe (CNRH)": cnrh.auditar_epigrafe_cnrh,
+        "Preâmbulo (CNRH)": cnrh.auditar_preambulo_cnrh
+    },
+}
     
-    regras = REGRAS_GERAL_RESOLUCAO.copy()
+# Regras que não percorrem o texto todo; as demais contam como CUSTO_TEXTO.
+CUSTOS = {
+    resolucao.auditar_cabecalho: CUSTO_CABECALHO,
+    ceg.auditar_cabecalho_ceg: CUSTO_CABECALHO,
+    condel.auditar_cabecalho_condel: CUSTO_CABECALHO,
+    cnrh.auditar_cabecalho_cnrh: CUSTO_CABECALHO,
+    resolucao.auditar_ementa: CUSTO_BUSCA,
+    resolucao.auditar_verbo_primeiro_artigo: CUSTO_BUSCA,
+    resolucao.auditar_fecho_vigencia: CUSTO_BUSCA,
+    anexo.auditar_anexo: CUSTO_BUSCA,
+    ceg.auditar_epigrafe_ceg: CUSTO_BUSCA,
+    ceg.auditar_preambulo_ceg: CUSTO_BUSCA,
+    condel.auditar_epigrafe_condel: CUSTO_BUSCA,
+    condel.auditar_preambulo_condel: CUSTO_BUSCA,
+    coaride.auditar_epigrafe_coaride: CUSTO_BUSCA,
+    coaride.auditar_preambulo_coaride: CUSTO_BUSCA,
+    cnrh.auditar_epigrafe_cnrh: CUSTO_BUSCA,
+    cnrh.auditar_preambulo_cnrh: CUSTO_BUSCA,
+}
 
-    if tipo == "CEG":
-        regras.update({
-            "Cabeçalho (MINISTÉRIO/COMITÊ)": ceg.auditar_cabecalho_ceg,
-            "Epígrafe (CEG/MIDR)": ceg.auditar_epigrafe_ceg,
-            "Preâmbulo (CEG)": ceg.auditar_preambulo_ceg
-        })
-    elif tipo == "CONDEL":
-        regras.update({
-            "Cabeçalho (MINISTÉRIO/CONSELHO)": condel.auditar_cabecalho_condel,
-            "Epígrafe (CONDEL)": condel.auditar_epigrafe_condel,
-            "Preâmbulo (CONDEL)": condel.auditar_preambulo_condel
-        })
-    elif tipo == "COARIDE":
-        regras.update({
-            "Epígrafe (COARIDE)": coaride.auditar_epigrafe_coaride,
-            "Preâmbulo (COARIDE)": coaride.auditar_preambulo_coaride
-        })
-    elif tipo == "CNRH":        
-        regras.update({
-            "Cabeçalho (MINISTÉRIO/CONSELHO)": cnrh.auditar_cabecalho_cnrh,
-            "Epígrafe (CNRH)": cnrh.auditar_epigrafe_cnrh,
-            "Preâmbulo (CNRH)": cnrh.auditar_preambulo_cnrh
-        })
-    
-    return regras, tipo
\ No newline at end of file
+# Montados uma vez, na importação; as requisições só consultam o plano do tipo identificado.
+PLANOS = MappingProxyType({
+    tipo: compilar_plano(tipo, {
+        ESCOPO_RESOLUCAO: {**REGRAS_GERAL_RESOLUCAO, **REGRAS_POR_ORGAO.get(tipo, {})},
+        ESCOPO_DOCUMENTO: REGRAS_DOCUMENTO,
+        ESCOPO_ANEXO: REGRAS_ANEXO,
+    }, CUSTOS)
+    for tipo in (*REGRAS_POR_ORGAO, "DESCONHECIDO")
+})
+
+def obter_plano(texto_completo: str):
+    return PLANOS[identificar_tipo_de_orgão(texto_completo)]
+
+def obter_regras_anexo():
+    return PLANOS["DESCONHECIDO"].anexo
+
+def obter_regras(texto_completo: str) -> tuple:
+    plano = obter_plano(texto_completo)
+    return plano.resolucao, plano.tipo
@@ -1,54 +1,143 @@
 import re
 import html
-from core import obter_regras, obter_regras_anexo 
-from core.regras.anexo import auditar_anexo
+import os
+import time
+from contextlib import nullcontext
+from itertools import chain
+from core import PLANOS, obter_plano, pedacos, supervisao
+from core.metricas import duracao_regras, regras_interrompidas
+from core.linhas import indice_linhas
+from core.models import Achado, ResultadoRegra, normalizar_resultado
+from core.normalizacao import normalizar_para_analise
 
-def substituir_por_espacos(match):
-    return " " * len(match.group(0))
+REGEX_INICIO_ANEXO = re.compile(r'^[^\S\n]*ANEXO', re.IGNORECASE | re.MULTILINE)
+# Título dos anexos seguintes: "ANEXO", "ANEXO II", "ANEXO ÚNICO", com ou sem " - TÍTULO".
+REGEX_ANEXO_SEGUINTE = re.compile(r'^[^\S\n]*(ANEXO)(?:[^\S\n]+([IVXLCDM]+|ÚNICO))?[^\S\n]*(?:[-–—:][^\n]*)?$', re.MULTILINE)
+REGEX_TRECHO = re.compile(r"Trecho: ['\"](.*?)['\"]", re.DOTALL)
+# Com AUDITOR_VALIDAR_REGRAS=1, cada resultado também passa pelos modelos Pydantic (mais lento).
+VALIDAR_REGRAS = os.getenv("AUDITOR_VALIDAR_REGRAS", "") == "1"
 
-def substituir_prefixo_minuta(match):
-    palavra_chave = match.group(2) 
-    inicio_palavra = match.start(2) - match.start(0)
-    return (" " * inicio_palavra) + palavra_chave
+def validar_resultado(resultado_cru, status, detalhes):
+    """Modo de depuração: confere a conversão rápida contra os modelos Pydantic."""
+    detalhe = resultado_cru.get("detalhe", [])
+    if isinstance(detalhe, list):
+        detalhe = [item.como_dict() if isinstance(item, Achado) else item for item in detalhe]
+    elif isinstance(detalhe, Achado):
+        detalhe = detalhe.como_dict()
+    modelo = ResultadoRegra.model_validate({**resultado_cru, "detalhe": detalhe})
+    if isinstance(modelo.detalhe, list):
+        esperado = [item.model_dump(exclude_none=True) if hasattr(item, "model_dump") else item for item in modelo.detalhe]
+    else:
+        esperado = modelo.detalhe
+    if (modelo.status, esperado) != (status, detalhes):
+        raise ValueError("resultado diverge de ResultadoRegra")
 
-def executar_auditoria(texto_para_auditar: str, regras_dict: dict) -> list:
-    from core.models import ResultadoRegra
-    resultados = []
-    
+def iterar_auditoria(texto_para_auditar: str, regras_dict: dict, memo=None, prazo=None):
+    """Gera (nome, detalhes, status) de cada regra, na ordem do dicionário, assim que ela termina.
+
+    Inclui as regras com status OK; `executar_auditoria` fica só com FALHA e ALERTA.
+    Com `memo` (core.cache.MemoRegras), regras já executadas sobre este mesmo texto
+    não rodam de novo.
+
+    Com AUDITOR_TEMPO_REGRA ou AUDITOR_TEMPO_AUDITORIA, as regras rodam num processo
+    supervisionado (core.supervisao); a que passar do limite, ou de `prazo` (o da auditoria
+    inteira, em time.perf_counter), é interrompida e relatada como ALERTA de tempo excedido.
+    """
     if not texto_para_auditar: 
-        return []
+        return
     
+    chave_texto = memo.chave_texto(texto_para_auditar) if memo is not None else None
+    
+    with supervisao.processo_de_regras() if supervisao.ATIVA else nullcontext() as processo:
+        yield from _executar_regras(texto_para_auditar, regras_dict, memo, chave_texto, processo, prazo)
+
+def _executar_regras(texto_para_auditar, regras_dict, memo, chave_texto, processo, prazo):
     for nome_regra, funcao_auditoria in regras_dict.items():
-        if nome_regra == "Anexo (Identificação)": 
-            continue
+        if memo is not None:
+            anterior = memo.obter(nome_regra, funcao_auditoria, chave_texto)
+            if anterior is not None:
+                yield (nome_regra, *anterior)
+                continue
         try:
-            resultado_cru = funcao_auditoria(texto_para_auditar)
+            limite = supervisao.limite_da_regra(prazo) if processo is not None else None
+            inicio = time.perf_counter()
+            try:
+                if processo is None:
+                    resultado_cru = funcao_auditoria(texto_para_auditar)
+                else:
+                    resultado_cru = processo.executar(funcao_auditoria, texto_para_auditar, limite)
+            finally:
+                duracao_regras.observar(time.perf_counter() - inicio, nome_regra)
             
             if isinstance(resultado_cru, dict):
-                modelo = ResultadoRegra.model_validate(resultado_cru)
-                status = modelo.status
-                
-                if isinstance(modelo.detalhe, list):
-                    detalhes = [
-                        item.model_dump(exclude_none=True) if hasattr(item, "model_dump") else item 
-                        for item in modelo.detalhe
-                    ]
-                else:
-                    detalhes = modelo.detalhe
+                status, detalhes = normalizar_resultado(resultado_cru)
+                if VALIDAR_REGRAS:
+                    validar_resultado(resultado_cru, status, detalhes)
             else:
                 status = "OK"
                 detalhes = []
                 
-            if status in ["FALHA", "ALERTA"]:
-                if not isinstance(detalhes, list): 
-                    detalhes = [detalhes]
-                resultados.append((nome_regra, detalhes, status))
+            if not isinstance(detalhes, list): 
+                detalhes = [detalhes]
+            if memo is not None:
+                memo.guardar(nome_regra, funcao_auditoria, chave_texto, (detalhes, status))
+        except supervisao.TempoExcedido as e:
+            regras_interrompidas.incrementar(nome_regra)
+            detalhes, status = [str(e)], "ALERTA"
         except Exception as e:
-            resultados.append((nome_regra, [f"Erro interno na regra: {e}"], "FALHA"))
+            detalhes, status = [f"Erro interno na regra: {e}"], "FALHA"
             
-    return resultados
+        yield nome_regra, detalhes, status
+
+def executar_auditoria(texto_para_auditar: str, regras_dict: dict) -> list:
+    return [
+        (nome_regra, detalhes, status)
+        for nome_regra, detalhes, status in iterar_auditoria(texto_para_auditar, regras_dict)
+        if status in ["FALHA", "ALERTA"]
+    ]
+
+def caractere_ausente(texto: str) -> str:
+    """Um caractere da área de uso privado que não aparece em `texto`, usado como separador."""
+    for codigo in range(0xE000, 0xF900):
+        if chr(codigo) not in texto:
+            return chr(codigo)
+    raise ValueError("texto usa toda a área de uso privado")
 
-def gerar_html_anotado(texto_original, lista_erros_com_contexto):
+def agrupar_destaques(destaques: list, tamanho_texto: int) -> list:
+    """Varre os spans por posição e junta os que se sobrepõem ou se contêm.
+
+    Devolve [inicio, fim, [destaques]] por grupo, em ordem e sem sobreposição: o grupo cobre
+    a união dos spans, e cada destaque entra em exatamente um grupo. Spans fora do texto
+    são recortados aos seus limites.
+    """
+    spans = []
+    for destaque in destaques:
+        inicio, fim = destaque["start"], destaque["end"]
+        if not 0 <= inicio <= fim <= tamanho_texto:
+            inicio = min(max(inicio, 0), tamanho_texto)
+            fim = min(max(fim, inicio), tamanho_texto)
+        spans.append((inicio, fim, destaque))
+    # Ordena por (início, fim) com uma chave inteira, bem mais barata de comparar que tuplas;
+    # a ordenação é estável, então spans iguais ficam na ordem de entrada.
+    spans.sort(key=lambda span: span[0] * (tamanho_texto + 1) + span[1])
+
+    grupos = []; fim_grupo = -1
+    for inicio, fim, destaque in spans:
+        if inicio < fim_grupo:
+            membros.append(destaque)
+            if fim > fim_grupo:
+                fim_grupo = grupo[1] = fim
+        else:
+            membros = [destaque]
+            grupo = [inicio, fim, membros]
+            grupos.append(grupo)
+            fim_grupo = fim
+    return grupos
+
+def gerar_html_anotado(texto_original, lista_erros_com_contexto, indice=None):
+    
+    if indice is None:
+        indice = indice_linhas(texto_original)
     
     erros_para_processar = []
     
@@ -67,7 +156,9 @@ def gerar_html_anotado(texto_original, lista_erros_com_contexto):
                                  "contexto": contexto,
                                  "nivel": status, 
                                  "tem_link": False,
-                                 "correcao": None 
+                                 "correcao": None,
+                                 "linha": None,
+                                 "coluna": None
                                  }
             
             msg = ""; span = None; sugestao = None; original = None
@@ -83,7 +174,7 @@ def gerar_html_anotado(texto_original, lista_erros_com_contexto):
             else:
                 msg = str(item_erro)
             
-            match_trecho = re.search(r"Trecho: ['\"](.*?)['\"]", msg, re.DOTALL)
+            match_trecho = REGEX_TRECHO.search(msg)
             
             if match_trecho: 
                 msg = msg.replace(match_trecho.group(0), "").strip()
@@ -93,84 +184,363 @@ def gerar_html_anotado(texto_original, lista_erros_com_contexto):
                 id_tag = f"erro_{contador}"
                 obj_erro_frontend["id"] = id_tag
                 obj_erro_frontend["tem_link"] = True
-                erros_para_processar.append({ "start": span[0], "end": span[1], "id": id_tag, "title": f"{nome_regra}: {msg}" })
+                obj_erro_frontend["linha"], obj_erro_frontend["coluna"] = indice.posicao(span[0])
+                erros_para_processar.append({ "start": span[0], "end": span[1], "id": id_tag, "ordem": contador, "title": f"{nome_regra}: {msg}" })
             erros_estruturados_retorno.append(obj_erro_frontend)
 
-    erros_para_processar.sort(key=lambda x: x["start"])
-    html_parts = []; cursor = 0
-    for erro in erros_para_processar:
-        start, end = erro["start"], erro["end"]
-
-        if start < cursor:
-            continue
-        
-        html_parts.append(html.escape(texto_original[cursor:start]))
-        trecho_erro = html.escape(texto_original[start:end])
-        mark_tag = f'<mark id="{erro["id"]}" class="erro-highlight" title="{html.escape(erro["title"])}">{trecho_erro}</mark>'
-        html_parts.append(mark_tag)
-        cursor = end
-        
-    html_parts.append(html.escape(texto_original[cursor:]))
-    return "".join(html_parts), erros_estruturados_retorno
-
-def processar_minuta(texto_bruto: str):
-    texto_completo = texto_bruto.replace('\r\n', '\n').replace('\r', '\n')
-    if not texto_completo.strip(): return {"html": "", "erros": [], "tipo_documento": "N/A"}
-
-    texto_analise = texto_completo
-    texto_analise = re.sub(r'^[\s\*]*MINUTA DE DOCUMENTO[^\n]*', substituir_por_espacos, texto_analise, flags=re.IGNORECASE | re.MULTILINE)
-    texto_analise = re.sub(r'(MINUTA\s+(?:DE\s+)?)(RESOLUÇÃO|PORTARIA)', substituir_prefixo_minuta, texto_analise, flags=re.IGNORECASE)
-    texto_analise = re.sub(r'Minuta\s+assinada\s+para\s+fins\s+de\s+visualização', substituir_por_espacos, texto_analise, flags=re.IGNORECASE)
-
-    regras_resolucao, tipo_doc = obter_regras(texto_analise)
-    regras_resolucao = {k: v for k, v in regras_resolucao.items() if not k.startswith("Anexo")}
-
-    texto_res = texto_analise; texto_anx = ""; offset_anexo = 0
-    match_anexo = re.search(r'\n\s*ANEXO', texto_analise, re.IGNORECASE) 
-   
-    if match_anexo:
-        texto_res = texto_analise[:match_anexo.start()] 
-        texto_anx = texto_analise[match_anexo.end():]
-        offset_anexo = match_anexo.end()
+    return renderizar_destaques(texto_original, erros_para_processar), erros_estruturados_retorno
+
+def renderizar_destaques(texto_original: str, destaques: list) -> str:
+    """HTML do texto com um <mark> por grupo de spans sobrepostos (agrupar_destaques).
+
+    `destaques` traz start, end, id, ordem e title de cada erro. O <mark> lista os ids de
+    todos os erros do grupo em data-erros (o id do elemento é o do primeiro). Os trechos de
+    texto e os títulos são unidos por um separador ausente do texto e escapados numa só
+    chamada a html.escape.
+    """
+    grupos = agrupar_destaques(destaques, len(texto_original))
+    partes = []; cursor = 0
+    for inicio, fim, membros in grupos:
+        if len(membros) > 1:
+            membros.sort(key=lambda d: d["ordem"])
+            titulo = "\n".join([d["title"] for d in membros])
+        else:
+            titulo = membros[0]["title"]
+        partes += (texto_original[cursor:inicio], titulo, texto_original[inicio:fim])
+        cursor = fim
+    partes.append(texto_original[cursor:])
+
+    separador = caractere_ausente(texto_original + "".join([d["title"] for d in destaques]))
+    escapadas = html.escape(separador.join(partes)).split(separador)
+
+    html_parts = []
+    for i, (_, _, membros) in enumerate(grupos):
+        antes, titulo, trecho = escapadas[3 * i:3 * i + 3]
+        if len(membros) > 1:
+            ids, classe = " ".join([d["id"] for d in membros]), "erro-highlight erro-multiplo"
+        else:
+            ids, classe = membros[0]["id"], "erro-highlight"
+        html_parts.append(f'{antes}<mark id="{membros[0]["id"]}" class="{classe}" data-erros="{ids}" title="{titulo}">{trecho}</mark>')
+    html_parts.append(escapadas[-1])
+    return "".join(html_parts)
+
+def localizar_anexo(texto):
+    """Separa resolução e anexo no primeiro ANEXO em início de linha (a partir da segunda linha).
+
+    Devolve (fim da resolução, fim da palavra ANEXO). A resolução termina na primeira quebra
+    de linha após o seu último caractere não branco, como no antigo separador por regex.
+    """
+    indice = indice_linhas(texto)
+    if len(indice) < 2:
+        return None
+    
+    match = REGEX_INICIO_ANEXO.search(texto, indice.inicios[1])
+    if not match:
+        return None
+    
+    fim_conteudo = len(texto[:match.start()].rstrip())
+    return texto.index('\n', fim_conteudo), match.end()
+
+def localizar_anexos(texto):
+    """Todos os anexos: o primeiro como em localizar_anexo e os seguintes em cada linha de
+    título "ANEXO" (com o numeral, se houver) depois dele.
+
+    Devolve uma lista de (início, fim da palavra ANEXO, fim, rótulo) por anexo, onde o
+    início é o fim do trecho anterior e o trecho vai até o título do anexo seguinte (ou o
+    fim do texto). O rótulo é "Anexo" se houver um só, senão "Anexo I", "Anexo II"...
+    """
+    primeiro = localizar_anexo(texto)
+    if primeiro is None:
+        return []
+
+    anexos = [primeiro]
+    numerais = [None]
+    fim_titulo = texto.find("\n", primeiro[1])
+    for match in REGEX_ANEXO_SEGUINTE.finditer(texto, len(texto) if fim_titulo == -1 else fim_titulo + 1):
+        anexos.append((match.start(), match.end(1)))
+        numerais.append(match.group(2))
+    if len(anexos) == 1:
+        return [(*primeiro, len(texto), "Anexo")]
+
+    # O primeiro título pode vir em minúsculas ("Anexo I"); só o rótulo depende dele.
+    titulo = texto[texto.rfind("\n", 0, primeiro[1]) + 1:len(texto) if fim_titulo == -1 else fim_titulo]
+    match_primeiro = REGEX_ANEXO_SEGUINTE.match(titulo.upper())
+    numerais[0] = match_primeiro.group(2) if match_primeiro else None
+    fins = [inicio for inicio, _ in anexos[1:]] + [len(texto)]
+    return [
+        (inicio, fim_palavra, fim, f"Anexo {numeral or posicao}")
+        for posicao, ((inicio, fim_palavra), fim, numeral) in enumerate(zip(anexos, fins, numerais), start=1)
+    ]
+
+def textos_dos_anexos(texto_analise: str, anexos: list) -> list:
+    """Cada anexo é auditado como "ANEXO" + o que vem depois da palavra, até o anexo seguinte."""
+    return ["ANEXO" + texto_analise[fim_palavra:fim] for _, fim_palavra, fim, _ in anexos]
+
+class MinutaPreparada:
+    """Minuta normalizada (visão de análise) e dividida em resolução, anexos e trechos, uma vez só."""
+    __slots__ = ("texto_completo", "visao", "tipo", "anexos", "texto_res", "textos_anexos", "divisoes")
+
+    def __init__(self, texto_completo: str, visao=None, tipo=None, anexos=(), texto_res: str = "", textos_anexos=()):
+        self.texto_completo = texto_completo
+        self.visao = visao
+        self.tipo = tipo
+        self.anexos = anexos
+        self.texto_res = texto_res
+        self.textos_anexos = textos_anexos
+        self.divisoes = None
+
+    @property
+    def plano(self):
+        return PLANOS[self.tipo]
+
+    def segmentos(self) -> list:
+        """(texto, escopo, inícios dos trechos) da resolução e de cada anexo (core.pedacos), calculados uma vez."""
+        if self.divisoes is None:
+            self.divisoes = [
+                (texto, escopo, pedacos.dividir_em_trechos(texto))
+                for texto, escopo in [(self.texto_res, "resolucao"), *((texto, "anexo") for texto in self.textos_anexos)]
+            ]
+        return self.divisoes
+
+def preparar_minuta(texto_bruto: str) -> MinutaPreparada:
+    texto_completo = normalizar_quebras_de_linha(texto_bruto)
+    if not texto_completo.strip():
+        return MinutaPreparada(texto_completo)
+
+    # Visão de análise, compartilhada por todas as regras: sem as marcas de minuta e com
+    # espaços, traços, aspas e acentos normalizados; os spans voltam ao original pelo mapa.
+    visao = normalizar_para_analise(texto_completo)
+    texto_analise = visao.texto
+    anexos = localizar_anexos(texto_analise)
+    texto_res = texto_analise[:anexos[0][0]] if anexos else texto_analise
+    return MinutaPreparada(texto_completo, visao, obter_plano(texto_analise).tipo, anexos, texto_res, textos_dos_anexos(texto_analise, anexos))
+
+def contar_anexos(texto_bruto: str) -> int:
+    """Quantos anexos iterar_processamento auditaria separadamente em `texto_bruto`."""
+    return len(preparar_minuta(texto_bruto).anexos)
+
+def auditar_trechos(textos: list, tipo: str, escopo: str, prazo=None) -> list:
+    """(resultados das regras locais, resumos das costuradas) de cada trecho (core.pedacos), com as
+    regras de `escopo` ("resolucao" ou "anexo") do plano de `tipo`; roda também nos processos do pool."""
+    regras = getattr(PLANOS[tipo], escopo)
+    locais = pedacos.regras_locais(regras)
+    return [(list(iterar_auditoria(texto, locais, None, prazo)), pedacos.resumir_trecho(texto, regras)) for texto in textos]
+
+def _trecho_do_memo(memo, regras_trecho: dict, chave: str):
+    guardados = memo.obter_todos(regras_trecho, chave)
+    if guardados is None:
+        return None
+    locais = [(nome, *guardados[nome]) for nome, funcao in regras_trecho.items() if funcao in pedacos.REGRAS_LOCAIS]
+    return locais, {nome: guardados[nome][0] for nome, funcao in regras_trecho.items() if funcao not in pedacos.REGRAS_LOCAIS}
+
+def _guardar_trecho(memo, regras_trecho: dict, chave: str, resultado: tuple):
+    resultados_locais, resumos = resultado
+    # Regras interrompidas por tempo podem terminar numa próxima tentativa.
+    if any(status == "ALERTA" and detalhes and str(detalhes[0]).startswith(supervisao.MENSAGEM_TEMPO_EXCEDIDO) for _, detalhes, status in resultados_locais):
+        return
+    for nome, detalhes, status in resultados_locais:
+        memo.guardar(nome, regras_trecho[nome], chave, (detalhes, status))
+    for nome, resumo in resumos.items():
+        memo.guardar(nome, regras_trecho[nome], chave, (resumo,))
+
+def auditar_segmentos(segmentos: list, tipo: str, memo=None, mapear=None, prazo=None):
+    """Audita cada (texto, escopo, inícios dos trechos) de `segmentos` (MinutaPreparada.segmentos)
+    em trechos (core.pedacos) e devolve um iterador da lista de (nome, detalhes, status) de cada
+    segmento, na ordem, com os spans relativos a ele, iguais aos da auditoria do segmento inteiro.
+
+    Com `memo`, os trechos já auditados (o mesmo texto, em qualquer posição) são reaproveitados,
+    e só os demais e as regras globais rodam. Com `mapear` (como Executor.map, que envia tudo de
+    imediato), os trechos a auditar vão já, em lotes de pelo menos TAMANHO_PEDACO caracteres,
+    aos processos do pool, enquanto as regras globais rodam aqui.
+    """
+    plano = PLANOS[tipo]
+    preparados = []; lotes_enviados = []
+    for texto, escopo, inicios in segmentos:
+        regras = getattr(plano, escopo)
+        regras_trecho = {**pedacos.regras_locais(regras), **pedacos.resumidores(regras)}
+        trechos = [texto[inicio:fim] for inicio, fim in zip(inicios, [*inicios[1:], len(texto)])]
+        chaves = [memo.chave_texto(trecho) for trecho in trechos] if memo is not None else None
+        resultados = [_trecho_do_memo(memo, regras_trecho, chave) for chave in chaves] if memo is not None else [None] * len(trechos)
+        faltam = [j for j, resultado in enumerate(resultados) if resultado is None]
+        lotes = [[faltam[k] for k in lote] for lote in pedacos.agrupar_em_lotes([len(trechos[j]) for j in faltam])] if mapear is not None else []
+        lotes_enviados += [(escopo, [trechos[j] for j in lote]) for lote in lotes]
+        preparados.append((texto, escopo, regras, regras_trecho, inicios, trechos, chaves, resultados, lotes))
+    enviados = None
+    if lotes_enviados:
+        n = len(lotes_enviados)
+        enviados = mapear(auditar_trechos, [textos for _, textos in lotes_enviados], [tipo] * n, [escopo for escopo, _ in lotes_enviados], [prazo] * n)
+
+    def por_segmento():
+        nonlocal enviados
+        for texto, escopo, regras, regras_trecho, inicios, trechos, chaves, resultados, lotes in preparados:
+            novos = []
+            for lote in lotes:
+                calculados = None
+                if enviados is not None:
+                    try:
+                        calculados = next(enviados)
+                    except Exception:
+                        # Falha do executor (processo morto, pool encerrado): este lote e os seguintes rodam aqui.
+                        enviados = None
+                if calculados is None:
+                    calculados = auditar_trechos([trechos[j] for j in lote], tipo, escopo, prazo)
+                for j, calculado in zip(lote, calculados):
+                    resultados[j] = calculado
+                novos += lote
+            for j, resultado in enumerate(resultados):
+                if resultado is None:
+                    resultados[j] = auditar_trechos([trechos[j]], tipo, escopo, prazo)[0]
+                    novos.append(j)
+            if memo is not None:
+                for j in novos:
+                    _guardar_trecho(memo, regras_trecho, chaves[j], resultados[j])
+
+            if not texto:
+                yield []
+                continue
+            globais = {nome: (detalhes, status) for nome, detalhes, status in iterar_auditoria(texto, pedacos.regras_globais(regras), memo, prazo)}
+            yield pedacos.juntar_trechos(regras, [
+                (
+                    [(nome, deslocar_spans(detalhes, inicio), status) for nome, detalhes, status in resultados_locais],
+                    {nome: deslocar_spans(resumo, inicio) for nome, resumo in resumos.items()},
+                )
+                for inicio, (resultados_locais, resumos) in zip(inicios, resultados)
+            ], globais)
+    return por_segmento()
+
+def normalizar_quebras_de_linha(texto_bruto: str) -> str:
+    return texto_bruto.replace('\r\n', '\n').replace('\r', '\n')
+
+def deslocar_spans(detalhes: list, ajuste: int, visao=None) -> list:
+    """Leva os spans de um trecho que começa em `ajuste` na visão de análise ao texto original.
+
+    Com `visao` (core.normalizacao.TextoNormalizado) alterada, os offsets passam pelo mapa e o
+    "original" de uma correção que era o trecho da visão vira o trecho do texto original,
+    para que a correção ainda o encontre no texto do usuário.
+    """
+    if visao is not None and visao.texto is visao.original:
+        visao = None
+    if visao is None and ajuste == 0:
+        return detalhes
+    detalhes_corrigidos = []
+    
+    for item in detalhes:
+        if isinstance(item, dict) and "span" in item:
+            inicio, fim = item["span"][0] + ajuste, item["span"][1] + ajuste
+            item_copia = item.copy()
+            if visao is None:
+                item_copia["span"] = [inicio, fim]
+            else:
+                inicio_original, fim_original = visao.para_original(inicio), visao.para_original(fim)
+                item_copia["span"] = [inicio_original, fim_original]
+                if item.get("original") == visao.texto[inicio:fim]:
+                    item_copia["original"] = visao.original[inicio_original:fim_original]
+            detalhes_corrigidos.append(item_copia)
+            
+        else: 
+            detalhes_corrigidos.append(item)
+    return detalhes_corrigidos
+
+def iterar_processamento(texto_bruto, memo=None, mapear=None):
+    """Audita a minuta gerando eventos: um {"evento": "regra", ...} por regra, à medida que termina,
+    com os spans já no texto original, e por último {"evento": "fim", ...} com o resultado completo.
+
+    Cada anexo (ANEXO I, ANEXO II...) é auditado separadamente, com contexto "Anexo I",
+    "Anexo II"... (ou só "Anexo", se houver um). Com `memo` (core.cache.MemoRegras) ou `mapear`
+    (como Executor.map), a resolução e os anexos são auditados em trechos (auditar_segmentos):
+    os trechos que não mudaram desde uma auditoria anterior são reaproveitados e apenas
+    reposicionados, e os demais rodam por `mapear`, em paralelo com as regras sobre o segmento
+    inteiro. Os eventos saem por segmento, na mesma ordem e iguais aos da auditoria serial.
+
+    `texto_bruto` pode vir já preparado (preparar_minuta).
+    """
+    preparada = texto_bruto if isinstance(texto_bruto, MinutaPreparada) else preparar_minuta(texto_bruto)
+    texto_completo = preparada.texto_completo
+    if not texto_completo.strip():
+        yield {"evento": "fim", "html": "", "erros": [], "tipo_documento": "N/A"}
+        return
+
+    visao = preparada.visao
+    texto_analise = visao.texto
+    plano = preparada.plano
+    prazo = supervisao.prazo_da_auditoria()
+
+    indice = indice_linhas(texto_completo)
+
+    anexos = preparada.anexos
+    len_prefixo_anexo = len("ANEXO")
+
+    if memo is None and mapear is None:
+        resultados_segmentos = (
+            iterar_auditoria(texto, regras, None, prazo)
+            for texto, regras in ((preparada.texto_res, plano.resolucao), *((texto, plano.anexo) for texto in preparada.textos_anexos))
+        )
+    else:
+        resultados_segmentos = auditar_segmentos(preparada.segmentos(), preparada.tipo, memo, mapear, prazo)
+
+    def evento_regra(nome, detalhes, contexto, status):
+        return {"evento": "regra", "regra": nome, "contexto": contexto, "status": status, "detalhes": detalhes}
 
     lista_final = []
-    falhas_res = executar_auditoria(texto_res, regras_resolucao)
-  
-    try:
-        res_anexo_id = auditar_anexo(texto_analise)
-        
-        if res_anexo_id["status"] in ["FALHA", "ALERTA"]:
-            falhas_res.append(("Estrutura do Anexo", res_anexo_id["detalhe"], res_anexo_id["status"]))
-    except ImportError: pass 
-
-    for nome, dets, status in falhas_res:
-        lista_final.append((nome, dets, "Resolução", status))
-
-    if texto_anx:
+    # As regras de documento (estrutura do anexo) veem o texto inteiro, mas são relatadas com a resolução.
+    for nome, dets, status in chain(next(resultados_segmentos), iterar_auditoria(texto_analise, plano.documento, memo, prazo)):
+        dets = deslocar_spans(dets, 0, visao)
+        if status in ["FALHA", "ALERTA"]:
+            lista_final.append((nome, dets, "Resolução", status))
+        yield evento_regra(nome, dets, "Resolução", status)
+
+    for _, fim_palavra, _, contexto in anexos:
         try:
-            texto_anexo_completo = "ANEXO" + texto_anx
-            regras_anexo = obter_regras_anexo()
-            falhas_anx = executar_auditoria(texto_anexo_completo, regras_anexo)
-            falhas_anx_ajustadas = []
-            len_prefixo_anexo = len("ANEXO") 
-            
-            for nome_regra, lista_detalhes, status in falhas_anx:
-                detalhes_corrigidos = []
-                
-                for item in lista_detalhes:
-                    if isinstance(item, dict) and "span" in item:
-                        ajuste = offset_anexo - len_prefixo_anexo
-                        novo_span = [item["span"][0] + ajuste, item["span"][1] + ajuste]
-                        item_copia = item.copy(); item_copia["span"] = novo_span
-                        detalhes_corrigidos.append(item_copia)
-                        
-                    else: 
-                        detalhes_corrigidos.append(item)
-                falhas_anx_ajustadas.append((nome_regra, detalhes_corrigidos, status))
-                
-            for nome, dets, status in falhas_anx_ajustadas:
-                lista_final.append((nome, dets, "Anexo", status))
-        except Exception: pass
+            for nome_regra, lista_detalhes, status in next(resultados_segmentos):
+                detalhes_corrigidos = deslocar_spans(lista_detalhes, fim_palavra - len_prefixo_anexo, visao)
+                if status in ["FALHA", "ALERTA"]:
+                    lista_final.append((nome_regra, detalhes_corrigidos, contexto, status))
+                yield evento_regra(nome_regra, detalhes_corrigidos, contexto, status)
+        except Exception as e:
+            # Os eventos já enviados deste anexo continuam no resultado; o erro entra nele e no
+            # stream como uma falha do anexo, em vez de sumir.
+            detalhes = [f"Erro interno na auditoria do anexo: {e}"]
+            lista_final.append(("Auditoria do Anexo", detalhes, contexto, "FALHA"))
+            yield evento_regra("Auditoria do Anexo", detalhes, contexto, "FALHA")
+
+    html_final, lista_erros = gerar_html_anotado(texto_completo, lista_final, indice)
+    yield {"evento": "fim", "tipo_documento": plano.tipo, "html": html_final, "erros": lista_erros}
+
+# Minuta curta com cada tipo de dispositivo e um anexo; {sigla} escolhe o órgão identificado.
+AMOSTRA_AQUECIMENTO = """MINISTÉRIO DA INTEGRAÇÃO E DO DESENVOLVIMENTO REGIONAL
+CONSELHO DELIBERATIVO
+RESOLUÇÃO {sigla} Nº 1, DE 2 DE JANEIRO DE 2024
+Aprova o regimento interno.
+O PRESIDENTE DO CONSELHO, no uso de suas atribuições, resolve:
+Art. 1º Fica aprovado o regimento, nos termos do Decreto nº 1, de 1º de janeiro de 2020:
+I - primeiro inciso;
+II - segundo inciso; e
+a) alínea;
+§ 1º Parágrafo.
+Art. 2º Esta Resolução entra em vigor na data de sua publicação.
+FULANO DE TAL
+Presidente
+ANEXO
+CAPÍTULO I
+DAS DISPOSIÇÕES GERAIS
+Seção I
+Art. 1º O Sistema Único (SU) terá:
+I - inciso.
+Parágrafo único. Parágrafo.
+"""
+
+def aquecer():
+    """Audita uma minuta curta de cada órgão. Compila as regex que as regras criam na primeira
+    chamada (padrões passados direto a re.search/re.sub) antes da primeira requisição."""
+    for sigla in ("CEG/MIDR", "CONDEL/SUDECO", "COARIDE", "CNRH", ""):
+        processar_minuta(AMOSTRA_AQUECIMENTO.format(sigla=sigla))
+
+def teve_tempo_excedido(resultado: dict) -> bool:
+    """Se alguma regra do resultado foi interrompida por tempo (resultado que não vale guardar em cache)."""
+    return any(erro["mensagem"].startswith(supervisao.MENSAGEM_TEMPO_EXCEDIDO) for erro in resultado.get("erros", []))
 
-    html_final, lista_erros = gerar_html_anotado(texto_completo, lista_final)
-    return {"tipo_documento": tipo_doc, "html": html_final, "erros": lista_erros}
\ No newline at end of file
+def processar_minuta(texto_bruto, memo=None, mapear=None):
+    for evento in iterar_processamento(texto_bruto, memo, mapear):
+        pass
+    del evento["evento"]
+    return evento
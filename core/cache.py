@@ -0,0 +1,242 @@
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+# Módulos que as regras usam sem estarem registradas; mudanças neles também invalidam o cache.
+MODULOS_AUXILIARES = ("core", "core.auditor", "core.dispositivos", "core.linhas", "core.models", "core.normalizacao", "core.pedacos", "core.planos", "core.utils")
+
+class CacheLRU:
+    """Cache em memória com descarte do item menos usado, limitado por quantidade e por tamanho.
+
+    `medir(valor)` estima o tamanho de cada valor (por padrão, 1 por item). Com `ttl` (segundos),
+    itens mais antigos que isso contam como ausentes. Seguro para uso entre threads.
+    """
+
+    def __init__(self, max_itens: int, max_tamanho: int = None, ttl: float = None, medir=None):
+        self.max_itens = max_itens
+        self.max_tamanho = max_tamanho
+        self.ttl = ttl or None
+        self.medir = medir or (lambda valor: 1)
+        self.acertos = 0
+        self.falhas = 0
+        self.descartes = 0
+        self.tamanho = 0
+        self._itens = OrderedDict()
+        self._trava = threading.Lock()
+
+    def obter(self, chave):
+        with self._trava:
+            item = self._itens.get(chave)
+            if item is not None and self.ttl is not None and time.monotonic() - item[2] > self.ttl:
+                self._remover(chave)
+                item = None
+            if item is None:
+                self.falhas += 1
+                return None
+            self._itens.move_to_end(chave)
+            self.acertos += 1
+            return item[0]
+
+    def guardar(self, chave, valor):
+        tamanho = self.medir(valor)
+        with self._trava:
+            if chave in self._itens:
+                self._remover(chave)
+            if self.max_itens <= 0 or (self.max_tamanho is not None and tamanho > self.max_tamanho):
+                return
+            self._itens[chave] = (valor, tamanho, time.monotonic())
+            self.tamanho += tamanho
+            while len(self._itens) > self.max_itens or (self.max_tamanho is not None and self.tamanho > self.max_tamanho):
+                self._remover(next(iter(self._itens)))
+                self.descartes += 1
+
+    def limpar(self):
+        with self._trava:
+            self._itens.clear()
+            self.tamanho = 0
+
+    def estatisticas(self) -> dict:
+        with self._trava:
+            consultas = self.acertos + self.falhas
+            return {
+                "itens": len(self._itens),
+                "tamanho": self.tamanho,
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "descartes": self.descartes,
+                "taxa_acerto": self.acertos / consultas if consultas else 0.0,
+            }
+
+    def _remover(self, chave):
+        _, tamanho, _ = self._itens.pop(chave)
+        self.tamanho -= tamanho
+
+class CacheDisco:
+    """Textos gravados como arquivos UTF-8 num diretório, um por chave; a gravação é atômica."""
+
+    def __init__(self, diretorio: str):
+        self.diretorio = diretorio
+        os.makedirs(diretorio, exist_ok=True)
+
+    def _caminho(self, chave: str) -> str:
+        return os.path.join(self.diretorio, chave + ".txt")
+
+    def obter(self, chave: str):
+        try:
+            with open(self._caminho(chave), "r", encoding="utf-8", newline="") as f:
+                return f.read()
+        except (FileNotFoundError, UnicodeDecodeError):
+            return None
+
+    def guardar(self, chave: str, texto: str):
+        caminho = self._caminho(chave)
+        temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temporario, "w", encoding="utf-8", newline="") as f:
+                f.write(texto)
+            os.replace(temporario, caminho)
+        except OSError:
+            # Sem espaço ou sem permissão: o cache em disco é só uma otimização.
+            if os.path.exists(temporario):
+                os.remove(temporario)
+
+class MemoRegras:
+    """Resultados de regras por (regra, texto auditado), guardados num CacheLRU compartilhado.
+
+    O texto é o de um segmento (resolução, anexo) ou de um trecho dele (core.pedacos); os
+    resumos das regras costuradas são guardados com a função de resumo no lugar da regra.
+    Cada requisição usa a sua instância, que conta quantas regras foram reaproveitadas e lê a
+    versão das regras (impressao_regras) uma vez só, não a cada trecho.
+    """
+
+    def __init__(self, cache: CacheLRU):
+        self.cache = cache
+        self.reaproveitadas = 0
+        self.executadas = 0
+        self.impressao = impressao_regras()
+
+    def chave_texto(self, texto: str) -> str:
+        return self.impressao + ":" + hashlib.sha256(texto.encode("utf-8", "surrogatepass")).hexdigest()
+
+    def obter(self, nome_regra: str, funcao, chave_texto: str):
+        resultado = self.cache.obter((nome_regra, funcao.__module__, funcao.__qualname__, chave_texto))
+        if resultado is None:
+            self.executadas += 1
+        else:
+            self.reaproveitadas += 1
+        return resultado
+
+    def guardar(self, nome_regra: str, funcao, chave_texto: str, resultado: tuple):
+        self.cache.guardar((nome_regra, funcao.__module__, funcao.__qualname__, chave_texto), resultado)
+
+    def obter_todos(self, regras: dict, chave_texto: str):
+        """Nome -> resultado de cada regra (nome -> função) de `regras` sobre o texto, ou None se
+        faltar algum: então todas rodam de novo e contam como executadas."""
+        resultados = {nome: self.cache.obter((nome, funcao.__module__, funcao.__qualname__, chave_texto)) for nome, funcao in regras.items()}
+        if any(resultado is None for resultado in resultados.values()):
+            self.executadas += len(regras)
+            return None
+        self.reaproveitadas += len(regras)
+        return resultados
+
+def _conjuntos_registrados() -> tuple:
+    from core import PLANOS
+
+    return tuple(
+        (f"{tipo}/{regra.escopo}/{regra.ordem}", regra.nome, regra.funcao)
+        for tipo, plano in sorted(PLANOS.items())
+        for regra in plano.regras
+    )
+
+@lru_cache(maxsize=4)
+def _impressao(registro: tuple) -> str:
+    h = hashlib.sha256()
+    modulos = set(MODULOS_AUXILIARES)
+    for conjunto, nome, funcao in registro:
+        h.update(f"{conjunto}\0{nome}\0{funcao.__module__}.{funcao.__qualname__}\n".encode())
+        modulos.add(funcao.__module__)
+
+    _atualizar_com_modulos(h, modulos)
+    return h.hexdigest()[:16]
+
+def _atualizar_com_modulos(h, modulos):
+    for nome_modulo in sorted(modulos):
+        arquivo = getattr(sys.modules.get(nome_modulo), "__file__", None)
+        h.update(nome_modulo.encode())
+        if arquivo and os.path.exists(arquivo):
+            with open(arquivo, "rb") as f:
+                h.update(f.read())
+
+@lru_cache(maxsize=1)
+def impressao_extracao() -> str:
+    """Versão do código de extração: o texto extraído de um arquivo muda quando ele muda."""
+    import core.file_parser
+
+    h = hashlib.sha256()
+    _atualizar_com_modulos(h, ("core.file_parser",))
+    return h.hexdigest()[:16]
+
+def impressao_regras() -> str:
+    """Versão das regras: muda quando o registro de regras ou o código dos seus módulos muda.
+
+    O registro (os planos de cada tipo de documento) é lido a cada chamada; o código-fonte só é relido quando
+    o registro muda (por exemplo, após recarregar um módulo de regras).
+    """
+    return _impressao(_conjuntos_registrados())
+
+def chave_minuta(texto_normalizado: str) -> str:
+    return impressao_regras() + ":" + hashlib.sha256(texto_normalizado.encode("utf-8", "surrogatepass")).hexdigest()
+
+def chave_arquivo(sha256_conteudo: str, extensao: str) -> str:
+    """Chave do texto extraído, a partir do SHA-256 (hex) dos bytes do arquivo."""
+    return f"{impressao_extracao()}-{sha256_conteudo}-{extensao}"
+
+def guardar_documento(texto_normalizado: str) -> str:
+    """Guarda o texto para reauditorias incrementais e devolve o seu id (SHA-256)."""
+    documento_id = hashlib.sha256(texto_normalizado.encode("utf-8", "surrogatepass")).hexdigest()
+    documentos.guardar(documento_id, texto_normalizado)
+    return documento_id
+
+def obter_extracao(chave: str):
+    """Texto já extraído do arquivo: primeiro na memória, depois no disco (que repõe a memória)."""
+    texto = cache_extracao.obter(chave)
+    if texto is None and cache_extracao_disco is not None:
+        texto = cache_extracao_disco.obter(chave)
+        if texto is not None:
+            cache_extracao.guardar(chave, texto)
+    return texto
+
+def guardar_extracao(chave: str, texto: str):
+    cache_extracao.guardar(chave, texto)
+    if cache_extracao_disco is not None:
+        cache_extracao_disco.guardar(chave, texto)
+
+cache_resultados = CacheLRU(
+    max_itens=int(os.getenv("AUDITOR_CACHE_ITENS", "256")),
+    max_tamanho=int(os.getenv("AUDITOR_CACHE_CARACTERES", "64000000")),
+    ttl=float(os.getenv("AUDITOR_CACHE_TTL", "0")),
+    medir=lambda resultado: len(resultado.get("html", "")) + 200 * (len(resultado.get("erros", [])) + len(resultado.get("eventos", []))),
+)
+
+cache_extracao = CacheLRU(
+    max_itens=int(os.getenv("AUDITOR_CACHE_EXTRACAO_ITENS", "128")),
+    max_tamanho=int(os.getenv("AUDITOR_CACHE_EXTRACAO_CARACTERES", "32000000")),
+    medir=len,
+)
+cache_extracao_disco = CacheDisco(os.environ["AUDITOR_CACHE_EXTRACAO_DIR"]) if os.getenv("AUDITOR_CACHE_EXTRACAO_DIR") else None
+
+memo_regras = CacheLRU(
+    max_itens=int(os.getenv("AUDITOR_MEMO_REGRAS_ITENS", "100000")),
+    max_tamanho=int(os.getenv("AUDITOR_MEMO_REGRAS_DETALHES", "500000")),
+    medir=lambda resultado: 1 + len(resultado[0]),
+)
+
+documentos = CacheLRU(
+    max_itens=int(os.getenv("AUDITOR_DOCUMENTOS_ITENS", "256")),
+    max_tamanho=int(os.getenv("AUDITOR_DOCUMENTOS_CARACTERES", "64000000")),
+    medir=len,
+)
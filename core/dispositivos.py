@@ -0,0 +1,141 @@
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional
+
+NIVEIS = {
+    "documento": -1,
+    "anexo": 0,
+    "capitulo": 1,
+    "secao": 2,
+    "artigo": 3,
+    "paragrafo": 4,
+    "paragrafo_unico": 4,
+    "inciso": 5,
+    "alinea": 6,
+}
+
+# Um único padrão, ancorado no início de cada linha, reconhece todos os marcadores
+# de dispositivo. A alternativa final captura incisos colados após ';' na mesma linha
+# (comum em textos extraídos de PDF), que contam para a sequência de incisos.
+REGEX_DISPOSITIVOS = re.compile(
+    r"^[^\S\n]*(?:"
+    r"(?P<capitulo>CAPÍTULO[^\S\n]+(?P<rotulo_capitulo>[IVXLCDM]+))"
+    r"|(?P<secao>Seção[^\S\n]+(?P<rotulo_secao>[IVXLCDM]+))"
+    r"|(?P<artigo>Art\.[^\S\n]*(?P<rotulo_artigo>\d+))"
+    r"|(?P<paragrafo>§[^\S\n]*(?P<rotulo_paragrafo>\d+))"
+    r"|(?P<paragrafo_unico>(?i:Parágrafo[^\S\n]+único))"
+    r"|(?P<inciso>(?P<rotulo_inciso>[IVXLCDM]+)[^\S\n]*[\-–—])"
+    r"|(?P<alinea>(?P<rotulo_alinea>[a-z])\))"
+    r"|(?P<anexo>ANEXO)"
+    r")"
+    r"|;[^\S\n]*(?P<inciso_em_linha>(?P<rotulo_inciso_em_linha>[IVXLCDM]+)[^\S\n]*[\-–—])",
+    re.MULTILINE
+)
+
+@dataclass(eq=False, slots=True)
+class Dispositivo:
+    tipo: str
+    nivel: int
+    rotulo: Optional[str]
+    inicio: int
+    inicio_marcador: int
+    fim_marcador: int
+    fim_linha: int
+    linha: int = 0
+    em_linha: bool = False
+    fim: int = 0
+    pai: Optional["Dispositivo"] = field(default=None, repr=False)
+    filhos: list = field(default_factory=list, repr=False)
+
+    @property
+    def span(self) -> tuple[int, int]:
+        return (self.inicio, self.fim)
+
+    @property
+    def span_marcador(self) -> tuple[int, int]:
+        return (self.inicio_marcador, self.fim_marcador)
+
+class ArvoreDispositivos:
+    """Árvore Anexo → Capítulo → Seção → Art. → § → inciso → alínea de um trecho de texto.
+
+    Os nós ficam também em `nos`, na ordem em que aparecem no texto, para que as
+    regras de sequência percorram a estrutura sem varrer o texto novamente.
+    """
+
+    def __init__(self, texto: str, raiz: Dispositivo, nos: list):
+        self.texto = texto
+        self.raiz = raiz
+        self.nos = nos
+        self._por_tipo = {}
+        for no in nos:
+            self._por_tipo.setdefault(no.tipo, []).append(no)
+
+    def do_tipo(self, *tipos: str) -> list:
+        if len(tipos) == 1:
+            return self._por_tipo.get(tipos[0], [])
+        return [no for no in self.nos if no.tipo in tipos]
+
+    def linha(self, no: Dispositivo) -> tuple[str, tuple[int, int]]:
+        """Texto da linha do dispositivo (a partir do marcador, sem espaços finais) e seu span."""
+        conteudo = self.texto[no.inicio_marcador:no.fim_linha].rstrip()
+        return conteudo, (no.inicio_marcador, no.inicio_marcador + len(conteudo))
+
+def _criar_no(texto: str, match: re.Match, linha: int) -> Dispositivo:
+    grupo = match.lastgroup
+    em_linha = grupo == "inciso_em_linha"
+    tipo = "inciso" if em_linha else grupo
+
+    if tipo == "paragrafo_unico":
+        rotulo = "único"
+    elif tipo == "anexo":
+        rotulo = None
+    else:
+        rotulo = match.group("rotulo_" + grupo)
+
+    fim_linha = texto.find("\n", match.end())
+    if fim_linha == -1:
+        fim_linha = len(texto)
+
+    return Dispositivo(
+        tipo=tipo,
+        nivel=NIVEIS[tipo],
+        rotulo=rotulo,
+        inicio=match.start(grupo) if em_linha else match.start(),
+        inicio_marcador=match.start(grupo),
+        fim_marcador=match.end(grupo),
+        fim_linha=fim_linha,
+        linha=linha,
+        em_linha=em_linha,
+    )
+
+@lru_cache(maxsize=8)
+def analisar_dispositivos(texto: str) -> ArvoreDispositivos:
+    """Monta, em uma única passada, a árvore de dispositivos do texto.
+
+    O resultado é memorizado por texto: todas as regras aplicadas ao mesmo trecho
+    compartilham a mesma árvore.
+    """
+    raiz = Dispositivo(tipo="documento", nivel=NIVEIS["documento"], rotulo=None, inicio=0, inicio_marcador=0, fim_marcador=0, fim_linha=0, fim=len(texto))
+    pilha = [raiz]
+    nos = []
+    linha = 0
+    pos = 0
+
+    for match in REGEX_DISPOSITIVOS.finditer(texto):
+        linha += texto.count("\n", pos, match.start())
+        pos = match.start()
+        no = _criar_no(texto, match, linha)
+
+        while pilha[-1].nivel >= no.nivel:
+            pilha.pop().fim = no.inicio
+
+        no.pai = pilha[-1]
+        no.pai.filhos.append(no)
+        pilha.append(no)
+        nos.append(no)
+
+    for no in pilha[1:]:
+        no.fim = len(texto)
+
+    return ArvoreDispositivos(texto, raiz, nos)
@@ -0,0 +1,157 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+
+try:
+    import python_multipart as multipart
+    from python_multipart.multipart import parse_options_header
+except ModuleNotFoundError:  # python-multipart anterior à 0.0.13
+    import multipart
+    from multipart.multipart import parse_options_header
+
+# Tamanho máximo do corpo de um envio de arquivo, em bytes, conferido à medida que chega.
+TAMANHO_MAXIMO_ENVIO = int(os.getenv("AUDITOR_ENVIO_MAXIMO", str(50 * 1024 * 1024)))
+# Arquivos até este tamanho ficam na memória; os maiores vão para um arquivo temporário em disco.
+LIMITE_MEMORIA_ENVIO = int(os.getenv("AUDITOR_ENVIO_MEMORIA", str(1024 * 1024)))
+# Diretório dos arquivos temporários (padrão: o do sistema).
+DIRETORIO_ENVIOS = os.getenv("AUDITOR_ENVIO_DIR") or None
+TAMANHO_BLOCO = 1024 * 1024
+
+@dataclass
+class ArquivoRecebido:
+    """Arquivo enviado, com o SHA-256 calculado na leitura.
+
+    `fonte` é o conteúdo (bytes), para arquivos pequenos, ou o caminho do arquivo em disco;
+    as funções de core.file_parser aceitam os dois, e o caminho vai para os processos do
+    pool sem copiar o conteúdo. descartar apaga o arquivo em disco.
+    """
+    fonte: object
+    tamanho: int
+    sha256: str
+
+    def descartar(self):
+        if isinstance(self.fonte, str):
+            try:
+                os.remove(self.fonte)
+            except FileNotFoundError:
+                pass
+
+class _DestinoDoArquivo:
+    """Conteúdo de uma parte de arquivo: na memória até LIMITE_MEMORIA_ENVIO; acima disso, num
+    temporário em DIRETORIO_ENVIOS, gravado uma vez só. O SHA-256 é calculado à medida que chega."""
+
+    def __init__(self, extensao: str):
+        self.extensao = extensao
+        self.resumo = hashlib.sha256()
+        self.tamanho = 0
+        self.memoria = bytearray()
+        self.arquivo = None
+
+    def vai_para_o_disco(self, tamanho: int) -> bool:
+        return self.arquivo is not None or len(self.memoria) + tamanho > LIMITE_MEMORIA_ENVIO
+
+    def escrever(self, dados: bytes):
+        self.resumo.update(dados)
+        self.tamanho += len(dados)
+        if not self.vai_para_o_disco(len(dados)):
+            self.memoria += dados
+            return
+        if self.arquivo is None:
+            self.arquivo = tempfile.NamedTemporaryFile(prefix="auditor-", suffix=f".{self.extensao}", dir=DIRETORIO_ENVIOS, delete=False)
+            self.arquivo.write(self.memoria)
+            self.memoria = bytearray()
+        self.arquivo.write(dados)
+
+    def concluir(self) -> ArquivoRecebido:
+        if self.arquivo is None:
+            return ArquivoRecebido(bytes(self.memoria), self.tamanho, self.resumo.hexdigest())
+        self.arquivo.close()
+        return ArquivoRecebido(self.arquivo.name, self.tamanho, self.resumo.hexdigest())
+
+    def descartar(self):
+        if self.arquivo is not None:
+            self.arquivo.close()
+            try:
+                os.remove(self.arquivo.name)
+            except FileNotFoundError:
+                pass
+
+def extensao_de(nome_arquivo: str) -> str:
+    return nome_arquivo.split('.')[-1].lower()
+
+async def receber_arquivo(corpo, tipo_conteudo: str, campo: str = "arquivo") -> tuple:
+    """Lê o corpo multipart de um envio (`corpo`, iterador assíncrono de bytes, como
+    Request.stream()) e devolve (nome do arquivo, ArquivoRecebido) da primeira parte `campo`,
+    ou (None, None) se ela não veio. As demais partes são ignoradas.
+
+    O conteúdo não passa por outro arquivo nem fica inteiro na memória: vai, já durante a
+    leitura do corpo, para o destino final (_DestinoDoArquivo). Corpo malformado levanta
+    ValueError; com qualquer erro, inclusive o 413 de quem limita o corpo, o temporário é apagado.
+    """
+    _, parametros = parse_options_header(tipo_conteudo)
+    if b"boundary" not in parametros:
+        raise ValueError("Envie o arquivo como multipart/form-data.")
+
+    cabecalho = [b"", b""]
+    parte = {}
+    destino = None
+    nome_arquivo = None
+    pendentes = []
+
+    def ao_iniciar_parte():
+        parte.clear()
+
+    def ao_ler_nome_do_cabecalho(dados, inicio, fim):
+        cabecalho[0] += dados[inicio:fim]
+
+    def ao_ler_valor_do_cabecalho(dados, inicio, fim):
+        cabecalho[1] += dados[inicio:fim]
+
+    def ao_terminar_cabecalho():
+        parte[cabecalho[0].lower()] = cabecalho[1]
+        cabecalho[0] = cabecalho[1] = b""
+
+    def ao_terminar_cabecalhos():
+        nonlocal destino, nome_arquivo
+        _, opcoes = parse_options_header(parte.get(b"content-disposition", b""))
+        if destino is None and opcoes.get(b"name") == campo.encode() and b"filename" in opcoes:
+            nome_arquivo = opcoes[b"filename"].decode("utf-8", "replace")
+            destino = _DestinoDoArquivo(extensao_de(nome_arquivo))
+            parte["destino"] = destino
+
+    def ao_ler_dados(dados, inicio, fim):
+        if "destino" in parte:
+            pendentes.append(dados[inicio:fim])
+
+    leitor = multipart.MultipartParser(parametros[b"boundary"], {
+        "on_part_begin": ao_iniciar_parte,
+        "on_header_field": ao_ler_nome_do_cabecalho,
+        "on_header_value": ao_ler_valor_do_cabecalho,
+        "on_header_end": ao_terminar_cabecalho,
+        "on_headers_finished": ao_terminar_cabecalhos,
+        "on_part_data": ao_ler_dados,
+    })
+    async def gravar_pendentes():
+        if not pendentes:
+            return
+        dados = b"".join(pendentes)
+        pendentes.clear()
+        # No disco, a escrita sai do event loop, como no UploadFile do Starlette.
+        if destino.vai_para_o_disco(len(dados)):
+            await asyncio.to_thread(destino.escrever, dados)
+        else:
+            destino.escrever(dados)
+
+    try:
+        async for pedaco in corpo:
+            leitor.write(pedaco)
+            await gravar_pendentes()
+        leitor.finalize()
+        await gravar_pendentes()
+    except BaseException:
+        if destino is not None:
+            destino.descartar()
+        raise
+    return (nome_arquivo, destino.concluir()) if destino is not None else (None, None)
@@ -1,25 +1,84 @@
 import io
-import docx
-import pdfplumber
-from fastapi import HTTPException
 
-def extrair_texto_docx(conteudo_bytes: bytes) -> str:
-    doc = docx.Document(io.BytesIO(conteudo_bytes))
+# python-docx, pdfplumber e fastapi são importados só quando usados: a auditoria de texto
+# (e os processos do pool que só auditam) não pagam a importação dos extratores.
+
+# `fonte` é o conteúdo do arquivo (bytes) ou o caminho de um arquivo em disco, lido aos poucos
+# pelos extratores (core.envios guarda assim os arquivos grandes enviados).
+
+def _abrir(fonte):
+    return io.BytesIO(fonte) if isinstance(fonte, (bytes, bytearray)) else fonte
+
+def extrair_texto_docx(fonte) -> str:
+    import docx
+
+    doc = docx.Document(_abrir(fonte))
     return "\n".join([paragrafo.text for paragrafo in doc.paragraphs])
 
-def extrair_texto_pdf(conteudo_bytes: bytes) -> str:
-    texto_extraido = ""
-    with pdfplumber.open(io.BytesIO(conteudo_bytes)) as pdf:
-        for pagina in pdf.pages:
-            texto_pagina = pagina.extract_text()
-            if texto_pagina:
-                texto_extraido += texto_pagina + "\n"
-    return texto_extraido
+# Menor intervalo enviado a um processo: abaixo disso, reabrir o PDF custa mais que extrair.
+PAGINAS_MINIMAS_POR_INTERVALO = 4
+
+def contar_paginas_pdf(fonte) -> int:
+    import pdfplumber
+
+    with pdfplumber.open(_abrir(fonte)) as pdf:
+        return len(pdf.pages)
+
+def extrair_paginas_pdf(fonte, inicio: int = 0, fim: int = None) -> list:
+    """Texto das páginas [inicio, fim), na ordem; páginas sem texto viram ''."""
+    import pdfplumber
+
+    with pdfplumber.open(_abrir(fonte)) as pdf:
+        return [pagina.extract_text() or "" for pagina in pdf.pages[inicio:fim]]
 
-def processar_arquivo_bytes(conteudo_bytes: bytes, extensao: str) -> str:
+def intervalos_de_paginas(total: int, partes: int) -> list:
+    """Divide [0, total) em até `partes` intervalos contíguos de tamanhos próximos."""
+    partes = max(1, min(partes, total // PAGINAS_MINIMAS_POR_INTERVALO))
+    base, resto = divmod(total, partes)
+    intervalos = []
+    inicio = 0
+    for i in range(partes):
+        fim = inicio + base + (1 if i < resto else 0)
+        intervalos.append((inicio, fim))
+        inicio = fim
+    return intervalos
+
+def iterar_paginas_pdf(fonte, executor=None, partes: int = None):
+    """Gera o texto de cada página, na ordem, assim que ela (e as anteriores) fica pronta.
+
+    Sem executor, extrai página a página neste processo. Com um executor de processos,
+    divide o documento em `partes` intervalos extraídos em paralelo. A auditoria não consome
+    as páginas à medida que saem: o servidor as junta antes (core.paralelo).
+    """
+    if executor is None:
+        import pdfplumber
+
+        with pdfplumber.open(_abrir(fonte)) as pdf:
+            for pagina in pdf.pages:
+                yield pagina.extract_text() or ""
+        return
+
+    intervalos = intervalos_de_paginas(contar_paginas_pdf(fonte), partes or 1)
+    futures = [executor.submit(extrair_paginas_pdf, fonte, inicio, fim) for inicio, fim in intervalos]
+    try:
+        for future in futures:
+            yield from future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+
+def juntar_paginas(paginas) -> str:
+    return "".join(texto_pagina + "\n" for texto_pagina in paginas if texto_pagina)
+
+def extrair_texto_pdf(fonte) -> str:
+    return juntar_paginas(iterar_paginas_pdf(fonte))
+
+def processar_arquivo_bytes(fonte, extensao: str) -> str:
     if extensao == 'docx':
-        return extrair_texto_docx(conteudo_bytes)
+        return extrair_texto_docx(fonte)
     elif extensao == 'pdf':
-        return extrair_texto_pdf(conteudo_bytes)
+        return extrair_texto_pdf(fonte)
     else:
+        from fastapi import HTTPException
+
         raise HTTPException(status_code=400, detail="Formato não suportado. Envie .docx ou .pdf")
\ No newline at end of file
@@ -0,0 +1,28 @@
+from core.auditor import normalizar_quebras_de_linha, processar_minuta
+from core.cache import MemoRegras, guardar_documento, memo_regras
+
+def aplicar_edicoes(texto: str, edicoes: list) -> str:
+    """Aplica as edições em sequência: cada (inicio, remover, inserir) se refere ao texto
+    resultante das anteriores. Offsets e tamanhos fora do texto levantam ValueError."""
+    partes = texto
+    for numero, (inicio, remover, inserir) in enumerate(edicoes, start=1):
+        if inicio < 0 or remover < 0 or inicio + remover > len(partes):
+            raise ValueError(f"Edição {numero} fora do texto: início {inicio}, remover {remover}, tamanho {len(partes)}.")
+        partes = partes[:inicio] + normalizar_quebras_de_linha(inserir) + partes[inicio + remover:]
+    return partes
+
+def reauditar(texto_base: str, edicoes: list, mapear=None) -> dict:
+    """Audita o texto base com as edições, reaproveitando os resultados dos trechos (core.pedacos)
+    que não mudaram; os spans reaproveitados são reposicionados no texto novo. Os trechos
+    alterados rodam aqui ou, com `mapear`, no pool (core.auditor.iterar_processamento).
+
+    Só a fase das regras é incremental: o texto novo ainda é normalizado, dividido e tem os
+    trechos resumidos por SHA-256, e o resultado (spans, HTML anotado) é montado inteiro, em
+    tempo proporcional ao documento."""
+    texto_novo = aplicar_edicoes(texto_base, edicoes)
+    memo = MemoRegras(memo_regras)
+    
+    resultado = processar_minuta(texto_novo, memo, mapear)
+    resultado["documento_id"] = guardar_documento(texto_novo)
+    resultado["incremental"] = {"regras_reaproveitadas": memo.reaproveitadas, "regras_executadas": memo.executadas}
+    return resultado
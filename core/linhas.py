@@ -0,0 +1,91 @@
+import itertools
+import re
+from array import array
+from bisect import bisect_right
+from functools import cached_property, lru_cache
+
+REGEX_QUEBRA_LINHA = re.compile(r"\n")
+REGEX_LINHA_COM_CONTEUDO = re.compile(r"^[^\S\n]*\S", re.MULTILINE)
+
+class IndiceLinhas:
+    """Tabela de linhas de um texto, montada uma vez e consultada sem recortar o texto.
+
+    `inicios[i]` é o offset do primeiro caractere da linha i. `proximo_conteudo[i]`
+    é o offset do primeiro caractere não branco a partir do início da linha i
+    (ou len(texto), se o restante do texto estiver em branco); essa tabela só é
+    montada na primeira consulta.
+    """
+
+    def __init__(self, texto: str):
+        self.texto = texto
+
+        inicios = array("I", [0])
+        inicios.extend(m.end() for m in REGEX_QUEBRA_LINHA.finditer(texto))
+        self.inicios = inicios
+
+    @cached_property
+    def proximo_conteudo(self) -> array:
+        texto = self.texto
+        proximo = array("I")
+        linha = 0
+        pos = 0
+
+        # Cada linha com conteúdo preenche, de uma vez, as linhas em branco que a precedem.
+        for match in REGEX_LINHA_COM_CONTEUDO.finditer(texto):
+            inicio_conteudo = match.end() - 1
+            linha += texto.count("\n", pos, inicio_conteudo)
+            pos = inicio_conteudo
+            faltam = linha + 1 - len(proximo)
+            if faltam == 1:
+                proximo.append(inicio_conteudo)
+            else:
+                proximo.extend(array("I", [inicio_conteudo]) * faltam)
+
+        proximo.extend(array("I", [len(texto)]) * (len(self.inicios) + 1 - len(proximo)))
+        return proximo
+
+    def __len__(self) -> int:
+        return len(self.inicios)
+
+    def conteudo_apos_linha(self, linha: int) -> int:
+        """Offset do primeiro caractere não branco depois da linha informada."""
+        return self.proximo_conteudo[min(linha + 1, len(self.inicios))]
+
+    def linha_de(self, offset: int) -> int:
+        """Número (base 0) da linha que contém o offset."""
+        return bisect_right(self.inicios, offset) - 1
+
+    def posicao(self, offset: int) -> tuple[int, int]:
+        """Linha e coluna (ambas a partir de 1) do offset, como exibidas ao usuário."""
+        linha = self.linha_de(offset)
+        return linha + 1, offset - self.inicios[linha] + 1
+
+    def fim_linha(self, linha: int) -> int:
+        """Offset do '\n' que encerra a linha (ou len(texto), na última)."""
+        if linha + 1 < len(self.inicios):
+            return self.inicios[linha + 1] - 1
+        return len(self.texto)
+
+    def linha_limpa(self, linha: int) -> tuple[str, int]:
+        """Conteúdo da linha sem espaços nas pontas e o offset em que ele começa."""
+        bruto = self.texto[self.inicios[linha]:self.fim_linha(linha)]
+        conteudo = bruto.lstrip()
+        return conteudo.rstrip(), self.inicios[linha] + len(bruto) - len(conteudo)
+
+    def linhas_com_conteudo(self, de: int = 0, ate: int = None, reverso: bool = False):
+        """Percorre as linhas não vazias no intervalo [de, ate), gerando (linha, conteúdo, offset)."""
+        if ate is None:
+            ate = len(self.inicios)
+        ordem = range(ate - 1, de - 1, -1) if reverso else range(de, ate)
+        for linha in ordem:
+            conteudo, inicio = self.linha_limpa(linha)
+            if conteudo:
+                yield linha, conteudo, inicio
+
+    def primeiras_linhas(self, quantidade: int) -> list[str]:
+        """As primeiras linhas não vazias, já sem espaços nas pontas."""
+        return [conteudo for _, conteudo, _ in itertools.islice(self.linhas_com_conteudo(), quantidade)]
+
+@lru_cache(maxsize=8)
+def indice_linhas(texto: str) -> IndiceLinhas:
+    return IndiceLinhas(texto)
@@ -0,0 +1,172 @@
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Limites das faixas dos histogramas: tempos em segundos, tamanhos em caracteres ou bytes.
+LIMITES_REGRA = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LIMITES_REQUISICAO = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+LIMITES_CARACTERES = (1_000, 5_000, 10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 2_500_000, 5_000_000)
+LIMITES_BYTES = (10_000, 100_000, 1_000_000, 5_000_000, 10_000_000, 50_000_000, 100_000_000)
+
+def _escapar(valor) -> str:
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _formatar_rotulos(nomes, valores, extra=None) -> str:
+    pares = [f'{nome}="{_escapar(valor)}"' for nome, valor in zip(nomes, valores)]
+    if extra:
+        pares.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+def _formatar_numero(valor) -> str:
+    if valor == math.inf:
+        return "+Inf"
+    return repr(float(valor)) if isinstance(valor, float) and not valor.is_integer() else str(int(valor))
+
+class Contador:
+    tipo = "counter"
+
+    def __init__(self, nome: str, ajuda: str, rotulos: tuple = ()):
+        self.nome, self.ajuda, self.rotulos = nome, ajuda, rotulos
+        self._valores = {}
+        self._trava = threading.Lock()
+
+    def incrementar(self, *valores_rotulos, quantidade: float = 1):
+        with self._trava:
+            self._valores[valores_rotulos] = self._valores.get(valores_rotulos, 0) + quantidade
+
+    def linhas(self):
+        with self._trava:
+            itens = sorted(self._valores.items())
+        for valores, total in itens:
+            yield f"{self.nome}{_formatar_rotulos(self.rotulos, valores)} {_formatar_numero(total)}"
+
+    def retirar(self) -> dict:
+        with self._trava:
+            valores, self._valores = self._valores, {}
+        return valores
+
+    def incorporar(self, valores: dict):
+        with self._trava:
+            for chave, total in valores.items():
+                self._valores[chave] = self._valores.get(chave, 0) + total
+
+class Histograma:
+    """Contagens por faixa (não acumuladas) mais soma e total, por combinação de rótulos."""
+    tipo = "histogram"
+
+    def __init__(self, nome: str, ajuda: str, rotulos: tuple = (), limites: tuple = LIMITES_REQUISICAO):
+        self.nome, self.ajuda, self.rotulos = nome, ajuda, rotulos
+        self.limites = tuple(sorted(limites))
+        self._series = {}
+        self._trava = threading.Lock()
+
+    def observar(self, valor: float, *valores_rotulos):
+        faixa = bisect_left(self.limites, valor)
+        with self._trava:
+            serie = self._series.get(valores_rotulos)
+            if serie is None:
+                serie = self._series[valores_rotulos] = [[0] * (len(self.limites) + 1), 0.0, 0]
+            serie[0][faixa] += 1
+            serie[1] += valor
+            serie[2] += 1
+
+    @contextmanager
+    def medir(self, *valores_rotulos):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observar(time.perf_counter() - inicio, *valores_rotulos)
+
+    def linhas(self):
+        with self._trava:
+            itens = sorted((valores, (list(faixas), soma, total)) for valores, (faixas, soma, total) in self._series.items())
+        for valores, (faixas, soma, total) in itens:
+            acumulado = 0
+            for limite, quantidade in zip((*self.limites, math.inf), faixas):
+                acumulado += quantidade
+                le = _formatar_numero(limite) if limite == math.inf else repr(float(limite))
+                yield f"{self.nome}_bucket{_formatar_rotulos(self.rotulos, valores, ('le', le))} {acumulado}"
+            yield f"{self.nome}_sum{_formatar_rotulos(self.rotulos, valores)} {_formatar_numero(soma)}"
+            yield f"{self.nome}_count{_formatar_rotulos(self.rotulos, valores)} {total}"
+
+    def retirar(self) -> dict:
+        with self._trava:
+            series, self._series = self._series, {}
+        return series
+
+    def incorporar(self, series: dict):
+        with self._trava:
+            for chave, (faixas, soma, total) in series.items():
+                serie = self._series.get(chave)
+                if serie is None:
+                    self._series[chave] = [list(faixas), soma, total]
+                    continue
+                serie[0] = [a + b for a, b in zip(serie[0], faixas)]
+                serie[1] += soma
+                serie[2] += total
+
+class RegistroMetricas:
+    """Métricas do processo, expostas no formato de texto do Prometheus.
+
+    Os processos do pool usam o seu próprio registro: `retirar()` devolve o que foi observado
+    lá desde a última chamada (e zera), e o processo principal soma com `incorporar()`.
+    `coletores` são funções chamadas na exposição, que devolvem métricas calculadas na hora
+    como (nome, tipo, ajuda, rótulos, [(valores dos rótulos, valor)]).
+    """
+
+    def __init__(self):
+        self.metricas = {}
+        self.coletores = []
+
+    def contador(self, nome, ajuda, rotulos=()) -> Contador:
+        return self.metricas.setdefault(nome, Contador(nome, ajuda, rotulos))
+
+    def histograma(self, nome, ajuda, rotulos=(), limites=LIMITES_REQUISICAO) -> Histograma:
+        return self.metricas.setdefault(nome, Histograma(nome, ajuda, rotulos, limites))
+
+    def retirar(self) -> dict:
+        return {nome: metrica.retirar() for nome, metrica in self.metricas.items()}
+
+    def incorporar(self, observadas: dict):
+        for nome, valores in observadas.items():
+            if valores and nome in self.metricas:
+                self.metricas[nome].incorporar(valores)
+
+    def exposicao(self) -> str:
+        linhas = []
+        for metrica in self.metricas.values():
+            linhas += [f"# HELP {metrica.nome} {metrica.ajuda}", f"# TYPE {metrica.nome} {metrica.tipo}", *metrica.linhas()]
+        for coletor in self.coletores:
+            for nome, tipo, ajuda, rotulos, amostras in coletor():
+                linhas += [f"# HELP {nome} {ajuda}", f"# TYPE {nome} {tipo}"]
+                linhas += [f"{nome}{_formatar_rotulos(rotulos, valores)} {_formatar_numero(valor)}" for valores, valor in amostras]
+        return "\n".join(linhas) + "\n"
+
+registro = RegistroMetricas()
+
+requisicoes = registro.contador("auditor_requisicoes_total", "Requisições HTTP respondidas.", ("endpoint", "metodo", "status"))
+duracao_requisicoes = registro.histograma(
+    "auditor_requisicao_segundos", "Duração das requisições HTTP, até o fim do corpo da resposta.", ("endpoint", "metodo")
+)
+duracao_extracao = registro.histograma("auditor_extracao_segundos", "Tempo de extração de texto dos arquivos enviados.", ("tipo",))
+tamanho_arquivos = registro.histograma("auditor_arquivo_bytes", "Tamanho dos arquivos enviados.", ("tipo",), LIMITES_BYTES)
+duracao_regras = registro.histograma("auditor_regra_segundos", "Tempo de execução de cada regra.", ("regra",), LIMITES_REGRA)
+regras_interrompidas = registro.contador("auditor_regras_interrompidas_total", "Regras interrompidas por passar do tempo.", ("regra",))
+tamanho_documentos = registro.histograma("auditor_documento_caracteres", "Tamanho das minutas auditadas.", (), LIMITES_CARACTERES)
+
+def coletor_de_caches(caches: dict):
+    """Coletor com as estatísticas (CacheLRU.estatisticas) de cada cache, por nome."""
+    def coletar():
+        estatisticas = {nome: cache.estatisticas() for nome, cache in caches.items()}
+        por_nome = lambda campo: [((nome,), e[campo]) for nome, e in estatisticas.items()]
+        return [
+            ("auditor_cache_itens", "gauge", "Itens guardados no cache.", ("cache",), por_nome("itens")),
+            ("auditor_cache_tamanho", "gauge", "Tamanho estimado do conteúdo do cache.", ("cache",), por_nome("tamanho")),
+            ("auditor_cache_acertos_total", "counter", "Consultas respondidas pelo cache.", ("cache",), por_nome("acertos")),
+            ("auditor_cache_falhas_total", "counter", "Consultas sem item no cache.", ("cache",), por_nome("falhas")),
+            ("auditor_cache_descartes_total", "counter", "Itens descartados por falta de espaço.", ("cache",), por_nome("descartes")),
+        ]
+    return coletar
@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional, Union, Tuple, Any
 
@@ -17,4 +18,52 @@ class ResultadoRegra(BaseModel):
     def normalizar_detalhe(cls, v: Any) -> Any:
         if isinstance(v, dict):
             return [v]
-        return v
\ No newline at end of file
+        return v
+
+@dataclass(slots=True)
+class Achado:
+    """Forma interna e leve de ErroDetalhe, que as regras podem devolver no lugar do dict."""
+    mensagem: str
+    original: Optional[str] = None
+    sugestao: Optional[str] = None
+    span: Optional[Tuple[int, int]] = None
+    tipo: Optional[str] = None
+
+    def como_dict(self) -> dict:
+        return {campo: valor for campo in CAMPOS_ERRO if (valor := getattr(self, campo)) is not None}
+
+CAMPOS_ERRO = tuple(ErroDetalhe.model_fields)
+_CONJUNTO_CAMPOS_ERRO = frozenset(CAMPOS_ERRO)
+
+def _normalizar_item(item):
+    if isinstance(item, str):
+        return item
+    if isinstance(item, Achado):
+        item = item.como_dict()
+    elif not isinstance(item, dict):
+        raise TypeError(f"detalhe inválido: {type(item).__name__}")
+    elif not (item.keys() <= _CONJUNTO_CAMPOS_ERRO and None not in item.values()):
+        item = {campo: valor for campo in CAMPOS_ERRO if (valor := item.get(campo)) is not None}
+    
+    if not isinstance(item.get("mensagem"), str):
+        raise ValueError("detalhe sem 'mensagem'")
+    span = item.get("span")
+    if span is not None and type(span) is not tuple:
+        item = {**item, "span": tuple(span)}
+    return item
+
+def normalizar_resultado(resultado_cru) -> tuple:
+    """(status, detalhes) de uma regra, no formato de ResultadoRegra.model_validate + model_dump(exclude_none=True),
+    sem criar modelos: itens de erro viram dicts com os campos de ErroDetalhe e span em tupla."""
+    status = resultado_cru["status"]
+    if not isinstance(status, str):
+        raise ValueError("status inválido")
+    
+    detalhe = resultado_cru.get("detalhe", [])
+    if isinstance(detalhe, (dict, Achado)):
+        detalhe = [detalhe]
+    if isinstance(detalhe, str):
+        return status, detalhe
+    if not isinstance(detalhe, list):
+        raise TypeError(f"detalhe inválido: {type(detalhe).__name__}")
+    return status, [_normalizar_item(item) for item in detalhe]
@@ -0,0 +1,120 @@
+import re
+import unicodedata
+from array import array
+from bisect import bisect_right
+
+# Variantes de espaço, hífen, travessão e aspas trocadas pela forma simples na visão de análise
+# (mesmo tamanho). O hífen (-), a meia-risca (–) e o travessão (—) continuam distintos: as
+# regras os diferenciam.
+EQUIVALENTES = {
+    **dict.fromkeys("\xa0\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a\u202f\u205f\u3000", " "),
+    **dict.fromkeys("\u2010\u2011\u2212\ufe63\uff0d", "-"),
+    "\u2012": "–",
+    **dict.fromkeys("\u2015\u2e3a\u2e3b\ufe58", "—"),
+    **dict.fromkeys("\u201c\u201d\u201e\u201f", '"'),
+    **dict.fromkeys("\u2018\u2019\u201a\u201b", "'"),
+}
+# Removidos da visão de análise: espaços de largura zero, BOM e hífen suave.
+INVISIVEIS = "\u200b\u200c\u200d\u2060\ufeff\xad"
+MARCAS_COMBINANTES = "\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f"
+
+# Uma varredura encontra as marcas de minuta e o que muda de tamanho. As marcas viram
+# espaços (mesmo tamanho): "MINUTA DE DOCUMENTO..." até o fim da linha (e os espaços e
+# asteriscos antes dela, desde o início da linha), o prefixo "MINUTA (DE)" antes de
+# RESOLUÇÃO/PORTARIA e "Minuta assinada para fins de visualização". Letras seguidas de
+# acentos combinantes (comuns em texto extraído de PDF) são recompostas em NFC.
+REGEX_NORMALIZACAO = re.compile(
+    # O conjunto inicial deixa a busca pular direto os trechos sem nada a normalizar.
+    rf"(?=[Mm{INVISIVEIS}{MARCAS_COMBINANTES}])"
+    r"(?:(?P<documento>(?i:MINUTA DE DOCUMENTO)[^\n]*)"
+    r"|(?P<prefixo>(?i:MINUTA\s+(?:DE\s+)?)(?=(?i:RESOLUÇÃO|PORTARIA)))"
+    r"|(?P<assinada>(?i:Minuta\s+assinada\s+para\s+fins\s+de\s+visualização))"
+    rf"|(?P<acentos>[{MARCAS_COMBINANTES}]+)"
+    rf"|(?P<invisiveis>[{INVISIVEIS}]+))"
+)
+
+class TextoNormalizado:
+    """Visão de análise de um texto e o mapa dos seus offsets de volta ao original.
+
+    O mapa só guarda os pontos em que a diferença de tamanho muda (caracteres removidos ou
+    recompostos): `pos_analise[i]` corresponde a `pos_original[i]`, e os offsets seguintes
+    mantêm a mesma diferença até o próximo ponto. Sem pontos, os offsets são os mesmos.
+    """
+    __slots__ = ("original", "texto", "pos_analise", "pos_original")
+
+    def __init__(self, original: str, texto: str, pos_analise: array, pos_original: array):
+        self.original = original
+        self.texto = texto
+        self.pos_analise = pos_analise
+        self.pos_original = pos_original
+
+    @property
+    def mesmos_offsets(self) -> bool:
+        return not self.pos_analise
+
+    def para_original(self, offset: int) -> int:
+        i = bisect_right(self.pos_analise, offset) - 1
+        if i < 0:
+            return offset
+        return self.pos_original[i] + offset - self.pos_analise[i]
+
+def _inicio_da_marca_documento(texto: str, inicio: int):
+    """Início da marca como no padrão ^[\\s*]*MINUTA DE DOCUMENTO (multilinha): o primeiro
+    início de linha na sequência de espaços e asteriscos antes de `inicio`, ou None."""
+    inicio_linha = None
+    while True:
+        if inicio == 0 or texto[inicio - 1] == "\n":
+            inicio_linha = inicio
+        if inicio == 0 or not (texto[inicio - 1].isspace() or texto[inicio - 1] == "*"):
+            return inicio_linha
+        inicio -= 1
+
+def normalizar_para_analise(texto: str) -> TextoNormalizado:
+    """Monta, numa passagem, a visão de análise de `texto` e o mapa de offsets."""
+    original = texto
+    # As trocas de mesmo tamanho não mexem nos offsets: str.replace só nas variantes presentes.
+    for variante, forma in EQUIVALENTES.items():
+        if variante in texto:
+            texto = texto.replace(variante, forma)
+    partes = []
+    pos_analise, pos_original = array("I"), array("I")
+    cursor = tamanho_saida = 0
+    match = REGEX_NORMALIZACAO.search(texto)
+    while match:
+        inicio, fim = match.span()
+        tipo = match.lastgroup
+        if tipo == "documento":
+            inicio_marca = _inicio_da_marca_documento(texto, inicio)
+            if inicio_marca is None:
+                # Sem início de linha antes: não é a marca; segue a busca no próximo caractere.
+                match = REGEX_NORMALIZACAO.search(texto, inicio + 1)
+                continue
+            if inicio_marca < cursor:
+                # Parte dos espaços antes da marca já foi copiada (com o mesmo tamanho).
+                copiado = "".join(partes)
+                partes = [copiado[:inicio_marca - cursor], " " * (cursor - inicio_marca)]
+            inicio = max(inicio_marca, cursor)
+            substituto = " " * (fim - inicio)
+        elif tipo == "prefixo" or tipo == "assinada":
+            substituto = " " * (fim - inicio)
+        elif tipo == "acentos":
+            # Recompõe com a letra anterior, se ela ainda não foi copiada.
+            if inicio > cursor and texto[inicio - 1] != "\n":
+                inicio -= 1
+            substituto = unicodedata.normalize("NFC", texto[inicio:fim])
+        else:
+            substituto = ""
+
+        partes.append(texto[cursor:inicio])
+        partes.append(substituto)
+        tamanho_saida += (inicio - cursor) + len(substituto)
+        if len(substituto) != fim - inicio:
+            pos_analise.append(tamanho_saida)
+            pos_original.append(fim)
+        cursor = fim
+        match = REGEX_NORMALIZACAO.search(texto, fim)
+
+    if not partes:
+        return TextoNormalizado(original, texto, pos_analise, pos_original)
+    partes.append(texto[cursor:])
+    return TextoNormalizado(original, "".join(partes), pos_analise, pos_original)
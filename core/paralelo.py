@@ -0,0 +1,201 @@
+import asyncio
+import math
+import multiprocessing
+import os
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from core import metricas
+from core.auditor import aquecer, processar_minuta
+from core.file_parser import contar_paginas_pdf, extrair_paginas_pdf, intervalos_de_paginas, juntar_paginas, processar_arquivo_bytes
+
+# Número de processos do pool de auditoria; por padrão, um por núcleo.
+PROCESSOS_AUDITORIA = int(os.getenv("AUDITOR_PROCESSOS", "0")) or os.cpu_count() or 1
+# Onde roda o trabalho de CPU das requisições individuais: "processo" (pool acima) ou "thread".
+TIPO_EXECUTOR = os.getenv("AUDITOR_EXECUTOR", "processo")
+# Máximo de auditorias/extrações simultâneas fora do event loop; as demais aguardam a vez.
+CONCORRENCIA_MAXIMA = int(os.getenv("AUDITOR_CONCORRENCIA", "0")) or PROCESSOS_AUDITORIA
+# Entradas menores que isto (caracteres ou bytes) rodam direto no event loop: o envio custaria mais que o trabalho.
+LIMITE_INLINE = int(os.getenv("AUDITOR_LIMITE_INLINE", "20000"))
+# Com AUDITOR_AQUECER=1, o servidor e cada processo do pool auditam minutas de exemplo ao iniciar.
+AQUECER = os.getenv("AUDITOR_AQUECER", "") == "1"
+# Cada processo recebe, em média, esta quantidade de lotes, para equilibrar textos de tamanhos diferentes.
+LOTES_POR_PROCESSO = 4
+
+_pool = None
+_pool_threads = None
+_trava_pool = threading.Lock()
+_semaforos = weakref.WeakKeyDictionary()
+
+class ErroNoExecutor(Exception):
+    """Falha ocorrida em outro processo, trazida só com a mensagem (nem toda exceção volta por pickle)."""
+
+def obter_pool() -> ProcessPoolExecutor:
+    """Pool de processos compartilhado, criado no primeiro uso.
+
+    Usa 'spawn' para não herdar, por fork, as threads do servidor.
+    """
+    global _pool
+    with _trava_pool:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=PROCESSOS_AUDITORIA,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=aquecer if AQUECER else None,
+            )
+        return _pool
+
+def obter_pool_threads() -> ThreadPoolExecutor:
+    global _pool_threads
+    with _trava_pool:
+        if _pool_threads is None:
+            _pool_threads = ThreadPoolExecutor(max_workers=CONCORRENCIA_MAXIMA, thread_name_prefix="auditor")
+        return _pool_threads
+
+def encerrar_pool(pool: ProcessPoolExecutor = None):
+    """Encerra o pool (ou só o informado, se ainda for o atual); o próximo uso cria outro."""
+    global _pool, _pool_threads
+    with _trava_pool:
+        if pool is None and _pool_threads is not None:
+            _pool_threads, threads = None, _pool_threads
+            threads.shutdown(wait=False, cancel_futures=True)
+        if _pool is None or (pool is not None and pool is not _pool):
+            return
+        _pool, atual = None, _pool
+    atual.shutdown(wait=False, cancel_futures=True)
+
+def _chamar_isolado(funcao, *args):
+    """Roda no processo do pool; devolve o resultado e as métricas observadas lá (core.metricas)."""
+    try:
+        return funcao(*args), metricas.registro.retirar()
+    except Exception as e:
+        raise ErroNoExecutor(str(e)) from None
+
+def _resultado_do_processo(resultado_e_metricas):
+    resultado, observadas = resultado_e_metricas
+    metricas.registro.incorporar(observadas)
+    return resultado
+
+def _semaforo() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaforo = _semaforos.get(loop)
+    if semaforo is None:
+        semaforo = _semaforos[loop] = asyncio.Semaphore(CONCORRENCIA_MAXIMA)
+    return semaforo
+
+async def executar_fora_do_loop(funcao, *args, tamanho: int = None):
+    """Roda funcao(*args) no executor configurado, com no máximo CONCORRENCIA_MAXIMA em andamento.
+
+    Se `tamanho` for menor que LIMITE_INLINE, roda direto no event loop. No executor de
+    processos, exceções voltam como ErroNoExecutor; em thread e inline, como foram lançadas.
+    """
+    if tamanho is not None and tamanho < LIMITE_INLINE:
+        return funcao(*args)
+
+    async with _semaforo():
+        loop = asyncio.get_running_loop()
+        if TIPO_EXECUTOR == "thread":
+            return await loop.run_in_executor(obter_pool_threads(), funcao, *args)
+
+        pool = obter_pool()
+        try:
+            return _resultado_do_processo(await loop.run_in_executor(pool, _chamar_isolado, funcao, *args))
+        except BrokenProcessPool:
+            encerrar_pool(pool)
+            raise
+
+async def extrair_arquivo_fora_do_loop(fonte, extensao: str, tamanho: int = None) -> str:
+    """Extrai o texto do arquivo fora do event loop.
+
+    `fonte` são os bytes ou o caminho do arquivo (core.file_parser); com o caminho, cada
+    processo lê o arquivo do disco em vez de receber uma cópia do conteúdo. PDFs grandes,
+    com o executor de processos, são divididos em intervalos de páginas extraídos em
+    paralelo no pool e juntados na ordem; o texto só é devolvido, e auditado, depois da
+    última página.
+    """
+    if tamanho is None:
+        tamanho = len(fonte)
+    if extensao != "pdf" or TIPO_EXECUTOR == "thread" or PROCESSOS_AUDITORIA == 1 or tamanho < LIMITE_INLINE:
+        return await executar_fora_do_loop(processar_arquivo_bytes, fonte, extensao, tamanho=tamanho)
+
+    total = await executar_fora_do_loop(contar_paginas_pdf, fonte)
+    intervalos = intervalos_de_paginas(total, PROCESSOS_AUDITORIA * 2)
+    paginas = await asyncio.gather(*(executar_fora_do_loop(extrair_paginas_pdf, fonte, inicio, fim) for inicio, fim in intervalos))
+    return juntar_paginas(texto for intervalo in paginas for texto in intervalo)
+
+def mapear_no_pool(funcao, *iteraveis):
+    """Como Executor.map no pool de processos: envia todas as chamadas já e devolve um iterador
+    dos resultados, na ordem, com as métricas de cada processo somadas às deste."""
+    pool = obter_pool()
+    futures = [pool.submit(_chamar_isolado, funcao, *args) for args in zip(*iteraveis)]
+
+    def resultados():
+        for future in futures:
+            try:
+                yield _resultado_do_processo(future.result())
+            except BrokenProcessPool:
+                encerrar_pool(pool)
+                raise
+    return resultados()
+
+def mapeador_de_trechos(tamanho: int):
+    """`mapear` de iterar_processamento para uma minuta de `tamanho` caracteres: o pool de
+    processos, se a minuta não for menor que LIMITE_INLINE."""
+    if TIPO_EXECUTOR == "thread" or tamanho < LIMITE_INLINE:
+        return None
+    return mapear_no_pool
+
+async def auditar_fora_do_loop(texto: str, memo=None) -> dict:
+    """processar_minuta(texto, memo) fora do event loop, como executar_fora_do_loop.
+
+    Minutas grandes, com o executor de processos, são auditadas numa thread deste processo,
+    que envia os trechos ainda fora do `memo` (core.pedacos), em lotes, aos processos do pool
+    e roda as regras sobre o segmento inteiro enquanto isso, como os intervalos de páginas de
+    extrair_arquivo_fora_do_loop. Assim o `memo`, que fica neste processo, é usado e alimentado.
+    """
+    mapear = mapeador_de_trechos(len(texto))
+    if mapear is None:
+        return await executar_fora_do_loop(processar_minuta, texto, memo, tamanho=len(texto))
+    async with _semaforo():
+        return await asyncio.to_thread(processar_minuta, texto, memo, mapear)
+
+def _auditar_item(texto: str) -> dict:
+    try:
+        return {"status": "OK", "resultado": processar_minuta(texto)}
+    except Exception as e:
+        return {"status": "ERRO", "detalhe": f"Erro ao auditar minuta: {e}"}
+
+def auditar_lote_local(textos: list) -> list:
+    """Audita uma fatia do lote no processo atual; a falha de um item não afeta os demais."""
+    return [_auditar_item(texto) for texto in textos]
+
+def dividir_lote(textos: list, processos: int) -> list:
+    """Fatias contíguas, na ordem de entrada, com LOTES_POR_PROCESSO fatias por processo."""
+    if not textos:
+        return []
+    tamanho = math.ceil(len(textos) / (processos * LOTES_POR_PROCESSO))
+    return [textos[i:i + tamanho] for i in range(0, len(textos), tamanho)]
+
+def enviar_lote(textos: list) -> tuple:
+    """Distribui as fatias do lote no pool. Devolve o pool usado e os futures, na ordem das fatias."""
+    pool = obter_pool()
+    fatias = dividir_lote(textos, PROCESSOS_AUDITORIA)
+    return pool, fatias, [pool.submit(_chamar_isolado, auditar_lote_local, fatia) for fatia in fatias]
+
+def juntar_lote(pool, fatias: list, resultados_fatias: list) -> list:
+    """Reúne os resultados das fatias na ordem de entrada.
+
+    Uma fatia cujo processo morreu (ou que falhou ao ser enviada) vira um ERRO por item.
+    Se o pool quebrou, ele é descartado para que o próximo lote use um novo.
+    """
+    resultados = []
+    for fatia, resultado in zip(fatias, resultados_fatias):
+        if isinstance(resultado, BaseException):
+            if isinstance(resultado, BrokenProcessPool):
+                encerrar_pool(pool)
+            resultados.extend({"status": "ERRO", "detalhe": f"Erro ao auditar minuta: {resultado}"} for _ in fatia)
+        else:
+            resultados.extend(_resultado_do_processo(resultado))
+    return resultados
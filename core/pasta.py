@@ -0,0 +1,191 @@
+"""Auditoria em lote dos .docx e .pdf de uma pasta, para a linha de comando (auditar_pasta.py).
+
+Cada arquivo é extraído (core.file_parser) e auditado (core.auditor.processar_minuta) num
+processo do pool, que o lê pelo caminho. Os resultados são acrescentados, um por linha e à
+medida que ficam prontos, a um arquivo JSON Lines; o manifesto ao lado dele guarda a versão
+das regras e da extração e o SHA-256 do conteúdo de cada arquivo auditado, de modo que uma
+execução interrompida, repetida sobre a mesma pasta, pula o que já foi feito. O resumo por
+arquivo e por regra é montado com pandas a partir do JSON Lines inteiro.
+"""
+import hashlib
+import json
+import multiprocessing
+import os
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from core.auditor import processar_minuta
+from core.cache import impressao_extracao, impressao_regras
+from core.envios import TAMANHO_BLOCO
+from core.file_parser import processar_arquivo_bytes
+
+EXTENSOES = ("docx", "pdf")
+SUFIXO_MANIFESTO = ".manifesto"
+
+def listar_arquivos(pasta: str) -> list:
+    """Caminhos dos .docx e .pdf de `pasta` e subpastas, em ordem; ignora os temporários do Word (~$)."""
+    caminhos = []
+    for raiz, subpastas, arquivos in os.walk(pasta):
+        subpastas.sort()
+        for nome in sorted(arquivos):
+            if not nome.startswith("~$") and extensao_de(nome) in EXTENSOES:
+                caminhos.append(os.path.join(raiz, nome))
+    return caminhos
+
+def extensao_de(caminho: str) -> str:
+    return os.path.splitext(caminho)[1][1:].lower()
+
+def sha256_arquivo(caminho: str) -> str:
+    resumo = hashlib.sha256()
+    with open(caminho, "rb") as arquivo:
+        while bloco := arquivo.read(TAMANHO_BLOCO):
+            resumo.update(bloco)
+    return resumo.hexdigest()
+
+def versao_auditoria() -> str:
+    """Muda quando as regras ou a extração mudam: o manifesto só vale para a mesma versão."""
+    return f"{impressao_regras()}-{impressao_extracao()}"
+
+def auditar_arquivo(caminho: str) -> dict:
+    """Roda no processo do pool: {"status": "OK", "tipo_documento", "erros"} ou {"status": "ERRO", "detalhe"}."""
+    try:
+        resultado = processar_minuta(processar_arquivo_bytes(caminho, extensao_de(caminho)))
+    except Exception as e:
+        return {"status": "ERRO", "detalhe": f"Erro ao auditar arquivo: {e}"}
+    return {"status": "OK", "tipo_documento": resultado["tipo_documento"], "erros": resultado["erros"]}
+
+def ler_manifesto(caminho: str, versao: str) -> set:
+    """SHA-256 dos conteúdos já auditados com esta `versao`."""
+    if not os.path.exists(caminho):
+        return set()
+    with open(caminho, encoding="utf-8") as arquivo:
+        return {sha256 for versao_linha, _, sha256 in (linha.strip().partition(" ") for linha in arquivo) if versao_linha == versao}
+
+def ler_registrados(saida: str, feitos: set) -> tuple:
+    """Do JSON Lines: o SHA-256 do último registro de cada arquivo e o resultado OK de cada conteúdo de `feitos`."""
+    registrados = {}; resultados = {}
+    if not os.path.exists(saida):
+        return registrados, resultados
+    with open(saida, encoding="utf-8") as arquivo:
+        for linha in arquivo:
+            if linha.strip():
+                registro = json.loads(linha)
+                registrados[registro["arquivo"]] = registro["sha256"]
+                if registro["status"] == "OK" and registro["sha256"] in feitos:
+                    resultados[registro["sha256"]] = {k: v for k, v in registro.items() if k not in ("arquivo", "sha256")}
+    return registrados, resultados
+
+def _gravar_registro(resultados, registro: dict, progresso):
+    resultados.write(json.dumps(registro, ensure_ascii=False) + "\n")
+    if progresso is not None:
+        progresso(registro)
+
+@contextmanager
+def _encerrar_ao_sair(pool):
+    try:
+        yield pool
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+def auditar_pasta(pasta: str, saida: str, processos: int, progresso=None) -> dict:
+    """Audita os arquivos de `pasta` ainda fora do manifesto de `saida` e acrescenta os resultados.
+
+    Arquivos com o mesmo conteúdo são auditados uma vez, com uma linha por caminho. Um arquivo
+    só entra no manifesto depois que a sua linha foi gravada, e só se a auditoria deu certo:
+    os que deram ERRO são tentados de novo na próxima execução. Um caminho novo (cópia ou
+    arquivo alterado) com um conteúdo já no manifesto não é auditado de novo, mas ganha a sua
+    linha, com o resultado já gravado daquele conteúdo. `progresso`, se informado, é chamado
+    com cada registro gravado. Devolve as contagens de arquivos auditados, pulados e com erro.
+    """
+    versao = versao_auditoria()
+    registrados, feitos = ler_registrados(saida, ler_manifesto(saida + SUFIXO_MANIFESTO, versao))
+    por_conteudo = {}
+    copiados = []
+    pulados = 0
+    for caminho in listar_arquivos(pasta):
+        sha256 = sha256_arquivo(caminho)
+        if sha256 not in feitos:
+            por_conteudo.setdefault(sha256, []).append(caminho)
+            continue
+        pulados += 1
+        if registrados.get(os.path.relpath(caminho, pasta)) != sha256:
+            copiados.append({"arquivo": os.path.relpath(caminho, pasta), "sha256": sha256, **feitos[sha256]})
+
+    contagem = {"auditados": 0, "pulados": pulados, "erros": 0}
+    if copiados:
+        with open(saida, "a", encoding="utf-8") as resultados:
+            for registro in copiados:
+                _gravar_registro(resultados, registro, progresso)
+    if not por_conteudo:
+        return contagem
+    pool = ProcessPoolExecutor(max_workers=processos, mp_context=multiprocessing.get_context("spawn"))
+    # Interrompida (Ctrl+C), a execução não espera os arquivos ainda na fila: ficam para a próxima.
+    with open(saida, "a", encoding="utf-8") as resultados, \
+            open(saida + SUFIXO_MANIFESTO, "a", encoding="utf-8") as manifesto, \
+            _encerrar_ao_sair(pool):
+        futures = {pool.submit(auditar_arquivo, caminhos[0]): sha256 for sha256, caminhos in por_conteudo.items()}
+        for future in as_completed(futures):
+            sha256 = futures[future]
+            try:
+                resultado = future.result()
+            except Exception as e:
+                resultado = {"status": "ERRO", "detalhe": f"Erro ao auditar arquivo: {e}"}
+            for caminho in por_conteudo[sha256]:
+                _gravar_registro(resultados, {"arquivo": os.path.relpath(caminho, pasta), "sha256": sha256, **resultado}, progresso)
+                contagem["auditados" if resultado["status"] == "OK" else "erros"] += 1
+            resultados.flush()
+            if resultado["status"] == "OK":
+                manifesto.write(f"{versao} {sha256}\n")
+                manifesto.flush()
+    return contagem
+
+def ler_resultados(saida: str) -> list:
+    """Registros do JSON Lines, o último de cada arquivo (uma execução repetida pode regravá-lo)."""
+    registros = {}
+    with open(saida, encoding="utf-8") as arquivo:
+        for linha in arquivo:
+            if linha.strip():
+                registro = json.loads(linha)
+                registros[registro["arquivo"]] = registro
+    return list(registros.values())
+
+def resumir_resultados(registros: list) -> tuple:
+    """DataFrames (por arquivo, por regra) com a contagem de achados FALHA e ALERTA."""
+    import pandas as pd
+
+    achados = pd.DataFrame(
+        [{"arquivo": r["arquivo"], "regra": erro["regra"], "nivel": erro["nivel"]} for r in registros for erro in r.get("erros", [])],
+        columns=["arquivo", "regra", "nivel"],
+    )
+    contagem = pd.crosstab([achados["arquivo"], achados["regra"]], achados["nivel"]).reindex(columns=["FALHA", "ALERTA"], fill_value=0)
+
+    arquivos = pd.DataFrame(
+        [{"arquivo": r["arquivo"], "status": r["status"], "tipo_documento": r.get("tipo_documento"), "detalhe": r.get("detalhe")} for r in registros],
+        columns=["arquivo", "status", "tipo_documento", "detalhe"],
+    )
+    por_arquivo = arquivos.join(contagem.groupby(level="arquivo").sum(), on="arquivo")
+    por_arquivo[["FALHA", "ALERTA"]] = por_arquivo[["FALHA", "ALERTA"]].fillna(0).astype(int)
+    por_arquivo = por_arquivo.sort_values("arquivo", ignore_index=True)
+
+    por_regra = contagem.groupby(level="regra").agg(
+        arquivos=("FALHA", "size"), FALHA=("FALHA", "sum"), ALERTA=("ALERTA", "sum"),
+    ).sort_values(["FALHA", "ALERTA"], ascending=False).reset_index()
+    return por_arquivo, por_regra
+
+def gravar_resumo(registros: list, destino: str) -> list:
+    """Grava o resumo: `destino` .xlsx (planilhas "arquivos" e "regras", requer openpyxl) ou, senão,
+    dois CSV, <destino>-arquivos.csv e <destino>-regras.csv. Devolve os caminhos gravados."""
+    por_arquivo, por_regra = resumir_resultados(registros)
+    if destino.lower().endswith(".xlsx"):
+        import pandas as pd
+
+        with pd.ExcelWriter(destino) as planilha:
+            por_arquivo.to_excel(planilha, sheet_name="arquivos", index=False)
+            por_regra.to_excel(planilha, sheet_name="regras", index=False)
+        return [destino]
+
+    base = destino[:-4] if destino.lower().endswith(".csv") else destino
+    caminhos = [f"{base}-arquivos.csv", f"{base}-regras.csv"]
+    por_arquivo.to_csv(caminhos[0], index=False)
+    por_regra.to_csv(caminhos[1], index=False)
+    return caminhos
@@ -0,0 +1,133 @@
+"""Resolução e anexos divididos em trechos nas linhas de artigo, auditados trecho a trecho e juntados.
+
+Cada linha de artigo reinicia o que as regras locais acompanham de linha em linha (incisos,
+alíneas, a linha seguinte de cada dispositivo), então elas dão, sobre os trechos, os mesmos
+achados que sobre o segmento (resolução ou anexo) inteiro: basta juntá-los na ordem. As
+regras "costuradas" comparam dispositivos de trechos diferentes (sequência de capítulos,
+seções, artigos e parágrafos, pontuação hierárquica) ou relatam os achados agrupados por
+forma (siglas, espaçamento de parágrafos): cada trecho devolve o resumo do que elas usam e
+a verificação roda uma vez, sobre os resumos de todos. As demais (cabeçalho, ementa,
+assinatura...) rodam sobre o segmento inteiro.
+
+As divisas são escolhidas pelo conteúdo da linha de artigo, não pela posição: uma edição
+só muda os trechos que toca, e os demais continuam com o mesmo texto. Com o pool, os trechos
+vão aos processos em lotes (agrupar_em_lotes).
+"""
+import os
+import re
+import zlib
+
+from core.models import normalizar_resultado
+from core.regras import anexo, estrutura
+
+# Em média, uma divisa a cada tantas linhas de artigo.
+ARTIGOS_POR_TRECHO = int(os.getenv("AUDITOR_ARTIGOS_POR_TRECHO", "8"))
+# Com o pool, os trechos a auditar vão aos processos em lotes de pelo menos este tamanho (em caracteres).
+TAMANHO_PEDACO = int(os.getenv("AUDITOR_TAMANHO_PEDACO", "50000"))
+
+# Linha de artigo como em core.dispositivos.REGEX_DISPOSITIVOS, até o fim da linha.
+REGEX_ARTIGO = re.compile(r'^[^\S\n]*Art\.[^\S\n]*\d+[^\n]*', re.MULTILINE)
+
+# Regra -> (resumir(texto do trecho), verificar(resumos de todos os trechos, na ordem)).
+COSTURAS = {
+    anexo.auditar_sequencia_capitulos_anexo: (anexo.resumir_capitulos, anexo.verificar_sequencia_capitulos),
+    anexo.auditar_sequencia_secoes_anexo: (anexo.resumir_secoes, anexo.verificar_sequencia_secoes),
+    anexo.auditar_sequencia_artigos_anexo: (anexo.resumir_artigos, anexo.verificar_sequencia_artigos),
+    anexo.auditar_sequencia_paragrafos_anexo: (anexo.resumir_paragrafos, anexo.verificar_sequencia_paragrafos),
+    anexo.auditar_pontuacao_hierarquica_anexo: (anexo.resumir_linhas_hierarquicas, anexo.verificar_pontuacao_hierarquica),
+    estrutura.auditar_uso_siglas: (estrutura.resumir_siglas, estrutura.verificar_uso_siglas),
+    estrutura.auditar_formatacao_paragrafo: (estrutura.resumir_formatacao_paragrafo, estrutura.verificar_formatacao_paragrafo),
+}
+# Regras que rodam em cada trecho e têm os achados só juntados.
+REGRAS_LOCAIS = {
+    estrutura.auditar_simbolo_ordinal,
+    estrutura.auditar_formatacao_artigos,
+    estrutura.auditar_data,
+    estrutura.auditar_pontuacao_incisos,
+    estrutura.auditar_sequencia_incisos,
+    estrutura.auditar_formatacao_alineas,
+}
+# Regras que relatam só os primeiros N achados; vale para o segmento, não para cada trecho.
+LIMITES_DE_ACHADOS = {
+    estrutura.auditar_formatacao_alineas: estrutura.MAXIMO_ACHADOS_ALINEAS,
+}
+# Detalhes OK de um trecho sem os dispositivos da regra: o segmento só fica com eles se nenhum trecho os tiver.
+SEM_DISPOSITIVOS = {estrutura.SEM_INCISOS, estrutura.SEM_ALINEAS}
+
+def dividir_em_trechos(texto: str) -> list:
+    """Inícios dos trechos de `texto`: 0 e cada linha de artigo cujo CRC-32 é múltiplo de ARTIGOS_POR_TRECHO."""
+    inicios = [0]
+    for match in REGEX_ARTIGO.finditer(texto):
+        if match.start() and zlib.crc32(match.group().encode("utf-8", "surrogatepass")) % ARTIGOS_POR_TRECHO == 0:
+            inicios.append(match.start())
+    return inicios
+
+def agrupar_em_lotes(tamanhos: list, tamanho: int = None) -> list:
+    """Índices de `tamanhos` em lotes consecutivos de pelo menos `tamanho` (TAMANHO_PEDACO), o último podendo ser menor."""
+    tamanho = tamanho or TAMANHO_PEDACO
+    lotes = []; atual = []; soma = 0
+    for indice, tamanho_trecho in enumerate(tamanhos):
+        atual.append(indice)
+        soma += tamanho_trecho
+        if soma >= tamanho:
+            lotes.append(atual)
+            atual = []; soma = 0
+    if atual:
+        lotes.append(atual)
+    return lotes
+
+def regras_locais(regras: dict) -> dict:
+    """As regras de `regras` que rodam em cada trecho."""
+    return {nome: funcao for nome, funcao in regras.items() if funcao in REGRAS_LOCAIS}
+
+def resumidores(regras: dict) -> dict:
+    """Nome -> função de resumo de cada regra costurada de `regras`."""
+    return {nome: COSTURAS[funcao][0] for nome, funcao in regras.items() if funcao in COSTURAS}
+
+def regras_globais(regras: dict) -> dict:
+    """As regras de `regras` que rodam sobre o segmento inteiro."""
+    return {nome: funcao for nome, funcao in regras.items() if funcao not in REGRAS_LOCAIS and funcao not in COSTURAS}
+
+def resumir_trecho(texto_trecho: str, regras: dict) -> dict:
+    """Nome -> resumo de cada regra costurada de `regras`, sobre um trecho."""
+    return {nome: resumir(texto_trecho) for nome, resumir in resumidores(regras).items()}
+
+def _juntar_locais(funcao, partes: list) -> tuple:
+    falhas = [(detalhes, status) for detalhes, status in partes if status != "OK"]
+    if not falhas:
+        detalhes = next((d for d, _ in partes if not (len(d) == 1 and d[0] in SEM_DISPOSITIVOS)), partes[0][0])
+        return detalhes, "OK"
+    status = "FALHA" if any(status == "FALHA" for _, status in falhas) else "ALERTA"
+    detalhes = [item for detalhes, _ in falhas for item in detalhes]
+    limite = LIMITES_DE_ACHADOS.get(funcao)
+    return (detalhes[:limite] if limite is not None else detalhes), status
+
+def _verificar_costura(funcao, resumos: list) -> tuple:
+    try:
+        status, detalhes = normalizar_resultado(COSTURAS[funcao][1](resumos))
+        if not isinstance(detalhes, list):
+            detalhes = [detalhes]
+    except Exception as e:
+        detalhes, status = [f"Erro interno na regra: {e}"], "FALHA"
+    return detalhes, status
+
+def juntar_trechos(regras: dict, trechos: list, globais: dict) -> list:
+    """(nome, detalhes, status) de cada regra sobre o segmento, na ordem de `regras`, a partir de
+    (resultados das regras locais, resumos das costuradas) de cada trecho, na ordem e com os
+    spans já relativos ao segmento, e de `globais`, nome -> (detalhes, status) das demais."""
+    locais = [{nome: (detalhes, status) for nome, detalhes, status in resultados} for resultados, _ in trechos]
+    juntados = []
+    for nome, funcao in regras.items():
+        if funcao in COSTURAS:
+            detalhes, status = _verificar_costura(funcao, [item for _, resumos in trechos for item in resumos[nome]])
+        elif funcao in REGRAS_LOCAIS:
+            partes = [resultados[nome] for resultados in locais if nome in resultados]
+            if not partes:
+                continue
+            detalhes, status = _juntar_locais(funcao, partes)
+        elif nome in globais:
+            detalhes, status = globais[nome]
+        else:
+            continue
+        juntados.append((nome, detalhes, status))
+    return juntados
@@ -0,0 +1,60 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+
+# Trecho do documento sobre o qual a regra roda.
+ESCOPO_RESOLUCAO = "resolução"
+ESCOPO_DOCUMENTO = "documento"  # texto inteiro (resolução + anexo), relatado como Resolução
+ESCOPO_ANEXO = "anexo"
+ORDEM_ESCOPOS = (ESCOPO_RESOLUCAO, ESCOPO_DOCUMENTO, ESCOPO_ANEXO)
+
+# Estimativa de custo relativo, pelo quanto do texto a regra percorre.
+CUSTO_CABECALHO = 1  # só as primeiras linhas
+CUSTO_BUSCA = 2      # uma busca que para no primeiro trecho encontrado
+CUSTO_TEXTO = 3      # o texto todo (linhas, varredura léxica, árvore de dispositivos)
+
+@dataclass(frozen=True, slots=True)
+class RegraPlanejada:
+    nome: str
+    funcao: object
+    escopo: str
+    custo: int
+    ordem: int
+
+    def descrever(self) -> dict:
+        return {
+            "ordem": self.ordem,
+            "nome": self.nome,
+            "escopo": self.escopo,
+            "custo": self.custo,
+            "funcao": f"{self.funcao.__module__}.{self.funcao.__qualname__}",
+        }
+
+@dataclass(frozen=True)
+class PlanoAuditoria:
+    """Regras de um tipo de documento, na ordem de execução, com mapas somente leitura por escopo."""
+    tipo: str
+    regras: tuple
+    resolucao: MappingProxyType
+    documento: MappingProxyType
+    anexo: MappingProxyType
+
+    def descrever(self) -> dict:
+        return {
+            "tipo": self.tipo,
+            "custo_estimado": {escopo: sum(r.custo for r in self.regras if r.escopo == escopo) for escopo in ORDEM_ESCOPOS},
+            "regras": [regra.descrever() for regra in self.regras],
+        }
+
+def compilar_plano(tipo: str, regras_por_escopo: dict, custos: dict) -> PlanoAuditoria:
+    """Monta o plano de `tipo`. `regras_por_escopo` mapeia cada escopo a um dict nome -> função,
+    executado na ordem de ORDEM_ESCOPOS e, dentro dele, na ordem do dict; `custos` mapeia
+    funções a CUSTO_* (ausentes valem CUSTO_TEXTO)."""
+    regras = []
+    for escopo in ORDEM_ESCOPOS:
+        for nome, funcao in regras_por_escopo.get(escopo, {}).items():
+            regras.append(RegraPlanejada(nome, funcao, escopo, custos.get(funcao, CUSTO_TEXTO), len(regras)))
+
+    def mapa(escopo):
+        return MappingProxyType({r.nome: r.funcao for r in regras if r.escopo == escopo})
+
+    return PlanoAuditoria(tipo, tuple(regras), mapa(ESCOPO_RESOLUCAO), mapa(ESCOPO_DOCUMENTO), mapa(ESCOPO_ANEXO))
@@ -1,13 +1,20 @@
 import re
+from core.dispositivos import analisar_dispositivos
 from core.utils import _roman_to_int
 
+# Linha de título do anexo, da segunda linha em diante. O antigo \n\s*ANEXO tentava, em cada
+# quebra de linha, consumir todas as linhas em branco seguintes: quadrático em sequências longas.
+REGEX_ANEXO_CORRETO = re.compile(r'^[^\S\n]*ANEXO[^\S\n]*$', re.MULTILINE)
+REGEX_ANEXO_INCORRETO = re.compile(r'^[^\S\n]*(ANEXO\b[^\n]*)', re.MULTILINE | re.IGNORECASE)
+
 def auditar_anexo(texto_completo):
-    match_correto = re.search(r'\n\s*(ANEXO)\s*(?=\n|$)', texto_completo)
+    segunda_linha = texto_completo.find("\n") + 1
+    match_correto = segunda_linha and REGEX_ANEXO_CORRETO.search(texto_completo, segunda_linha)
     
     if match_correto:
          return {"status": "OK", "detalhe": "Seção 'ANEXO' encontrada e formatada corretamente."}
      
-    match_incorreto = re.search(r'\n\s*(ANEXO\b.*?)\s*(?=\n|$)', texto_completo, re.IGNORECASE)
+    match_incorreto = segunda_linha and REGEX_ANEXO_INCORRETO.search(texto_completo, segunda_linha)
     
     if match_incorreto:
         palavra_encontrada = match_incorreto.group(1).strip()
@@ -21,27 +28,61 @@ def auditar_anexo(texto_completo):
         "detalhe": [f"O termo 'ANEXO' não foi encontrado no final do documento. Se esta resolução possui anexo, insira o título 'ANEXO' para a avaliação correta. Se essa resolução não possui anexo, ignore este aviso."]
     }
     
+def resumir_dispositivos(texto_completo, tipos):
+    """Dispositivos de `tipos` do trecho, na ordem, como dicts com tipo, rótulo, marcador e span.
+
+    É o que as regras de sequência usam da árvore; num anexo dividido em trechos
+    (core.pedacos), cada trecho devolve o seu resumo e a verificação roda sobre todos.
+    """
+    arvore = analisar_dispositivos(texto_completo)
+    return [
+        {"tipo": no.tipo, "rotulo": no.rotulo, "original": texto_completo[no.inicio_marcador:no.fim_marcador], "span": no.span_marcador}
+        for no in arvore.do_tipo(*tipos)
+    ]
+
+def resumir_capitulos(texto_completo):
+    return resumir_dispositivos(texto_completo, ("capitulo",))
+
+def resumir_secoes(texto_completo):
+    # O ANEXO e cada CAPÍTULO encerram as seções do capítulo anterior, como na árvore.
+    return resumir_dispositivos(texto_completo, ("anexo", "capitulo", "secao"))
+
+def resumir_artigos(texto_completo):
+    return resumir_dispositivos(texto_completo, ("artigo",))
+
+def resumir_paragrafos(texto_completo):
+    return resumir_dispositivos(texto_completo, ("artigo", "paragrafo"))
+
+def resumir_linhas_hierarquicas(texto_completo):
+    """Tipo e linha de cada artigo, parágrafo, inciso e alínea em início de linha, para a pontuação hierárquica."""
+    arvore = analisar_dispositivos(texto_completo)
+    return [
+        {"tipo": no.tipo, "linha": arvore.linha(no)[0]}
+        for no in arvore.do_tipo("artigo", "paragrafo", "paragrafo_unico", "inciso", "alinea")
+        if not no.em_linha
+    ]
+
 def auditar_sequencia_capitulos_anexo(texto_completo):
+    return verificar_sequencia_capitulos(resumir_capitulos(texto_completo))
+
+def verificar_sequencia_capitulos(capitulos):
     
     erros = []
     
-    matches = list(re.finditer(r'^\s*CAPÍTULO\s+([IVXLCDM]+)', texto_completo, re.MULTILINE))
-    
-    if not matches:
+    if not capitulos:
         return {"status": "OK", "detalhe": "Nenhum Capítulo encontrado para análise."}
     
     expected_numeral = 1
     
-    for match in matches:
-        numeral_romano = match.group(1)
-        texto_capitulo = match.group(0)
+    for no in capitulos:
+        numeral_romano = no["rotulo"]
         current_numeral = _roman_to_int(numeral_romano)
         
         if current_numeral != expected_numeral:
             erros.append({
                 "mensagem": f"Sequência de Capítulos incorreta. Esperado {expected_numeral}, encontrado '{numeral_romano}'.",
-                "original": texto_capitulo, 
-                "span": match.span(),
+                "original": no["original"], 
+                "span": no["span"],
                 "tipo": "highlight"        
             })
             expected_numeral = current_numeral
@@ -52,67 +93,70 @@ def auditar_sequencia_capitulos_anexo(texto_completo):
     return {"status": "FALHA", "detalhe": erros}
 
 def auditar_sequencia_secoes_anexo(texto_completo):
+    return verificar_sequencia_secoes(resumir_secoes(texto_completo))
+
+def verificar_sequencia_secoes(nos):
     
     erros = []
     
-    blocos_capitulo = re.split(r'^\s*CAPÍTULO\s+[IVXLCDM]+', texto_completo, flags=re.MULTILINE)
-    capitulos_encontrados = re.findall(r'^\s*CAPÍTULO\s+([IVXLCDM]+)', texto_completo, re.MULTILINE)
+    capitulo = None
     
-    for i, bloco_texto in enumerate(blocos_capitulo[1:]):
-        nome_capitulo = capitulos_encontrados[i] if i < len(capitulos_encontrados) else 'desconhecido'
-        matches = re.finditer(r'^\s*Seção\s+([IVXLCDM]+)', bloco_texto, re.MULTILINE)
+    for no in nos:
+        if no["tipo"] != "secao":
+            capitulo = no if no["tipo"] == "capitulo" else None
+            expected_numeral = 1
+            continue
+        if capitulo is None: continue
         
-        expected_numeral = 1
+        numeral_romano = no["rotulo"]
+        current_numeral = _roman_to_int(numeral_romano)
         
-        for match in matches:
-            numeral_romano = match.group(1)
-            current_numeral = _roman_to_int(numeral_romano)
-            
-            if current_numeral != expected_numeral:
-                erros.append({
-                    "mensagem": f"Sequência incorreta no CAPÍTULO {nome_capitulo}. Esperado Seção {expected_numeral}, mas encontrado '{numeral_romano}'.",
-                    "original": match.group(0).strip(),
-                    "tipo": "highlight"
-                })    
-                expected_numeral = current_numeral
-            expected_numeral += 1
+        if current_numeral != expected_numeral:
+            erros.append({
+                "mensagem": f"Sequência incorreta no CAPÍTULO {capitulo['rotulo']}. Esperado Seção {expected_numeral}, mas encontrado '{numeral_romano}'.",
+                "original": no["original"],
+                "tipo": "highlight"
+            })    
+            expected_numeral = current_numeral
+        expected_numeral += 1
             
     if not erros: return {"status": "OK", "detalhe": "Sequência das Seções correta."}
     return {"status": "FALHA", "detalhe": erros}
 
 def auditar_sequencia_artigos_anexo(texto_completo):
+    return verificar_sequencia_artigos(resumir_artigos(texto_completo))
+
+def verificar_sequencia_artigos(artigos):
     erros = []
     
-    matches = list(re.finditer(r'Art\.\s*(\d+)', texto_completo))
-    
-    if not matches: 
+    if not artigos: 
         return {"status": "OK", "detalhe": "Nenhum Artigo encontrado no Anexo para análise de sequência."}
     
     expected_num = 1
-    primeiro_match = matches[0]
-    primeiro_numero = int(primeiro_match.group(1))
+    primeiro = artigos[0]
+    primeiro_numero = int(primeiro["rotulo"])
     
     if primeiro_numero != 1:    
         erros.append({
             "mensagem": f"O primeiro Artigo do Anexo não é 'Art. 1ᵒ'. Encontrado: 'Art. {primeiro_numero}'.",
-            "original": primeiro_match.group(0),
-            "span": primeiro_match.span(),
+            "original": primeiro["original"],
+            "span": primeiro["span"],
             "tipo": "highlight"
         })
         expected_num = primeiro_numero
     
-    for i in range(len(matches)):
-        match = matches[i]
-        num = int(match.group(1))
-        texto_artigo = match.group(0)
+    for i in range(len(artigos)):
+        no = artigos[i]
+        num = int(no["rotulo"])
+        texto_artigo = no["original"]
         
         if num != expected_num:
-            proximo_match = matches[i+1] if i + 1 < len(matches) else None
+            proximo = artigos[i+1] if i + 1 < len(artigos) else None
             
             eh_erro_isolado = True
             
-            if proximo_match:
-                prox_num_real = int(proximo_match.group(1))
+            if proximo:
+                prox_num_real = int(proximo["rotulo"])
                 
                 if prox_num_real == num + 1:
                     eh_erro_isolado = False
@@ -121,7 +165,7 @@ def auditar_sequencia_artigos_anexo(texto_completo):
                 erros.append({
                     "mensagem": f"Numeração fora de sequência. Esperado 'Art. {expected_num}', mas encontrado 'Art. {num}'.",
                     "original": texto_artigo,
-                    "span": match.span(),
+                    "span": no["span"],
                     "tipo": "highlight"
                 })
             
@@ -129,7 +173,7 @@ def auditar_sequencia_artigos_anexo(texto_completo):
                 erros.append({
                     "mensagem": f"Salto na numeração detectado. Esperado 'Art. {expected_num}', mas encontrado 'Art. {num}'.",
                     "original": texto_artigo,
-                    "span": match.span(),
+                    "span": no["span"],
                     "tipo": "highlight"
                 })
                 expected_num = num
@@ -142,66 +186,57 @@ def auditar_sequencia_artigos_anexo(texto_completo):
     return {"status": "FALHA", "detalhe": erros}
 
 def auditar_sequencia_paragrafos_anexo(texto_completo):
+    return verificar_sequencia_paragrafos(resumir_paragrafos(texto_completo))
+
+def verificar_sequencia_paragrafos(nos):
     
     erros = []
     
-    regex_combinado = r'(?P<artigo>^\s*Art\.\s*\d+)|(?P<paragrafo>^\s*§\s*(?P<num>\d+))'
-    
-    matches = list(re.finditer(regex_combinado, texto_completo, re.MULTILINE | re.IGNORECASE))
-    
-    if not matches:
+    if not any(no["tipo"] == "paragrafo" for no in nos):
          return {"status": "OK", "detalhe": "Nenhum parágrafo numerado (§) encontrado para análise."}
 
     expected_num = 1
     
-    for i in range(len(matches)):
-        match = matches[i]
+    for i in range(len(nos)):
+        no = nos[i]
         
-        if match.group('artigo'):
+        if no["tipo"] == "artigo":
             expected_num = 1
             continue
             
-        if match.group('paragrafo'):
-            num = int(match.group('num'))
-            texto_par = match.group('paragrafo').strip()
+        num = int(no["rotulo"])
+        texto_par = no["original"]
+        
+        if num != expected_num:
             
-            if num != expected_num:
-                
-                proximo_match_par = None
-                
-                for j in range(i + 1, len(matches)):
-                    m_futuro = matches[j]
-                    if m_futuro.group('artigo'): 
-                        break
-                    if m_futuro.group('paragrafo'):
-                        proximo_match_par = m_futuro
-                        break
-                
-                eh_erro_isolado = True
-                
-                if proximo_match_par:
-                    prox_num_real = int(proximo_match_par.group('num'))
-                    if prox_num_real == num + 1:
-                        eh_erro_isolado = False
-                
-                if eh_erro_isolado:
-                     erros.append({
-                        "mensagem": f"Numeração de parágrafo fora de sequência. Esperado '§ {expected_num}', mas encontrado '§ {num}'.",
-                        "original": texto_par,
-                        "span": match.span(),
-                        "tipo": "highlight"
-                    })
-                     
-                else:
-                    erros.append({
-                        "mensagem": f"Salto na numeração de parágrafos. Esperado '§ {expected_num}', mas encontrado '§ {num}'.",
-                        "original": texto_par,
-                        "span": match.span(),
-                        "tipo": "highlight"
-                    })
-                    expected_num = num
+            proximo = nos[i + 1] if i + 1 < len(nos) else None
+            proximo_par = proximo if proximo and proximo["tipo"] == "paragrafo" else None
             
-            expected_num += 1
+            eh_erro_isolado = True
+            
+            if proximo_par:
+                prox_num_real = int(proximo_par["rotulo"])
+                if prox_num_real == num + 1:
+                    eh_erro_isolado = False
+            
+            if eh_erro_isolado:
+                 erros.append({
+                    "mensagem": f"Numeração de parágrafo fora de sequência. Esperado '§ {expected_num}', mas encontrado '§ {num}'.",
+                    "original": texto_par,
+                    "span": no["span"],
+                    "tipo": "highlight"
+                })
+                 
+            else:
+                erros.append({
+                    "mensagem": f"Salto na numeração de parágrafos. Esperado '§ {expected_num}', mas encontrado '§ {num}'.",
+                    "original": texto_par,
+                    "span": no["span"],
+                    "tipo": "highlight"
+                })
+                expected_num = num
+        
+        expected_num += 1
 
     if not erros:
         return {"status": "OK", "detalhe": "Sequência de parágrafos correta."}
@@ -209,30 +244,26 @@ def auditar_sequencia_paragrafos_anexo(texto_completo):
     return {"status": "FALHA", "detalhe": erros}
 
 def auditar_pontuacao_hierarquica_anexo(texto_completo):
+    return verificar_pontuacao_hierarquica(resumir_linhas_hierarquicas(texto_completo))
+
+def verificar_pontuacao_hierarquica(nos):
     
     erros = []
     
-    padrao_itens = re.compile(r"^(?:[ \t]*)((Art\.\s*\d+[ᵒ\.]?|Parágrafo\s+único\.?|§\s*\d+[ᵒ\.]?)|([IVXLCDM]+[\s\-–—])|([a-z]\)))(.*)", re.MULTILINE | re.IGNORECASE)
-    matches = list(re.finditer(padrao_itens, texto_completo))
-    
-    for i, match in enumerate(matches):
-        linha_completa = match.group(0).strip()
-        marcador_item = match.group(1).strip()
+    for i, no in enumerate(nos):
+        linha_completa = no["linha"]
         
-        if re.match(r'^CAPÍTULO', linha_completa, re.I) or re.match(r'^Seção', linha_completa, re.I): continue
-            
         tipo_atual = None
-        if re.match(r'Art\.|Parágrafo|§', marcador_item, re.I): tipo_atual = "Artigo/Paragrafo"
-        elif re.match(r'^[IVXLCDM]+', marcador_item): tipo_atual = "Inciso"
-        elif re.match(r'^[a-z]\)', marcador_item): tipo_atual = "Alinea"
+        if no["tipo"] in ("artigo", "paragrafo", "paragrafo_unico"): tipo_atual = "Artigo/Paragrafo"
+        elif no["tipo"] == "inciso": tipo_atual = "Inciso"
+        elif no["tipo"] == "alinea": tipo_atual = "Alinea"
 
-        proximo_match = matches[i + 1] if (i + 1) < len(matches) else None
+        proximo = nos[i + 1] if (i + 1) < len(nos) else None
         inicia_subdivisao = False
         
-        if proximo_match:
-            m_prox = proximo_match.group(1).strip()
-            proximo_eh_inciso = bool(re.match(r'^[IVXLCDM]+', m_prox))
-            proximo_eh_alinea = bool(re.match(r'^[a-z]\)', m_prox))
+        if proximo:
+            proximo_eh_inciso = proximo["tipo"] == "inciso"
+            proximo_eh_alinea = proximo["tipo"] == "alinea"
             if tipo_atual == "Artigo/Paragrafo" and proximo_eh_inciso: inicia_subdivisao = True
             elif tipo_atual == "Inciso" and proximo_eh_alinea: inicia_subdivisao = True
         
@@ -251,4 +282,4 @@ def auditar_pontuacao_hierarquica_anexo(texto_completo):
             })
 
     if not erros: return {"status": "OK", "detalhe": "Pontuação hierárquica correta."}
-    return {"status": "FALHA", "detalhe": erros[:50]}
\ No newline at end of file
+    return {"status": "FALHA", "detalhe": erros[:50]}
@@ -1,24 +1,76 @@
 import re
+from functools import lru_cache
+from core.dispositivos import analisar_dispositivos
+from core.linhas import indice_linhas
 from core.utils import _roman_to_int
 
 REGEX_ARTIGOS = re.compile(r'^(\s*)Art\.\s*(\d+)([\. \tº°ᵒ]*)', re.MULTILINE)
 REGEX_PARAGRAFO_NUM = re.compile(r'^(\s*)§\s+(\d+)([\. \tº°ᵒ]*)', re.MULTILINE)
 REGEX_PARAGRAFO_UNICO = re.compile(r'^(\s*)Parágrafo\s+único\.([ \t]*)', re.MULTILINE | re.IGNORECASE)
-REGEX_DATA = re.compile(r"\b0[1-9]\s+de\s+(janeiro|fevereiro|março|abril|maio|junho|julho|agosto|setembro|outubro|novembro|dezembro)", re.IGNORECASE)
-REGEX_SIGLA_PARENTESES = re.compile(r"(\()([A-Z]{3,})(\))")
-REGEX_SIGLA_HIFEN = re.compile(r"(\s+-\s*)([A-Z]{3,})\b")
-REGEX_PONTUACAO_INCISOS = re.compile(r'(^[ \t]*[IVXLCDM]+\s*[\-–—].*?)(?=\n\s*(?:[IVXLCDM]+\s*[\-–—]|Art\.|§|CAPÍTULO|Seção|Parágrafo|ANEXO)|$)', re.MULTILINE | re.DOTALL)
-REGEX_SEQUENCIA_INCISOS = re.compile(r'(?:^|[\n\r;])\s*([IVXLCDM]+\s*[\-–—])', re.MULTILINE)
-REGEX_ALINEAS = re.compile(r'(^\s*[a-z]\).*?)(?=\n\s*(?:[a-z]\)|[IVXLCDM]+\s*[\-–—]|Art\.|§|CAPÍTULO)|$)', re.MULTILINE | re.DOTALL)
-REGEX_ORDINAL = re.compile(r'(\S*[°ᵒ]\S*)')
+REGEX_SEPARADOR_ALINEAS = re.compile(r'Art\.|§|[IVXLCDM]')
+REGEX_NAO_ESPACOS = re.compile(r'\S*')
+REGEX_INICIO_INCISO = re.compile(r'[IVXLCDM]+\s*[\-–—]')
+REGEX_INICIO_ALINEA = re.compile(r'[a-z]\)')
+REGEX_FIM_INCISO_INTERMEDIARIO = re.compile(r';(\s*(e|ou))?$', re.IGNORECASE)
+
+# Datas, siglas e símbolos ordinais são localizados por uma única varredura.
+# Cada alternativa começa por um caractere que nenhuma outra pode consumir
+# ('0', '(', espaço, '°'/'ᵒ'), então o resultado por regra é o mesmo de um
+# finditer separado. O lookahead inicial descarta as demais posições sem testar
+# cada alternativa. O ordinal marca apenas o símbolo: o trecho destacado
+# (a sequência de caracteres sem espaço que o contém) é expandido depois.
+# A sigla com hífen só é tentada no início de cada sequência de espaços; sem
+# isso, um bloco de linhas em branco custaria tempo quadrático.
+REGEX_LEXICO = re.compile(
+    r"(?=[0(\s°ᵒ])(?:"
+    r"(?P<data>(?i:\b0[1-9]\s+de\s+(?:janeiro|fevereiro|março|abril|maio|junho|julho|agosto|setembro|outubro|novembro|dezembro)))"
+    r"|(?P<sigla_parenteses>\((?P<sigla_p>[A-Z]{3,})\))"
+    r"|(?P<sigla_hifen>(?<!\s)\s+-\s*(?P<sigla_h>[A-Z]{3,})\b)"
+    r"|(?P<ordinal>[°ᵒ]+)"
+    r")"
+)
+
+LIMITES_INCISOS = {"anexo", "capitulo", "secao", "artigo", "paragrafo", "paragrafo_unico"}
+# Detalhe das regras de incisos e alíneas num trecho sem nenhum deles.
+SEM_INCISOS = "Nenhum inciso."
+SEM_ALINEAS = "Nenhuma alínea."
+# Máximo de achados relatados pela regra de alíneas.
+MAXIMO_ACHADOS_ALINEAS = 50
+
+@lru_cache(maxsize=8)
+def varrer_lexico(texto_completo):
+    """Percorre o texto uma vez e separa as ocorrências por regra, como (span, trecho, sigla)."""
+    ocorrencias = {"data": [], "sigla_parenteses": [], "sigla_hifen": [], "ordinal": []}
+    fim_ordinal = 0
+    
+    for match in REGEX_LEXICO.finditer(texto_completo):
+        tipo = match.lastgroup
+        
+        if tipo == "ordinal":
+            inicio = match.start()
+            if inicio < fim_ordinal: continue
+            
+            while inicio > 0 and not texto_completo[inicio - 1].isspace():
+                inicio -= 1
+            fim_ordinal = REGEX_NAO_ESPACOS.match(texto_completo, match.end()).end()
+            
+            ocorrencias["ordinal"].append(((inicio, fim_ordinal), texto_completo[inicio:fim_ordinal], None))
+        elif tipo == "data":
+            ocorrencias["data"].append((match.span(), match.group(0), None))
+        else:
+            sigla = match.group("sigla_p" if tipo == "sigla_parenteses" else "sigla_h")
+            ocorrencias[tipo].append((match.span(), match.group(0), sigla))
+    
+    return ocorrencias
 
 def auditar_formatacao_artigos(texto_completo):
     
     erros = []
     
-    matches = list(REGEX_ARTIGOS.finditer(texto_completo))
+    arvore = analisar_dispositivos(texto_completo)
     
-    for match in matches:
+    for no in arvore.do_tipo("artigo"):
+        match = REGEX_ARTIGOS.match(texto_completo, no.inicio)
         indentacao = match.group(1) 
         numero = int(match.group(2))
         sujeira = match.group(3)
@@ -66,10 +118,20 @@ def auditar_formatacao_artigos(texto_completo):
 
 
 def auditar_formatacao_paragrafo(texto_completo):
+    return verificar_formatacao_paragrafo(resumir_formatacao_paragrafo(texto_completo))
+
+def resumir_formatacao_paragrafo(texto_completo):
+    """Achados de cada § e Parágrafo único do trecho, marcados com o tipo ("forma") para
+    verificar_formatacao_paragrafo relatá-los como o texto inteiro: os § antes dos únicos."""
     
     erros = []
     
-    for match in REGEX_PARAGRAFO_NUM.finditer(texto_completo):
+    arvore = analisar_dispositivos(texto_completo)
+    
+    for no in arvore.do_tipo("paragrafo"):
+        match = REGEX_PARAGRAFO_NUM.match(texto_completo, no.inicio)
+        if not match: continue
+        
         indentacao = match.group(1)
         numero = int(match.group(2))
         sujeira = match.group(3)
@@ -110,10 +172,14 @@ def auditar_formatacao_paragrafo(texto_completo):
                 "original": texto_capturado,
                 "sugestao": correcao,
                 "span": match.span(), 
-                "tipo": "fixable"
+                "tipo": "fixable",
+                "forma": no.tipo
             })    
     
-    for match in REGEX_PARAGRAFO_UNICO.finditer(texto_completo):
+    for no in arvore.do_tipo("paragrafo_unico"):
+        match = REGEX_PARAGRAFO_UNICO.match(texto_completo, no.inicio)
+        if not match: continue
+        
         indentacao = match.group(1)
         espacos_pos = match.group(2)
         texto_capturado = match.group(0)
@@ -124,21 +190,29 @@ def auditar_formatacao_paragrafo(texto_completo):
                 "original": texto_capturado,
                 "sugestao": f"{indentacao}Parágrafo único.  ",
                 "span": match.span(),
-                "tipo": "fixable"
+                "tipo": "fixable",
+                "forma": no.tipo
             })
 
+    return erros
+
+def verificar_formatacao_paragrafo(achados):
+    erros = [
+        {campo: valor for campo, valor in achado.items() if campo != "forma"}
+        for forma in ("paragrafo", "paragrafo_unico") for achado in achados if achado["forma"] == forma
+    ]
+
     if not erros: return {"status": "OK", "detalhe": "Parágrafos corretos."}
     return {"status": "FALHA", "detalhe": erros}
 
 def auditar_data(texto_completo):
     erros = []
     
-    for match in REGEX_DATA.finditer(texto_completo):
-        texto_errado = match.group(0)
+    for span, texto_errado, _ in varrer_lexico(texto_completo)["data"]:
         erros.append({
             "mensagem": "Não se deve usar zero à esquerda em datas por extenso.",
             "original": texto_errado,
-            "span": match.span(),
+            "span": span,
             "tipo": "highlight"
         })
 
@@ -147,32 +221,44 @@ def auditar_data(texto_completo):
     return {"status": "OK", "detalhe": "Datas corretas."}
 
 def auditar_uso_siglas(texto_completo):
+    return verificar_uso_siglas(resumir_siglas(texto_completo))
+
+def resumir_siglas(texto_completo):
+    """Siglas definidas no trecho, como dicts com forma ("sigla_parenteses", "sigla_hifen"),
+    sigla, trecho e span, para verificar_uso_siglas."""
+    ocorrencias = varrer_lexico(texto_completo)
+    return [
+        {"forma": forma, "sigla": sigla, "original": original, "span": span}
+        for forma in ("sigla_parenteses", "sigla_hifen") for span, original, sigla in ocorrencias[forma]
+    ]
+
+def verificar_uso_siglas(siglas):
     
     erros = []
     
-    for match in REGEX_SIGLA_PARENTESES.finditer(texto_completo):
-        sigla = match.group(2)
+    for ocorrencia in siglas:
+        sigla, original, span = ocorrencia["sigla"], ocorrencia["original"], ocorrencia["span"]
         
-        if re.fullmatch(r"[IVXLCDM]+", sigla): 
+        if ocorrencia["forma"] != "sigla_parenteses" or re.fullmatch(r"[IVXLCDM]+", sigla): 
             continue
 
         erros.append({
             "mensagem": f"Definição de sigla ({sigla}): use travessão (— {sigla}) em vez de parênteses.",
-            "original": match.group(0),
-            "span": match.span(),
+            "original": original,
+            "span": span,
             "tipo": "highlight"
         })
     
-    for match in REGEX_SIGLA_HIFEN.finditer(texto_completo):
-        sigla = match.group(2)
+    for ocorrencia in siglas:
+        sigla, original, span = ocorrencia["sigla"], ocorrencia["original"], ocorrencia["span"]
         
-        if re.fullmatch(r"[IVXLCDM]+", sigla): 
+        if ocorrencia["forma"] != "sigla_hifen" or re.fullmatch(r"[IVXLCDM]+", sigla): 
             continue
 
         erros.append({
             "mensagem": f"Separação de sigla ({sigla}): use travessão (—) em vez de hífen (-).",
-            "original": match.group(0),
-            "span": match.span(),
+            "original": original,
+            "span": span,
             "tipo": "highlight"
         })
 
@@ -185,26 +271,19 @@ def auditar_pontuacao_incisos(texto_completo):
     
     erros = []
     
-    matches = list(REGEX_PONTUACAO_INCISOS.finditer(texto_completo))
+    arvore = analisar_dispositivos(texto_completo)
+    indice = indice_linhas(texto_completo)
+    incisos = [no for no in arvore.do_tipo("inciso") if not no.em_linha]
     
-    if not matches: return {"status": "OK", "detalhe": "Nenhum inciso."}
+    if not incisos: return {"status": "OK", "detalhe": SEM_INCISOS}
     
-    for match in matches:
-        raw_text = match.group(1)
-        texto = raw_text.strip()
-        numeral = re.match(r'^\s*([IVXLCDM]+)', texto).group(1)
-        
-        offset_inicio = raw_text.find(texto)
-        if offset_inicio == -1: offset_inicio = 0
-        start_index = match.start(1) + offset_inicio
-        span_justo = (start_index, start_index + len(texto))
-        
-        pos_fim = match.end()
-        prox = texto_completo[pos_fim:pos_fim+200].lstrip()
-        is_last = True
+    for no in incisos:
+        texto, span_justo = arvore.linha(no)
+        numeral = no.rotulo
         
-        if re.match(r'[IVXLCDM]+\s*[\-–—]', prox): is_last = False
-        elif re.match(r'(Art\.|§|CAPÍTULO|Seção|Parágrafo|ANEXO)', prox) or not prox: is_last = True
+        # Só outro inciso na próxima linha não vazia torna este intermediário.
+        prox = indice.conteudo_apos_linha(no.linha)
+        is_last = not REGEX_INICIO_INCISO.match(texto_completo, prox)
         
         if texto.endswith(':'): continue
 
@@ -217,7 +296,7 @@ def auditar_pontuacao_incisos(texto_completo):
                     "tipo": "highlight"
                 })
         else:
-            if not re.search(r';(\s*(e|ou))?$', texto, re.IGNORECASE):
+            if not REGEX_FIM_INCISO_INTERMEDIARIO.search(texto):
                 erros.append({
                     "mensagem": f"Inciso intermediário ({numeral}) deve terminar com ponto e vírgula (;).",
                     "original": texto,
@@ -232,45 +311,40 @@ def auditar_sequencia_incisos(texto_completo):
 
     erros = []
     
-    matches = list(REGEX_SEQUENCIA_INCISOS.finditer(texto_completo))
+    arvore = analisar_dispositivos(texto_completo)
     
-    if not matches: return {"status": "OK", "detalhe": "Nenhum inciso."}
+    # Cada inciso vem acompanhado de um indicador de que um novo bloco
+    # (Art., §, Capítulo, Seção ou Anexo) começou desde o inciso anterior.
+    incisos = []
+    novo_bloco = False
+    for no in arvore.nos:
+        if no.tipo == "inciso":
+            incisos.append((no, novo_bloco))
+            novo_bloco = False
+        elif no.tipo in LIMITES_INCISOS:
+            novo_bloco = True
+    
+    if not incisos: return {"status": "OK", "detalhe": SEM_INCISOS}
     
     expected = 1
     
-    for i, match in enumerate(matches):
-        raw_text = match.group(1)
-        texto_limpo = raw_text.strip().replace('-', '').replace('–', '').replace('—', '').strip()
-        
-        try:
-            val = _roman_to_int(texto_limpo)
-        except:
-            continue
+    for i, (no, novo_bloco) in enumerate(incisos):
+        texto_limpo = no.rotulo
+        val = _roman_to_int(texto_limpo)
 
-        if i > 0:
-            gap = texto_completo[matches[i-1].end() : match.start()]
-            
-            if re.search(r'(?:^|[\n\r])\s*(?:Art\.|§|CAPÍTULO|Seção|ANEXO|Parágrafo)', gap, re.IGNORECASE):
-                expected = 1
+        if i > 0 and novo_bloco:
+            expected = 1
 
-        start_index = match.start(1)
-        span_justo = (start_index, start_index + len(raw_text))
+        span_justo = no.span_marcador
 
         if val == expected:
             expected += 1
         else:
             is_typo = False
-            if i + 1 < len(matches):
-                prox_raw = matches[i+1].group(1).strip().replace('-', '').replace('–', '').replace('—', '').strip()
-                
-                gap_prox = texto_completo[match.end() : matches[i+1].start()]
-                if not re.search(r'(?:^|[\n\r])\s*(?:Art\.|§|CAPÍTULO|Seção|ANEXO)', gap_prox, re.IGNORECASE):
-                    try:
-                        prox_val = _roman_to_int(prox_raw)
-                        if prox_val == expected + 1:
-                            is_typo = True
-                    except:
-                        pass
+            if i + 1 < len(incisos):
+                prox, prox_novo_bloco = incisos[i+1]
+                if not prox_novo_bloco and _roman_to_int(prox.rotulo) == expected + 1:
+                    is_typo = True
 
             erros.append({
                 "mensagem": f"Sequência incorreta. Esperado '{expected}', achou '{val}'.",
@@ -291,29 +365,23 @@ def auditar_formatacao_alineas(texto_completo):
 
     erros = []
     
-    matches = list(REGEX_ALINEAS.finditer(texto_completo))
+    arvore = analisar_dispositivos(texto_completo)
+    indice = indice_linhas(texto_completo)
+    alineas = arvore.do_tipo("alinea")
     
-    if not matches: return {"status": "OK", "detalhe": "Nenhuma alínea."}
+    if not alineas: return {"status": "OK", "detalhe": SEM_ALINEAS}
     
-    for i, match in enumerate(matches):
-        raw_text = match.group(1)
-        texto = raw_text.strip()
-        
-        offset_inicio = raw_text.find(texto)
-        if offset_inicio == -1: offset_inicio = 0
-        
-        start_index = match.start(1) + offset_inicio
-        end_index = start_index + len(texto)
-        span_justo = (start_index, end_index)
+    for i, no in enumerate(alineas):
+        texto, span_justo = arvore.linha(no)
 
-        letra = texto[0]
+        letra = no.rotulo
         trecho_contexto = texto[:60] + "..." 
         ord_letra = ord(letra)
         
         if letra != 'a' and i > 0:
-            prev = matches[i-1].group(1).strip()
-            gap = texto_completo[matches[i-1].end():match.start()]
-            if not re.search(r'(Art\.|§|[IVXLCDM])', gap) and ord_letra != ord(prev[0]) + 1:
+            anterior = alineas[i-1]
+            separada = REGEX_SEPARADOR_ALINEAS.search(texto_completo, anterior.fim_linha, no.inicio)
+            if not separada and ord_letra != ord(anterior.rotulo) + 1:
                  erros.append({
                     "mensagem": f"Sequência alíneas incorreta. Achou '{letra})'. Trecho: '{trecho_contexto}'",
                     "original": texto,
@@ -321,15 +389,10 @@ def auditar_formatacao_alineas(texto_completo):
                     "tipo": "highlight"
                  })
         
-        pos_fim = match.end()
-        prox = texto_completo[pos_fim:pos_fim+200].lstrip()
-        is_final = False
-        is_middle = False
-        
-        if re.match(r'[a-z]\)', prox): is_middle = True
-        elif re.match(r'[IVXLCDM]+\s*[\-–—]', prox): is_middle = True
-        elif re.match(r'(Art\.|§|CAPÍTULO|Seção|ANEXO)', prox) or not prox: is_final = True
-        else: is_final = True
+        # Alínea ou inciso na próxima linha não vazia tornam esta intermediária.
+        prox = indice.conteudo_apos_linha(no.linha)
+        is_middle = bool(REGEX_INICIO_ALINEA.match(texto_completo, prox) or REGEX_INICIO_INCISO.match(texto_completo, prox))
+        is_final = not is_middle
         
         if is_final:
             if not texto.endswith('.'):
@@ -349,20 +412,17 @@ def auditar_formatacao_alineas(texto_completo):
                 })
 
     if not erros: return {"status": "OK", "detalhe": "Alíneas corretas."}
-    return {"status": "FALHA", "detalhe": erros[:50]}
+    return {"status": "FALHA", "detalhe": erros[:MAXIMO_ACHADOS_ALINEAS]}
 
 def auditar_simbolo_ordinal(texto_completo):
     erros = []
     
-    matches = list(REGEX_ORDINAL.finditer(texto_completo))
-    
-    for match in matches:
-        texto_errado = match.group(1)
+    for span, texto_errado, _ in varrer_lexico(texto_completo)["ordinal"]:
         
         erros.append({
             "mensagem": "Símbolo de pontuação incorreto. Utilize o indicador ordinal (º) ao invés do símbolo de grau (°) ou letra (ᵒ).",
             "original": texto_errado,
-            "span": match.span(1),
+            "span": span,
             "tipo": "highlight"
         })
 
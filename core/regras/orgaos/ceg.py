@@ -1,9 +1,10 @@
 import re
+from core.linhas import indice_linhas
 from core.regras import resolucao
 from core.utils import limpar_para_validar, is_totalmente_maiusculo
 
 def auditar_cabecalho_ceg(texto_completo):
-    linhas = [l.strip() for l in texto_completo.strip().split('\n') if l.strip()]
+    linhas = indice_linhas(texto_completo).primeiras_linhas(2)
     
     if len(linhas) < 2:
         return {"status": "FALHA", "detalhe": ["Cabeçalho incompleto. Esperado: Ministério e Comitê."]}
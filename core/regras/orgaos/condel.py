@@ -1,10 +1,11 @@
 import re
+from core.linhas import indice_linhas
 from core.regras import resolucao
 from core.utils import limpar_para_validar, is_totalmente_maiusculo
 
 def auditar_cabecalho_condel(texto_completo):
     
-    linhas = [l.strip() for l in texto_completo.strip().split('\n') if l.strip()]
+    linhas = indice_linhas(texto_completo).primeiras_linhas(3)
     
     if len(linhas) < 3: 
         return {"status": "FALHA", "detalhe": ["Cabeçalho incompleto."]}
@@ -1,21 +1,23 @@
+import itertools
 import re
+from core.linhas import indice_linhas
 
 # --- COMPILAÇÃO GLOBAL DE EXPRESSÕES REGULARES ---
 REGEX_EMENTA_IGNORAR = re.compile(r'^(MINISTÉRIO|SUPERINTENDÊNCIA|CONSELHO|MINUTA|RESOLUÇÃO|PORTARIA|DECRETO|ATO)', re.IGNORECASE)
 REGEX_EMENTA_PARADA = re.compile(r'^(O PRESIDENTE|A DIRETORIA|Art\.|Artigo)', re.IGNORECASE)
 REGEX_FECHO_PREAMBULO = re.compile(r"(?:o\s+colegiado\s+)?resolveu?\s*:", re.IGNORECASE)
 REGEX_VERBO_ART1 = re.compile(r'^\s*Art\.\s*1[º°ᵒ\.]\s+([A-Za-zÇçÁ-Úá-ú]+)', re.MULTILINE)
-REGEX_ANEXO_ASSINATURA = re.compile(r'\n\s*ANEXO', re.IGNORECASE)
+REGEX_ANEXO_ASSINATURA = re.compile(r'^[^\S\n]*ANEXO', re.IGNORECASE | re.MULTILINE)
 
 def auditar_cabecalho(texto_completo):
     
     padrao_base = "MINISTÉRIO DA INTEGRAÇÃO E DO DESENVOLVIMENTO REGIONAL"
-    primeiras_linhas = texto_completo.strip().split('\n')
+    primeiras_linhas = indice_linhas(texto_completo).primeiras_linhas(1)
     
     if not primeiras_linhas: 
         return {"status": "FALHA", "detalhe": ["Documento vazio."]}
     
-    linha1 = primeiras_linhas[0].strip()
+    linha1 = primeiras_linhas[0]
     
     if padrao_base in linha1.upper():
         return {"status": "OK", "detalhe": "Cabeçalho CEG correto."}
@@ -51,34 +53,28 @@ def auditar_epigrafe(texto_completo, regex_compilado, msgs_erro_personalizadas=N
     return {"status": "OK", "detalhe": "Epígrafe correta."}
 
 def auditar_ementa(texto):
-    linhas = texto.split('\n')
+    indice = indice_linhas(texto)
     
     match_ementa = None
     
-    for i, linha in enumerate(linhas):
-        linha_limpa = linha.strip()
-        if not linha_limpa: continue
+    for _, linha_limpa, inicio in indice.linhas_com_conteudo():
 
         if REGEX_EMENTA_IGNORAR.match(linha_limpa):
             continue
         
-        letras = [c for c in linha_limpa if c.isalpha()]
-        if letras and all(c.isupper() for c in letras):
+        if linha_limpa.isupper():
             continue
 
         if REGEX_EMENTA_PARADA.match(linha_limpa):
             break
 
-        match_regex = re.search(re.escape(linha_limpa), texto)
-        if match_regex:
-            match_ementa = match_regex
-            break
+        match_ementa = (linha_limpa, (inicio, inicio + len(linha_limpa)))
+        break
     
     if not match_ementa:
         return {"status": "ALERTA", "detalhe": "Ementa não localizada."}
     
-    texto_ementa = match_ementa.group(0)
-    span_ementa = match_ementa.span()
+    texto_ementa, span_ementa = match_ementa
     primeira_palavra = texto_ementa.split(' ')[0]
     verbo_limpo = re.sub(r'[^\w]', '', primeira_palavra)
     verbos_aceitos = ["Aprova", "Institui", "Altera", "Dispõe", "Estabelece", "Cria", "Homologa", "Define", "Torna"]
@@ -169,14 +165,16 @@ def auditar_fecho_vigencia(texto_completo):
 
 def auditar_assinatura(texto_completo):
    
-    match_anexo = REGEX_ANEXO_ASSINATURA.search(texto_completo)
+    indice = indice_linhas(texto_completo)
+    
+    # O anexo só conta a partir da segunda linha, como no separador usado em processar_minuta.
+    match_anexo = REGEX_ANEXO_ASSINATURA.search(texto_completo, indice.inicios[1]) if len(indice) > 1 else None
     
-    texto = texto_completo[:match_anexo.start()] if match_anexo else texto_completo
+    ate = indice.linha_de(match_anexo.start()) if match_anexo else len(indice)
     
-    linhas = [l.strip() for l in texto.strip().split('\n') if l.strip()]
+    ultimas = [linha for _, linha, _ in itertools.islice(indice.linhas_com_conteudo(ate=ate, reverso=True), 3)]
     
-    if linhas:
-        ultimas = linhas[-3:]
+    if ultimas:
         if not any(l.isupper() and len(l) > 5 and " " in l and not l.startswith("Art") for l in ultimas):
              return {"status": "FALHA", "detalhe": ["Bloco de assinatura não encontrado (Nome Maiúsculo)."]}
-    return {"status": "OK", "detalhe": "Assinatura correta."}
\ No newline at end of file
+    return {"status": "OK", "detalhe": "Assinatura correta."}
@@ -0,0 +1,130 @@
+import multiprocessing
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Tempo máximo, em segundos, de cada regra e da auditoria inteira (0: sem limite).
+TEMPO_REGRA = float(os.getenv("AUDITOR_TEMPO_REGRA", "0"))
+TEMPO_AUDITORIA = float(os.getenv("AUDITOR_TEMPO_AUDITORIA", "0"))
+# Com algum dos limites, as regras rodam num processo filho, que é morto se passar do tempo.
+ATIVA = TEMPO_REGRA > 0 or TEMPO_AUDITORIA > 0
+# Espera pela partida de um processo novo (importação das regras), fora dos limites acima.
+TEMPO_PARTIDA = 60.0
+
+MENSAGEM_TEMPO_EXCEDIDO = "Tempo excedido"
+
+_livres = []
+_trava = threading.Lock()
+
+class TempoExcedido(Exception):
+    """A regra passou do limite e foi interrompida, ou nem rodou porque a auditoria já tinha passado do seu."""
+
+class ErroNaRegra(Exception):
+    """Exceção da regra no processo filho, trazida só com a mensagem."""
+
+def prazo_da_auditoria():
+    """Instante (time.perf_counter) em que a auditoria iniciada agora passa de TEMPO_AUDITORIA, ou None."""
+    return time.perf_counter() + TEMPO_AUDITORIA if TEMPO_AUDITORIA > 0 else None
+
+def limite_da_regra(prazo=None):
+    """Segundos que a próxima regra pode levar: TEMPO_REGRA, limitado pelo que resta até `prazo`."""
+    limites = [TEMPO_REGRA] if TEMPO_REGRA > 0 else []
+    if prazo is not None:
+        restante = prazo - time.perf_counter()
+        if restante <= 0:
+            raise TempoExcedido(f"{MENSAGEM_TEMPO_EXCEDIDO}: a auditoria passou de {TEMPO_AUDITORIA:g} s e a regra não foi executada.")
+        limites.append(restante)
+    return min(limites) if limites else None
+
+def _trabalhador(conexao):
+    texto = None
+    conexao.send(("pronto", None))
+    while True:
+        try:
+            pedido, dado = conexao.recv()
+        except EOFError:
+            return
+        if pedido == "texto":
+            texto = dado
+            continue
+        try:
+            conexao.send(("ok", dado(texto)))
+        except Exception as e:
+            conexao.send(("erro", str(e)))
+
+class ProcessoDeRegras:
+    """Processo filho que executa regras sobre um texto, enviado uma vez e mantido lá.
+
+    As análises em cache (árvore de dispositivos, varredura léxica) ficam no filho e servem
+    às regras seguintes sobre o mesmo texto. Se uma regra passa do limite, o processo é morto
+    e o próximo `executar` cria outro.
+    """
+
+    def __init__(self):
+        self._processo = None
+        self._conexao = None
+        self._texto = None
+
+    def _iniciar(self):
+        contexto = multiprocessing.get_context("spawn")
+        self._conexao, conexao_filho = contexto.Pipe()
+        self._processo = contexto.Process(target=_trabalhador, args=(conexao_filho,), daemon=True, name="auditor-regras")
+        self._processo.start()
+        conexao_filho.close()
+        self._texto = None
+        if not self._conexao.poll(TEMPO_PARTIDA):
+            self.encerrar()
+            raise ErroNaRegra("o processo das regras não iniciou")
+        self._conexao.recv()
+
+    def encerrar(self):
+        if self._processo is not None:
+            self._processo.kill()
+            self._processo.join()
+            self._conexao.close()
+        self._processo = self._conexao = self._texto = None
+
+    def executar(self, funcao, texto: str, limite=None):
+        """Resultado de funcao(texto) no processo filho; TempoExcedido depois de `limite` segundos."""
+        if self._processo is None or not self._processo.is_alive():
+            self.encerrar()
+            self._iniciar()
+        try:
+            if self._texto is not texto:
+                self._conexao.send(("texto", texto))
+                self._texto = texto
+            self._conexao.send(("regra", funcao))
+            if not self._conexao.poll(limite):
+                self.encerrar()
+                if limite == TEMPO_REGRA:
+                    raise TempoExcedido(f"{MENSAGEM_TEMPO_EXCEDIDO}: a regra passou de {TEMPO_REGRA:g} s e foi interrompida.")
+                raise TempoExcedido(f"{MENSAGEM_TEMPO_EXCEDIDO}: a auditoria passou de {TEMPO_AUDITORIA:g} s e a regra foi interrompida.")
+            situacao, valor = self._conexao.recv()
+        except (EOFError, OSError):
+            self.encerrar()
+            raise ErroNaRegra("o processo das regras terminou inesperadamente")
+        if situacao == "erro":
+            raise ErroNaRegra(valor)
+        return valor
+
+@contextmanager
+def processo_de_regras():
+    """Um ProcessoDeRegras livre (ou novo), devolvido à reserva ao final.
+
+    Cada auditoria em andamento usa o seu, então auditorias em threads diferentes não se esperam.
+    """
+    with _trava:
+        processo = _livres.pop() if _livres else ProcessoDeRegras()
+    try:
+        yield processo
+    finally:
+        with _trava:
+            _livres.append(processo)
+
+def encerrar_processos():
+    with _trava:
+        processos = _livres[:]
+        _livres.clear()
+    for processo in processos:
+        processo.encerrar()
@@ -146,6 +146,8 @@ function renderizarResultado(data) {
             botoesHtml += `<div class="btn-ir" onclick="rolarParaErro('${erro.id}')">🎯 Ver</div>`;
         }
 
+        const posicaoHtml = erro.linha ? `<div class="card-msg" style="opacity:0.7;">Linha ${erro.linha}, coluna ${erro.coluna}</div>` : "";
+
         if (erro.correcao) {
             const originalEscaped = erro.correcao.original.replace(/"/g, '&quot;').replace(/'/g, "\\'");
             const novoEscaped = erro.correcao.novo.replace(/"/g, '&quot;').replace(/'/g, "\\'");
@@ -160,6 +162,7 @@ function renderizarResultado(data) {
         card.innerHTML = `
             <div class="card-titulo">${erro.regra}</div>
             <div class="card-msg">${erro.mensagem}</div>
+            ${posicaoHtml}
             <div style="display:flex; margin-top:8px;">
                 ${botoesHtml}
             </div>
@@ -184,7 +187,8 @@ function renderizarResultado(data) {
 }
 
 function rolarParaErro(id) {
-    const elemento = document.getElementById(id);
+    // Erros de trechos sobrepostos dividem o mesmo <mark>, que lista todos em data-erros.
+    const elemento = document.getElementById(id) || document.querySelector(`mark[data-erros~="${id}"]`);
     if (elemento) {
         document.querySelectorAll('mark.focado').forEach(el => el.classList.remove('focado'));
         elemento.classList.add('focado');